@@ -0,0 +1,135 @@
+"""Compare filesystem call counts of the per-file and bulk project writers.
+
+Usage: python benchmarks/bench_file_write.py [--projects N] [--threads N]
+
+When strace is available, the script re-runs itself under ``strace -f -c``
+and reports exact syscall counts. Otherwise it counts Python-level
+filesystem calls (os.* wrappers plus the 'open' audit event). The I/O done
+inside builtin open() objects is invisible to that counter, so the legacy
+numbers are a lower bound.
+"""
+
+import argparse
+import collections
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter.config.default import get_default_config
+from py_lib_starter.utils.bulk_write import BulkFileWriter
+from py_lib_starter.utils.file_ops import (
+    create_directory,
+    get_project_directories,
+    render_project,
+    write_file,
+)
+
+COUNTED_OS_FUNCTIONS = ('mkdir', 'chmod', 'stat', 'lstat', 'write', 'close', 'utime')
+
+def write_legacy(root: Path, project_name: str, files: dict) -> None:
+    """Materialize a project the way create_project_structure used to."""
+    for dir_path in get_project_directories(project_name):
+        create_directory(root / dir_path)
+    for relpath, content in files.items():
+        write_file(root / relpath, content)
+
+def write_bulk(root: Path, project_name: str, files: dict, threads: int) -> None:
+    """Materialize a project with the bulk writer."""
+    with BulkFileWriter(root, max_workers=threads or None) as writer:
+        for dir_path in get_project_directories(project_name):
+            writer.make_dirs(dir_path)
+        for relpath, content in files.items():
+            writer.write(relpath, content)
+
+class CallCounter:
+    """Count filesystem calls made through the os module and builtin open."""
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.active = False
+        sys.addaudithook(self._audit)
+        for name in COUNTED_OS_FUNCTIONS:
+            setattr(os, name, self._wrap(name, getattr(os, name)))
+
+    def _audit(self, event, args):
+        # Raised by builtin open(), io.open() and os.open() alike
+        if self.active and event == 'open' and not isinstance(args[0], int):
+            self.counts['open'] += 1
+
+    def _wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            if self.active:
+                self.counts[f'os.{name}'] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+def run(mode: str, projects: int, threads: int, counter: CallCounter = None) -> float:
+    """Write the requested number of projects and return the elapsed time."""
+    config = get_default_config()
+    files = render_project('bench_lib', config)
+    workdir = Path(tempfile.mkdtemp(prefix='bench_write_', dir=_scratch_dir()))
+    devnull = open(os.devnull, 'w')
+    stdout, sys.stdout = sys.stdout, devnull  # write_file prints every path
+
+    if counter is not None:
+        counter.active = True
+    start = time.perf_counter()
+    try:
+        for index in range(projects):
+            root = workdir / f'project_{index}' / 'bench_lib'
+            if mode == 'legacy':
+                write_legacy(root, 'bench_lib', files)
+            else:
+                write_bulk(root, 'bench_lib', files, threads)
+        return time.perf_counter() - start
+    finally:
+        if counter is not None:
+            counter.active = False
+        sys.stdout = stdout
+        devnull.close()
+        shutil.rmtree(workdir)
+
+def _scratch_dir() -> str:
+    """Prefer a tmpfs so the numbers reflect syscalls rather than the disk."""
+    return '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--projects', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=0)
+    parser.add_argument('--mode', choices=['legacy', 'bulk'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # Child process run under strace
+        run(args.mode, args.projects, args.threads)
+        return
+
+    strace = shutil.which('strace')
+    counter = None if strace else CallCounter()
+    for mode in ('legacy', 'bulk'):
+        print(f"== {mode} writer, {args.projects} project(s) ==")
+        if strace:
+            command = [
+                strace, '-f', '-c', '-e', 'trace=%file,%desc',
+                sys.executable, __file__, '--mode', mode,
+                '--projects', str(args.projects), '--threads', str(args.threads),
+            ]
+            subprocess.run(command, check=True)
+            continue
+
+        counter.counts.clear()
+        elapsed = run(mode, args.projects, args.threads, counter)
+        for name, count in sorted(counter.counts.items()):
+            print(f"  {name:<16} {count:>8}")
+        print(f"  {'total':<16} {sum(counter.counts.values()):>8}")
+        print(f"  elapsed          {elapsed * 1000:>8.1f} ms")
+
+if __name__ == '__main__':
+    main()
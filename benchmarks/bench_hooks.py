@@ -0,0 +1,139 @@
+"""Measure pre-commit hook latency on a synthetic repository.
+
+Usage: python benchmarks/bench_hooks.py [--files N] [--staged N] [--bin-dir DIR]
+
+Builds a git repository with N formatted, type-correct modules under
+src/, stages changes to a few of them and times three hooks: the legacy
+whole-tree hook (``black .``, ``isort .``, ``mypy src``) and the
+generated staged-files-only hook with plain incremental mypy and with
+the mypy daemon. Each hook runs twice on its own copy of the repository:
+cold (no caches) and warm (caches from the first run, new changes staged).
+
+black, isort, mypy and dmypy must be on PATH or in --bin-dir, e.g. the
+bin directory of a seed environment created by ``create-pylib --venv``.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter.templates import get_pre_commit_hook_template
+
+LEGACY_HOOK = '#!/bin/sh\n\nblack .\nisort .\nmypy src'
+
+MODULE_TEMPLATE = '''"""Synthetic module {index}."""
+
+from typing import List
+
+
+def scale_{index}(values: List[int], factor: int = {index}) -> List[int]:
+    """Multiply every value by a factor."""
+    return [value * factor for value in values]
+
+
+def total_{index}(values: List[int]) -> int:
+    """Add up the scaled values."""
+    return sum(scale_{index}(values))
+'''
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ['git', '-c', 'user.name=bench', '-c', 'user.email=bench@example.com',
+         '-c', 'init.defaultBranch=main', '-c', 'core.hooksPath=/dev/null', *args],
+        cwd=repo, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+def make_repository(root: Path, files: int) -> Path:
+    """Create and commit the synthetic repository."""
+    repo = root / 'base'
+    package = repo / 'src' / 'synthetic'
+    package.mkdir(parents=True)
+    (package / '__init__.py').write_text('"""Synthetic package."""\n')
+    for index in range(files):
+        (package / f'module_{index}.py').write_text(MODULE_TEMPLATE.format(index=index))
+    (repo / 'pyproject.toml').write_text('[tool.isort]\nprofile = "black"\n')
+    _git(repo, 'init', '-q')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-q', '-m', 'Initial commit')
+    return repo
+
+def stage_changes(repo: Path, indices: range) -> None:
+    """Append a function to some modules and stage them."""
+    for index in indices:
+        path = repo / 'src' / 'synthetic' / f'module_{index}.py'
+        with open(path, 'a') as f:
+            f.write(f'\n\ndef extra_{index}() -> int:\n    """Extra."""\n    return {index}\n')
+    _git(repo, 'add', '.')
+
+def time_hook(repo: Path, hook: str, env: dict) -> float:
+    """Run a hook script in a repository and return its latency."""
+    hook_path = repo / '.git' / 'hooks' / 'pre-commit'
+    hook_path.write_text(hook)
+    hook_path.chmod(0o755)
+    start = time.perf_counter()
+    result = subprocess.run(
+        ['sh', str(hook_path)], cwd=repo, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Hook failed:\n{result.stdout.decode(errors='replace')}")
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=1000,
+                        help='Modules in the repository (default: %(default)s)')
+    parser.add_argument('--staged', type=int, default=5,
+                        help='Modules changed per commit (default: %(default)s)')
+    parser.add_argument('--bin-dir', help='Directory holding black, isort and mypy')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.bin_dir:
+        env['PATH'] = args.bin_dir + os.pathsep + env['PATH']
+    missing = [tool for tool in ('black', 'isort', 'mypy', 'dmypy')
+               if shutil.which(tool, path=env['PATH']) is None]
+    if missing:
+        sys.exit(f"Missing tools: {', '.join(missing)} (see --bin-dir)")
+
+    hook_config = {
+        'formatters': ['isort --quiet', 'black --quiet'],
+        'mypy_target': 'src',
+    }
+    hooks = {
+        'legacy (whole tree)': LEGACY_HOOK,
+        'staged + mypy cache': get_pre_commit_hook_template(dict(hook_config, type_checker='mypy')),
+        'staged + dmypy': get_pre_commit_hook_template(dict(hook_config, type_checker='dmypy')),
+    }
+
+    root = Path(tempfile.mkdtemp(prefix='bench_hooks_'))
+    try:
+        base = make_repository(root, args.files)
+        print(f"{args.files} modules, {args.staged} staged per commit\n")
+        print(f"{'hook':<22} {'cold (s)':>9} {'warm (s)':>9}")
+        for number, (name, hook) in enumerate(hooks.items()):
+            repo = root / f'repo_{number}'
+            shutil.copytree(base, repo, symlinks=True)
+            try:
+                stage_changes(repo, range(0, args.staged))
+                cold = time_hook(repo, hook, env)
+                _git(repo, 'commit', '-q', '-m', 'cold')
+                stage_changes(repo, range(args.staged, 2 * args.staged))
+                warm = time_hook(repo, hook, env)
+            finally:
+                subprocess.run(['dmypy', 'stop'], cwd=repo, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            print(f"{name:<22} {cold:>9.2f} {warm:>9.2f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Compare standalone projects with one monorepo of the same packages.
+
+Usage: python benchmarks/bench_monorepo.py [--packages N] [--jobs N] [--dir DIR]
+
+Generates N packages twice: as N standalone projects, each with its own
+git repository, and as one monorepo with a single commit. Prints the
+wall-clock time, the number of files under .git directories and their
+total size (what a clone transfers, before packing).
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter.utils.batch import run_batch
+from py_lib_starter.utils.monorepo import build_monorepo
+
+OVERRIDES = {
+    'metadata': {'author': 'Bench Author', 'author_email': 'bench@example.com'},
+    'render_config': {'date': '2024-01-01'},
+}
+
+def git_usage(root: Path) -> Tuple[int, int]:
+    """Count the files and bytes under every .git directory below root."""
+    files = size = 0
+    for directory, _, names in os.walk(root):
+        if '.git' not in Path(directory).parts:
+            continue
+        for name in names:
+            files += 1
+            size += os.lstat(os.path.join(directory, name)).st_size
+    return files, size
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--packages', type=int, default=100,
+                        help='Packages to generate (default: %(default)s)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--dir', help='Directory to generate into (default: a temporary one)')
+    args = parser.parse_args()
+
+    entries = [{'name': f'bench_lib_{index}', 'path': None, 'config': {}}
+               for index in range(args.packages)]
+    root = Path(tempfile.mkdtemp(prefix='bench_monorepo_', dir=args.dir))
+    try:
+        print(f"{args.packages} packages\n")
+        print(f"{'layout':<12} {'time (s)':>9} {'git files':>10} {'git size':>10}")
+        for layout in ('standalone', 'monorepo'):
+            target = root / layout
+            start = time.perf_counter()
+            if layout == 'standalone':
+                results = run_batch(entries, str(target), args.jobs, OVERRIDES)
+            else:
+                results = build_monorepo(str(target), entries, args.jobs, OVERRIDES)['results']
+            elapsed = time.perf_counter() - start
+            if not all(result['success'] for result in results):
+                sys.exit(f"{layout}: some packages failed")
+            files, size = git_usage(target)
+            print(f"{layout:<12} {elapsed:>9.2f} {files:>10} {size / 1024:>7.0f} KiB")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
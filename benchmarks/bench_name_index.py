@@ -0,0 +1,71 @@
+"""Measure name index build time, size and lookup latency.
+
+Usage: python benchmarks/bench_name_index.py [--names N] [--lookups N]
+
+Builds an index of N synthetic package names (PyPI has about 600,000),
+then times opening it and looking up names that are taken, names that
+are free and names that only collide after PEP 503 normalization.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter.utils.name_index import NameIndex, build_name_index
+
+def synthetic_names(count: int, rng: random.Random) -> list:
+    """Generate package-like names such as 'django-foo_bar2'."""
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'
+    names = set()
+    while len(names) < count:
+        parts = [''.join(rng.choice(alphabet) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        names.add(rng.choice('-_.').join(parts) + rng.choice(['', '2', '3', 'py']))
+    return sorted(names)
+
+def time_lookups(index: NameIndex, names: list) -> float:
+    """Return the mean lookup latency in microseconds."""
+    start = time.perf_counter()
+    for name in names:
+        name in index
+    return (time.perf_counter() - start) / len(names) * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--names', type=int, default=600000,
+                        help='Names in the index (default: %(default)s)')
+    parser.add_argument('--lookups', type=int, default=100000,
+                        help='Lookups per kind (default: %(default)s)')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = synthetic_names(args.names, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'names.idx'
+        start = time.perf_counter()
+        build_name_index(names, path)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = NameIndex(path)
+        open_time = time.perf_counter() - start
+
+        taken = rng.sample(names, min(args.lookups, len(names)))
+        variants = [name.upper().replace('-', '_') for name in taken]
+        free = [name + 'zz' for name in taken]
+        assert all(name in index for name in variants)
+        assert not any(name in index for name in free)
+
+        print(f"{len(index)} names, {path.stat().st_size / 1e6:.1f} MB, "
+              f"built in {build_time:.2f}s, opened in {open_time * 1e6:.0f}us")
+        for label, sample in (('taken', taken), ('normalized', variants), ('free', free)):
+            print(f"{label:<11} {time_lookups(index, sample):6.2f} us/lookup")
+        index.close()
+
+if __name__ == '__main__':
+    main()
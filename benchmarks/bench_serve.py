@@ -0,0 +1,127 @@
+"""Compare request throughput of ``create-pylib serve`` with the plain CLI.
+
+Usage: python benchmarks/bench_serve.py [--requests N]
+
+Generates N projects three ways and reports requests per second:
+
+- cli: one ``python -m py_lib_starter.main`` process per project
+- serve: sequential POST /generate requests writing to disk
+- serve-archive: sequential POST /generate requests streaming a tar.gz
+
+The server listens on a Unix domain socket in a scratch directory and is
+started once, outside the timed region, like a daemon would be.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from py_lib_starter.utils.server import UnixHTTPConnection
+
+USER_INPUT = 'Jane Doe\njane@example.com\njdoe\n'
+
+METADATA = {
+    'metadata': {
+        'author': 'Jane Doe',
+        'author_email': 'jane@example.com',
+        'github_username': 'jdoe',
+    }
+}
+
+def _scratch_dir() -> str:
+    # Keep disk latency out of the comparison where tmpfs is available
+    return '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+def _env() -> dict:
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    # Silence git's default branch hint in the child processes
+    env.update(GIT_CONFIG_COUNT='1', GIT_CONFIG_KEY_0='init.defaultBranch',
+               GIT_CONFIG_VALUE_0='main')
+    return env
+
+def bench_cli(workdir: Path, requests: int) -> float:
+    """Create projects with one CLI process each and return the elapsed time."""
+    command = [sys.executable, '-m', 'py_lib_starter.main']
+    env = _env()
+    start = time.perf_counter()
+    for index in range(requests):
+        subprocess.run(
+            command + [f'cli_lib_{index}', '--path', str(workdir)],
+            input=USER_INPUT, text=True, env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    return time.perf_counter() - start
+
+def bench_serve(socket_path: str, requests: int, archive: str = None) -> float:
+    """Send generation requests over one connection and return the elapsed time."""
+    connection = UnixHTTPConnection(socket_path, timeout=60)
+    prefix = 'archive_lib' if archive else 'serve_lib'
+    start = time.perf_counter()
+    for index in range(requests):
+        body = {'name': f'{prefix}_{index}', 'config': METADATA, 'archive': archive}
+        connection.request('POST', '/generate', json.dumps(body),
+                           {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"Request failed with status {response.status}")
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed
+
+def start_server(workdir: Path, socket_path: str) -> subprocess.Popen:
+    """Start a server and wait until it answers health checks."""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'py_lib_starter.main', 'serve',
+         '--socket', socket_path, '--path', str(workdir)],
+        env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = UnixHTTPConnection(socket_path, timeout=5)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                connection.close()
+                return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("Server did not start")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20,
+                        help='Projects to generate per mode (default: %(default)s)')
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix='bench_serve_', dir=_scratch_dir()))
+    socket_path = str(workdir / 'serve.sock')
+    try:
+        timings = {'cli': bench_cli(workdir, args.requests)}
+        server = start_server(workdir, socket_path)
+        try:
+            timings['serve'] = bench_serve(socket_path, args.requests)
+            timings['serve-archive'] = bench_serve(socket_path, args.requests, 'tar.gz')
+        finally:
+            server.terminate()
+            server.wait()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'mode':<15} {'seconds':>9} {'req/s':>9} {'speedup':>9}")
+    for mode, elapsed in timings.items():
+        print(f"{mode:<15} {elapsed:>9.3f} {args.requests / elapsed:>9.1f} "
+              f"{timings['cli'] / elapsed:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
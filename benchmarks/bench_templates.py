@@ -0,0 +1,67 @@
+"""Measure template rendering throughput in renders per second.
+
+Usage: python benchmarks/bench_templates.py [--seconds S]
+
+Times every public template function with the default configuration, and
+the compiled pyproject.toml template on its own, so the cost of gathering
+values from the configuration can be told apart from the join itself.
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter import templates
+from py_lib_starter.config.default import get_default_config
+from py_lib_starter.templates.pyproject import PYPROJECT_TEMPLATE, _DEV_DEPENDENCY_LINES
+
+PROJECT_NAME = 'bench_lib'
+
+def renders_per_second(func, seconds: float) -> float:
+    """Run func repeatedly for about the given time and return calls per second."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    repeat = max(1, int(seconds / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=1.0,
+                        help='Approximate time per measurement')
+    args = parser.parse_args()
+
+    config = get_default_config()
+    values = {
+        'project_name': PROJECT_NAME,
+        'author': 'Jane Doe',
+        'author_email': 'jane@example.com',
+        'min_python': '3.8',
+        'line_length': 88,
+        'dev_dependencies': _DEV_DEPENDENCY_LINES,
+    }
+
+    cases = [
+        ('get_pyproject_template', lambda: templates.get_pyproject_template(PROJECT_NAME, config)),
+        ('get_readme_template', lambda: templates.get_readme_template(PROJECT_NAME, config)),
+        ('get_setup_cfg_template', lambda: templates.get_setup_cfg_template(PROJECT_NAME, config)),
+        ('get_conda_meta_template', lambda: templates.get_conda_meta_template(PROJECT_NAME, config)),
+        ('get_license_template', lambda: templates.get_license_template(config)),
+        ('get_changelog_template', lambda: templates.get_changelog_template(config)),
+        ('get_gitignore_template', templates.get_gitignore_template),
+        ('get_core_templates', lambda: templates.get_core_templates(PROJECT_NAME)),
+        ('get_test_templates', lambda: templates.get_test_templates(PROJECT_NAME)),
+        ('get_doc_templates', lambda: templates.get_doc_templates(PROJECT_NAME)),
+        ('PYPROJECT_TEMPLATE.render', lambda: PYPROJECT_TEMPLATE.render(values)),
+    ]
+
+    width = max(len(name) for name, _ in cases)
+    print(f"{'template':<{width}}  renders/s")
+    for name, func in cases:
+        print(f"{name:<{width}}  {renders_per_second(func, args.seconds):>10,.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Check that a regeneration failing partway leaves the lock file alone.
+
+Usage: python benchmarks/check_failed_render_lock.py [--dir DIR]
+
+Generates a project, then regenerates it with a different date while
+rendering fails after the first template unit:
+
+- the lock file must be byte for byte what the first generation wrote
+- a following successful regeneration must report no conflicts, i.e.
+  every generated file is still recognized as generated
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter.config.default import update_config
+from py_lib_starter.utils import file_ops
+from py_lib_starter.utils.lockfile import LOCK_FILENAME
+
+CONFIG = update_config({
+    'metadata': {'author': 'Bench Author', 'author_email': 'bench@example.com'},
+    'git_config': {'init_git': False},
+    'render_config': {'date': '2024-01-01'},
+})
+
+# Regenerating with another date changes the files of several units
+CHANGED = update_config({'render_config': {'date': '2025-01-01'}}, CONFIG)
+
+class RenderFailure(Exception):
+    """Raised by the failing render."""
+    pass
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dir', help='Directory to generate into (default: a temporary one)')
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix='check_failed_render_', dir=args.dir))
+    lock_path = root / 'lock_lib' / LOCK_FILENAME
+    failures: List[str] = []
+    render_units = file_ops.render_units
+
+    def failing_render_units(*args, **kwargs):
+        units = render_units(*args, **kwargs)
+        yield next(units)
+        raise RenderFailure("render failed")
+
+    try:
+        file_ops.create_project_structure('lock_lib', str(root), CONFIG)
+        before = lock_path.read_bytes()
+
+        file_ops.render_units = failing_render_units
+        try:
+            file_ops.create_project_structure('lock_lib', str(root), CHANGED)
+        except Exception:
+            pass
+        else:
+            failures.append("the failing regeneration did not fail")
+        finally:
+            file_ops.render_units = render_units
+
+        if lock_path.read_bytes() != before:
+            failures.append("a failed regeneration changed the lock file")
+
+        stats = file_ops.create_project_structure('lock_lib', str(root), CHANGED)
+        if stats['conflicts']:
+            failures.append(f"generated files reported as conflicts: {stats['conflicts']}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Check the import cost of ``create-pylib --help`` against a budget.
+
+Usage: python benchmarks/check_import_time.py [--runs N] [--budget FILE]
+
+Runs ``python -X importtime -m py_lib_starter.main --help`` several times
+and parses the "import time: self | cumulative | name" lines it prints on
+stderr. The import time of the CLI is the summed cumulative time of all
+top-level imports minus that of a bare ``python -c pass``. The check fails
+when the best of several runs exceeds the recorded budget, or when any
+module that is only needed for generating a project is imported at all.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BUDGET = Path(__file__).with_name('import_budget.json')
+
+def measure(python: str, command: List[str]) -> Dict[str, int]:
+    """
+    Run the interpreter once and collect import times.
+
+    Args:
+        python: Interpreter to run
+        command: Arguments following ``-X importtime``
+
+    Returns:
+        Mapping of module name to cumulative import time in microseconds,
+        plus the summed time of top-level imports under the key ''
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [str(ROOT / 'src'), env.get('PYTHONPATH')])
+    )
+    result = subprocess.run(
+        [python, '-X', 'importtime'] + command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env,
+        check=True,
+        universal_newlines=True,
+    )
+
+    times = {'': 0}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented below the import that caused them
+        if not name[1:].startswith(' '):
+            times[''] += int(cumulative)
+        times[name.strip()] = int(cumulative)
+    return times
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Runs to take the best of')
+    parser.add_argument('--budget', type=Path, default=DEFAULT_BUDGET,
+                        help='Budget file (default: %(default)s)')
+    parser.add_argument('--python', default=sys.executable, help='Interpreter to check')
+    args = parser.parse_args()
+
+    with open(args.budget, encoding='utf-8') as f:
+        budget = json.load(f)
+
+    baseline = min(measure(args.python, ['-c', 'pass'])[''] for _ in range(args.runs))
+    runs = [
+        measure(args.python, ['-m', 'py_lib_starter.main', '--help'])
+        for _ in range(args.runs)
+    ]
+    best = max(0, min(run[''] for run in runs) - baseline)
+    imported = set().union(*runs) - {''}
+
+    failures: List[str] = []
+    print(f"create-pylib --help import time: {best} us "
+          f"(budget {budget['max_cumulative_us']} us, best of {args.runs})")
+    if best > budget['max_cumulative_us']:
+        failures.append(f"import time {best} us exceeds budget {budget['max_cumulative_us']} us")
+
+    for module in budget['forbidden_modules']:
+        hits = sorted(
+            name for name in imported
+            if name == module or name.startswith(module + '.')
+        )
+        if hits:
+            failures.append(f"--help imports {', '.join(hits)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Check that generating projects keeps peak memory bounded by the largest file.
+
+Usage: python benchmarks/check_streaming_memory.py [--projects N] [--dir DIR]
+
+Measures peak traced memory (tracemalloc) while generating N projects with
+distinct names one after another in a single process, the way a batch
+worker does:
+
+- streaming: iter_project_files into a sink that discards what it gets
+- disk: create_project_structure with the native git backend, which
+  reads files back from disk instead of keeping them for the commit
+
+Neither may hold more than a few copies of the largest single file plus
+a small fixed slack (on disk, also zlib's compression state), whatever
+the number of projects. Streaming is also run with an author name blown
+up to megabytes, which ends up in several files of each project.
+
+To show that the bounds can fail, streaming is repeated into a sink that
+keeps every file; that run must exceed its bound.
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter.config.default import update_config
+from py_lib_starter.utils.file_ops import create_project_structure, iter_project_files
+from py_lib_starter.utils.sinks import OutputSink
+
+# Copies of the largest file alive at once: its text, its UTF-8 bytes and
+# render intermediates
+LARGE_FILE_COPIES = 3
+
+# Fixed allowance for everything not proportional to a file
+SLACK_BYTES = 96 * 1024
+
+# zlib's deflate state at the default window and memory level, allocated
+# for every object the native git backend compresses:
+# (1 << (15 + 2)) + (1 << (8 + 9)) bytes plus its bookkeeping
+DEFLATE_STATE_BYTES = 264 * 1024
+
+# Projects rendered with the large author name
+LARGE_TEMPLATE_RUN = 5
+
+class CountingSink(OutputSink):
+    """Sink that only counts the bytes it receives."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.largest = 0
+
+    def add_file(self, relpath, content, mode=0o644) -> None:
+        self.bytes += len(content)
+        self.largest = max(self.largest, len(content))
+
+class KeepingSink(CountingSink):
+    """Sink that keeps every file, as a regression would."""
+
+    def __init__(self):
+        super().__init__()
+        self.files: List[str] = []
+
+    def add_file(self, relpath, content, mode=0o644) -> None:
+        super().add_file(relpath, content, mode)
+        self.files.append(content)
+
+def peak_memory(run: Callable[[], None]) -> int:
+    """Return the peak traced memory of a call above what was allocated before it."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        run()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+def largest_file(path: Path) -> int:
+    """Return the size of the largest file below a directory."""
+    largest = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            largest = max(largest, os.path.getsize(os.path.join(dirpath, filename)))
+    return largest
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--projects', type=int, default=200,
+                        help='Projects per run (default: %(default)s)')
+    parser.add_argument('--dir', help='Directory to generate into (default: a temporary one)')
+    args = parser.parse_args()
+
+    config = update_config({
+        'metadata': {'author': 'Bench Author', 'author_email': 'bench@example.com'},
+    })
+    author = 'All work and no play makes a large template. ' * 20000
+    large_config = update_config({'metadata': {'author': author}}, config)
+    root = Path(tempfile.mkdtemp(prefix='check_streaming_', dir=args.dir))
+
+    # pathlib interns every path component, and CPython now and then
+    # rebuilds its interned string table as strings come and go, briefly
+    # holding two copies of it. That is a cost of the interpreter, not of
+    # the generator: the names of all runs and the components of a
+    # generated project are interned up front and kept alive, so the
+    # table does not change during the measurements.
+    names = iter([sys.intern(f'check_lib_{index}')
+                  for index in range(3 * args.projects + 2 * LARGE_TEMPLATE_RUN + 2)])
+    pinned: List[str] = []
+
+    def stream(sink: CountingSink, count: int, project_config: Dict) -> Callable[[], None]:
+        project_names = [next(names) for _ in range(count)]
+
+        def run() -> None:
+            for name in project_names:
+                sink.add_files(iter_project_files(name, project_config))
+                # Count what the project keeps, not garbage awaiting the collector
+                gc.collect()
+        return run
+
+    disk_largest = [0]
+
+    def disk(count: int) -> Callable[[], None]:
+        project_names = [next(names) for _ in range(count)]
+
+        def run() -> None:
+            for name in project_names:
+                create_project_structure(name, str(root), config)
+                disk_largest[0] = max(disk_largest[0], largest_file(root / name))
+                shutil.rmtree(root / name)
+                gc.collect()
+        return run
+
+    def check(label: str, count: int, run: Callable[[], None], largest: Callable[[], int],
+              slack: int = SLACK_BYTES) -> bool:
+        peak = peak_memory(run)
+        bound = largest() * LARGE_FILE_COPIES + slack
+        print(f"{label:<16} {count:>8} {largest() / 1024:>9.0f} KiB "
+              f"{bound / 1024:>9.0f} KiB {peak / 1024:>9.0f} KiB")
+        return peak <= bound
+
+    failures: List[str] = []
+    try:
+        # Warm up imports and template registration outside the measurements
+        stream(CountingSink(), 1, config)()
+        warm_up = next(names)
+        create_project_structure(warm_up, str(root), config)
+        for _, dirnames, filenames in os.walk(root / warm_up):
+            pinned.extend(sys.intern(name) for name in dirnames + filenames)
+        shutil.rmtree(root / warm_up)
+
+        print(f"{'run':<16} {'projects':>8} {'largest':>13} {'bound':>13} {'peak':>13}")
+
+        streaming = CountingSink()
+        if not check('streaming', args.projects, stream(streaming, args.projects, config),
+                     lambda: streaming.largest):
+            failures.append("streaming: peak exceeds the bound")
+
+        if not check('disk', args.projects, disk(args.projects), lambda: disk_largest[0],
+                     SLACK_BYTES + DEFLATE_STATE_BYTES):
+            failures.append("disk: peak exceeds the bound")
+
+        large = CountingSink()
+        if not check('large template', LARGE_TEMPLATE_RUN,
+                     stream(large, LARGE_TEMPLATE_RUN, large_config), lambda: large.largest):
+            failures.append("large template: peak exceeds the bound")
+
+        # The bounds must be tight enough to catch a sink that keeps files
+        for label, count, project_config in (
+            ('keeping', args.projects, config),
+            ('keeping large', LARGE_TEMPLATE_RUN, large_config),
+        ):
+            keeping = KeepingSink()
+            if check(label, count, stream(keeping, count, project_config),
+                     lambda: keeping.largest):
+                failures.append(f"{label}: a sink keeping every file stays within the bound")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
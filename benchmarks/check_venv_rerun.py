@@ -0,0 +1,80 @@
+"""Check that regenerating a project with --venv keeps its environment.
+
+Usage: python benchmarks/check_venv_rerun.py [--dir DIR]
+
+Generates a project with a virtual environment, then regenerates it:
+
+- the second run must succeed and keep the environment as it is (the
+  interpreter is the same file)
+- after the environment's interpreter is deleted, a third run must
+  succeed and create a working environment again
+
+Environments are created with plain venv, without the seed cache or any
+package installs, so the check runs offline in a few seconds.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter.config.default import update_config
+from py_lib_starter.utils.file_ops import create_project_structure
+from py_lib_starter.utils.venv_seed import venv_python, venv_works
+
+CONFIG = update_config({
+    'metadata': {'author': 'Bench Author', 'author_email': 'bench@example.com'},
+    'git_config': {'init_git': False},
+    'venv_config': {
+        'create_venv': True,
+        'seed_cache': False,
+        'wheelhouse': False,
+        'install_project': False,
+    },
+})
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dir', help='Directory to generate into (default: a temporary one)')
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix='check_venv_rerun_', dir=args.dir))
+    venv_path = root / 'venv_lib' / 'venv'
+    failures: List[str] = []
+    try:
+        create_project_structure('venv_lib', str(root), CONFIG)
+        first = os.lstat(venv_python(venv_path))
+
+        try:
+            create_project_structure('venv_lib', str(root), CONFIG)
+        except Exception as e:
+            failures.append(f"rerun failed: {e}")
+        else:
+            second = os.lstat(venv_python(venv_path))
+            if (second.st_ino, second.st_mtime_ns) != (first.st_ino, first.st_mtime_ns):
+                failures.append("rerun replaced a working environment")
+
+        os.unlink(venv_python(venv_path))
+        try:
+            create_project_structure('venv_lib', str(root), CONFIG)
+        except Exception as e:
+            failures.append(f"rerun with a broken environment failed: {e}")
+        else:
+            if not venv_works(venv_path):
+                failures.append("broken environment was not recreated")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
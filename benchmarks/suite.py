@@ -0,0 +1,369 @@
+"""Benchmark suite for the scaffolder's hot paths.
+
+Usage:
+    python benchmarks/suite.py run [-o results.json] [--only PATTERN] ...
+    python benchmarks/suite.py compare BASELINE.json CANDIDATE.json [--threshold 0.1]
+
+``run`` times every template function, update_config, each stage of
+create_project_structure (render, write, git with both backends) and the
+whole of it, plus batches of 1, 100 and 1000 projects. Projects are
+written below a tmpfs directory (/dev/shm when available) so the numbers
+reflect the scaffolder rather than the disk. Results are printed and, with
+-o, saved as JSON.
+
+``compare`` matches benchmarks by name and flags any whose best time grew
+by more than the threshold; it exits with status 1 if there is one.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from py_lib_starter import templates
+from py_lib_starter.config.default import update_config
+from py_lib_starter.utils.batch import run_batch
+from py_lib_starter.utils.file_ops import (
+    create_project_structure,
+    initialize_git,
+    materialize_project,
+    render_project,
+)
+from py_lib_starter.utils.sinks import DiskSink
+
+RESULTS_VERSION = 1
+
+PROJECT_NAME = 'bench_lib'
+
+# A typical set of user overrides, as built by the CLI prompts
+USER_OVERRIDES = {
+    'metadata': {
+        'author': 'Jane Doe',
+        'author_email': 'jane@example.com',
+        'github_username': 'jdoe',
+    },
+    'python_version': {'min_version': '3.9'},
+    'render_config': {'date': '2024-01-01'},
+}
+
+def default_work_dir() -> str:
+    """Prefer a tmpfs so that disk latency does not dominate the results."""
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return tempfile.gettempdir()
+
+def bench_config(**sections: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a configuration from the user overrides plus extra sections."""
+    config = update_config(USER_OVERRIDES)
+    if sections:
+        config = update_config(sections, config)
+    return config
+
+@contextlib.contextmanager
+def quiet_stdout():
+    """Discard stdout, including that of child processes such as git."""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, 1)
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int,
+    setup: Optional[Callable[[], None]] = None,
+    number: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Time a function.
+
+    Args:
+        func: Function to time
+        repeat: Number of timed samples
+        setup: Called untimed before every sample (optional)
+        number: Calls per sample (default: 1 with a setup, otherwise enough
+            calls for a sample to take about 0.2 seconds)
+
+    Returns:
+        Seconds per call: 'min', 'median' and 'mean' over the samples,
+        plus the 'repeat' and 'number' used
+    """
+    if number is None:
+        number = 1 if setup is not None else timeit.Timer(func).autorange()[0]
+
+    samples = []
+    # Keep progress messages of the code under test out of the report
+    with quiet_stdout():
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'repeat': repeat,
+        'number': number,
+    }
+
+class Workspace:
+    """Fresh scratch directories below one temporary root."""
+
+    def __init__(self, parent: str):
+        self.root = Path(tempfile.mkdtemp(prefix='py_lib_starter_bench_', dir=parent))
+        self._count = 0
+
+    def fresh(self) -> Path:
+        """Get a new, empty directory."""
+        self._count += 1
+        path = self.root / f'run{self._count}'
+        path.mkdir()
+        return path
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+def template_benchmarks(config: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """One benchmark per public template function."""
+    return {
+        'templates.get_pyproject_template': lambda: templates.get_pyproject_template(PROJECT_NAME, config),
+        'templates.get_setup_cfg_template': lambda: templates.get_setup_cfg_template(PROJECT_NAME, config),
+        'templates.get_readme_template': lambda: templates.get_readme_template(PROJECT_NAME, config),
+        'templates.get_gitignore_template': templates.get_gitignore_template,
+        'templates.get_changelog_template': lambda: templates.get_changelog_template(config),
+        'templates.get_conda_meta_template': lambda: templates.get_conda_meta_template(PROJECT_NAME, config),
+        'templates.get_license_template': lambda: templates.get_license_template(config),
+        'templates.get_core_templates': lambda: templates.get_core_templates(PROJECT_NAME),
+        'templates.get_test_templates': lambda: templates.get_test_templates(PROJECT_NAME),
+        'templates.get_doc_templates': lambda: templates.get_doc_templates(PROJECT_NAME),
+    }
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    """Run every selected benchmark and return the results by name."""
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def selected(name: str) -> bool:
+        return not args.only or any(fnmatch.fnmatch(name, pattern) for pattern in args.only)
+
+    def record(name: str, result: Dict[str, Any]) -> None:
+        results[name] = result
+        print(f"{name:<48} {result['min'] * 1e3:>12.4f} ms  (median {result['median'] * 1e3:.4f} ms)")
+
+    config = bench_config()
+
+    for name, func in template_benchmarks(config).items():
+        if selected(name):
+            record(name, measure(func, args.repeat))
+
+    if selected('config.update_config'):
+        record('config.update_config', measure(lambda: update_config(USER_OVERRIDES), args.repeat))
+
+    workspace = Workspace(args.dir)
+    try:
+        # Stages of create_project_structure, each timed on its own
+        files = render_project(PROJECT_NAME, config)
+        if selected('structure.render'):
+            record('structure.render', measure(lambda: render_project(PROJECT_NAME, config), args.repeat))
+
+        state: Dict[str, Path] = {}
+
+        def fresh_dir() -> None:
+            state['path'] = workspace.fresh()
+
+        def write() -> None:
+            with DiskSink(state['path'] / PROJECT_NAME) as sink:
+                materialize_project(PROJECT_NAME, files, sink)
+
+        if selected('structure.write'):
+            record('structure.write', measure(write, args.repeat, setup=fresh_dir))
+
+        for backend in ('native', 'subprocess'):
+            name = f'structure.git.{backend}'
+            if not selected(name):
+                continue
+            git_config = bench_config(git_config={'backend': backend})
+
+            def written_project() -> None:
+                fresh_dir()
+                write()
+
+            record(name, measure(
+                lambda: initialize_git(state['path'] / PROJECT_NAME, git_config, files),
+                args.repeat,
+                setup=written_project,
+            ))
+
+        # The whole of create_project_structure, with and without git
+        for name, git_config in (
+            ('structure.create_project_structure', {'init_git': False}),
+            ('structure.create_project_structure+git', {'init_git': True}),
+        ):
+            if not selected(name):
+                continue
+            full_config = bench_config(git_config=git_config)
+            record(name, measure(
+                lambda: create_project_structure(PROJECT_NAME, str(state['path']), full_config),
+                args.repeat,
+                setup=fresh_dir,
+            ))
+
+        # Batches go through the manifest entry point, with git disabled
+        for size in args.batch_sizes:
+            name = f'batch.{size}'
+            if not selected(name):
+                continue
+            entries = [
+                {'name': f'{PROJECT_NAME}_{index}', 'path': None, 'config': {}}
+                for index in range(size)
+            ]
+            overrides = dict(USER_OVERRIDES, git_config={'init_git': False})
+
+            def batch() -> None:
+                failed = [
+                    result for result in run_batch(entries, str(state['path']), args.jobs, overrides)
+                    if not result['success']
+                ]
+                if failed:
+                    raise RuntimeError(f"Batch benchmark failed: {failed[0]['error']}")
+
+            result = measure(batch, args.batch_repeat, setup=fresh_dir)
+            result['per_project'] = result['min'] / size
+            record(name, result)
+    finally:
+        workspace.cleanup()
+
+    return results
+
+def run_command(args: argparse.Namespace) -> int:
+    # Silence "git init" advice about the default branch name; the branch
+    # is set by initialize_git either way
+    os.environ.setdefault('GIT_CONFIG_COUNT', '1')
+    os.environ.setdefault('GIT_CONFIG_KEY_0', 'init.defaultBranch')
+    os.environ.setdefault('GIT_CONFIG_VALUE_0', 'main')
+
+    started = time.time()
+    results = run_suite(args)
+    document = {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'work_dir': args.dir,
+            'started': started,
+        },
+        'benchmarks': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+    return 0
+
+def compare_results(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    threshold: float
+) -> List[str]:
+    """
+    Print a comparison of two result documents.
+
+    Args:
+        baseline: Results of the reference run
+        candidate: Results of the run under test
+        threshold: Relative slow-down of the best time flagged as regression
+
+    Returns:
+        Names of the regressed benchmarks
+    """
+    old = baseline['benchmarks']
+    new = candidate['benchmarks']
+    regressions = []
+
+    print(f"{'benchmark':<48} {'baseline':>12} {'candidate':>12} {'change':>8}")
+    for name in sorted(set(old) | set(new)):
+        if name not in old or name not in new:
+            where = 'baseline' if name in old else 'candidate'
+            print(f"{name:<48} {'only in ' + where:>34}")
+            continue
+        before, after = old[name]['min'], new[name]['min']
+        change = after / before - 1 if before else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<48} {before * 1e3:>10.4f}ms {after * 1e3:>10.4f}ms {change:>+8.1%}{flag}")
+
+    return regressions
+
+def compare_command(args: argparse.Namespace) -> int:
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding='utf-8') as f:
+        candidate = json.load(f)
+
+    regressions = compare_results(baseline, candidate, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print(f"No regressions above {args.threshold:.0%}")
+    return 0
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    run = subparsers.add_parser('run', help='Run the benchmarks')
+    run.add_argument('-o', '--output', help='Write results to this JSON file')
+    run.add_argument('--only', action='append',
+                     help='Run benchmarks matching this glob (repeatable), e.g. "templates.*"')
+    run.add_argument('--repeat', type=int, default=7, help='Samples per benchmark')
+    run.add_argument('--batch-sizes', type=lambda s: [int(n) for n in s.split(',')],
+                     default=[1, 100, 1000], help='Comma-separated batch sizes')
+    run.add_argument('--batch-repeat', type=int, default=1, help='Samples per batch size')
+    run.add_argument('--jobs', type=int, default=None,
+                     help='Worker processes for batches (default: CPU count)')
+    run.add_argument('--dir', default=default_work_dir(),
+                     help='Directory for generated projects (default: %(default)s)')
+    run.set_defaults(func=run_command)
+
+    compare = subparsers.add_parser('compare', help='Compare two result files')
+    compare.add_argument('baseline', help='Reference results')
+    compare.add_argument('candidate', help='Results under test')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help='Relative slow-down reported as a regression (default: 0.10)')
+    compare.set_defaults(func=compare_command)
+
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    sys.exit(args.func(args))
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,37 @@
-"""Default configuration for library setup."""
+"""Default configuration for library setup.
 
-from typing import Dict, Any, List
+Every default is frozen (read-only mappings, tuples) so that no caller can
+change them for everybody else; derive per-project configurations with
+update_config instead.
+"""
+
+from typing import Any, Mapping, Optional, Tuple
+
+from .overlay import ConfigOverlay, freeze
 
 # Project Structure
-DEFAULT_DIRECTORIES: List[str] = [
+DEFAULT_DIRECTORIES: Tuple[str, ...] = freeze([
     'src',
     'tests',
     'docs',
-]
+])
 
 # Python Version Requirements
-PYTHON_VERSION: Dict[str, str] = {
+PYTHON_VERSION: Mapping[str, str] = freeze({
     'min_version': '3.9',
     'max_version': None,  # None means no upper limit
-}
+})
 
 # Development Dependencies
-DEV_DEPENDENCIES: Dict[str, str] = {
+DEV_DEPENDENCIES: Mapping[str, str] = freeze({
     'pytest': '>=7.0.0',
     'black': '>=22.0.0',
     'isort': '>=5.0.0',
     'mypy': '>=0.950',
-}
+})
 
 # Optional Feature Groups
-OPTIONAL_FEATURES: Dict[str, Dict[str, str]] = {
+OPTIONAL_FEATURES: Mapping[str, Mapping[str, str]] = freeze({
     'http': {
         'requests': '>=2.28.0',
     },
@@ -35,10 +42,10 @@ OPTIONAL_FEATURES: Dict[str, Dict[str, str]] = {
         'pandas': '>=1.3.0',
         'numpy': '>=1.20.0',
     },
-}
+})
 
 # File Templates Configuration
-TEMPLATE_CONFIG: Dict[str, Any] = {
+TEMPLATE_CONFIG: Mapping[str, Any] = freeze({
     'readme': {
         'default_style': 'minimal',  # or 'full'
         'include_license': True,
@@ -54,10 +61,10 @@ TEMPLATE_CONFIG: Dict[str, Any] = {
         'include_fixtures': True,
         'include_conftest': True,
     },
-}
+})
 
 # Project Metadata
-DEFAULT_METADATA: Dict[str, Any] = {
+DEFAULT_METADATA: Mapping[str, Any] = freeze({
     'author': 'Your Name',
     'author_email': 'your.email@company.com',
     'license': 'MIT',
@@ -69,17 +76,17 @@ DEFAULT_METADATA: Dict[str, Any] = {
         f'Programming Language :: Python :: {PYTHON_VERSION["min_version"]}',
         'Operating System :: OS Independent',
     ],
-}
+})
 
 # Code Style Settings
-CODE_STYLE: Dict[str, Any] = {
+CODE_STYLE: Mapping[str, Any] = freeze({
     'line_length': 88,
     'target_python_version': PYTHON_VERSION["min_version"],
     'isort_profile': 'black',
-}
+})
 
 # Testing Configuration
-TEST_CONFIG: Dict[str, Any] = {
+TEST_CONFIG: Mapping[str, Any] = freeze({
     'test_dir': 'tests',
     'pytest_options': [
         '-v',
@@ -91,10 +98,10 @@ TEST_CONFIG: Dict[str, Any] = {
         'omit': ['tests/*', 'setup.py'],
         'min_coverage': 80,
     },
-}
+})
 
 # Documentation Settings
-DOC_CONFIG: Dict[str, Any] = {
+DOC_CONFIG: Mapping[str, Any] = freeze({
     'doc_dir': 'docs',
     'doc_format': 'markdown',
     'sections': [
@@ -102,115 +109,142 @@ DOC_CONFIG: Dict[str, Any] = {
         'getting_started',
         'examples',
     ],
-}
+})
 
 # Git Configuration
-GIT_CONFIG: Dict[str, Any] = {
+GIT_CONFIG: Mapping[str, Any] = freeze({
     'init_git': True,
     'create_gitignore': True,
     'initial_branch': 'main',
+    'backend': 'native',  # or 'subprocess' to run the git executable
     'git_hooks': {
-        'pre-commit': [
-            'black .',
-            'isort .',
-            'mypy src',
-            # 'pytest', # disable for now
-        ],
+        # Checks staged files only; a list of shell commands instead is
+        # written to the hook as is
+        'pre-commit': {
+            'formatters': ['isort --quiet', 'black --quiet'],  # run in order per file
+            'type_checker': 'mypy',  # 'mypy' (incremental cache), 'dmypy' (daemon) or None
+            'mypy_target': 'src',
+            'jobs': None,  # parallel formatter processes, None uses one per CPU
+            'chunk_size': 50,  # staged files per formatter process
+        },
     },
-}
+})
 
 # Logging Configuration
-LOG_CONFIG: Dict[str, Any] = {
+LOG_CONFIG: Mapping[str, Any] = freeze({
     'default_level': 'DEBUG',
     'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     'date_format': '%Y-%m-%d %H:%M:%S',
-}
+})
 
 # Build Configuration
-BUILD_CONFIG: Dict[str, Any] = {
+BUILD_CONFIG: Mapping[str, Any] = freeze({
     'build_backend': 'hatchling',
     'requires': ['hatchling'],
     'include_package_data': True,
     'zip_safe': False,
-}
+})
+
+# File Writing Configuration
+IO_CONFIG: Mapping[str, Any] = freeze({
+    'write_threads': None,  # thread pool size for file writes, None writes inline
+    'dedup': None,  # 'hardlink', 'reflink' or 'copy' files from a shared blob store
+    'blob_store': None,  # blob store directory, default: next to the project
+})
+
+# Rendering Configuration
+RENDER_CONFIG: Mapping[str, Any] = freeze({
+    'date': None,  # 'YYYY-MM-DD'; None uses SOURCE_DATE_EPOCH or today
+    'cache': False,  # reuse rendered projects from the on-disk render cache
+    'skip_units': (),  # render units not generated, e.g. the files a monorepo shares
+})
+
+# Virtual Environment Configuration
+VENV_CONFIG: Mapping[str, Any] = freeze({
+    'create_venv': False,
+    'directory': 'venv',
+    'python': None,  # interpreter for the environment, None uses the running one
+    'seed_cache': True,  # clone a cached environment with the dev dependencies
+    'wheelhouse': True,  # install from the local wheelhouse, populating it once
+    'install_project': True,  # install the new package in editable mode
+})
 
 # Template Files
-REQUIRED_FILES: List[str] = [
+REQUIRED_FILES: Tuple[str, ...] = freeze([
     'pyproject.toml',
     'setup.cfg',
     'README.md',
     '.gitignore',
     'CHANGELOG.md',
-]
+])
 
 # Source Files
-REQUIRED_SOURCE_FILES: List[str] = [
+REQUIRED_SOURCE_FILES: Tuple[str, ...] = freeze([
     '__init__.py',
     'core.py',
     'utils.py',
     'exceptions.py',
-]
+])
 
 # Default Project URLs
-PROJECT_URLS: Dict[str, str] = {
+PROJECT_URLS: Mapping[str, str] = freeze({
     'Bug Tracker': '',
     'Documentation': '',
     'Source Code': '',
-}
+})
 
-def get_default_config() -> Dict[str, Any]:
+# The complete default configuration, shared read-only by every project
+DEFAULT_CONFIG: Mapping[str, Any] = freeze({
+    'directories': DEFAULT_DIRECTORIES,
+    'python_version': PYTHON_VERSION,
+    'dev_dependencies': DEV_DEPENDENCIES,
+    'optional_features': OPTIONAL_FEATURES,
+    'template_config': TEMPLATE_CONFIG,
+    'metadata': DEFAULT_METADATA,
+    'code_style': CODE_STYLE,
+    'test_config': TEST_CONFIG,
+    'doc_config': DOC_CONFIG,
+    'git_config': GIT_CONFIG,
+    'log_config': LOG_CONFIG,
+    'build_config': BUILD_CONFIG,
+    'io_config': IO_CONFIG,
+    'render_config': RENDER_CONFIG,
+    'venv_config': VENV_CONFIG,
+    'required_files': REQUIRED_FILES,
+    'required_source_files': REQUIRED_SOURCE_FILES,
+    'project_urls': PROJECT_URLS,
+})
+
+def get_default_config() -> Mapping[str, Any]:
     """
     Get the complete default configuration.
     
     Returns:
-        Dictionary containing all default configuration settings
+        Read-only mapping containing all default configuration settings
     """
-    return {
-        'directories': DEFAULT_DIRECTORIES,
-        'python_version': PYTHON_VERSION,
-        'dev_dependencies': DEV_DEPENDENCIES,
-        'optional_features': OPTIONAL_FEATURES,
-        'template_config': TEMPLATE_CONFIG,
-        'metadata': DEFAULT_METADATA,
-        'code_style': CODE_STYLE,
-        'test_config': TEST_CONFIG,
-        'doc_config': DOC_CONFIG,
-        'git_config': GIT_CONFIG,
-        'log_config': LOG_CONFIG,
-        'build_config': BUILD_CONFIG,
-        'required_files': REQUIRED_FILES,
-        'required_source_files': REQUIRED_SOURCE_FILES,
-        'project_urls': PROJECT_URLS,
-    }
-
-def update_config(custom_config: Dict[str, Any]) -> Dict[str, Any]:
+    return DEFAULT_CONFIG
+
+def update_config(
+    custom_config: Mapping[str, Any],
+    base: Optional[Mapping[str, Any]] = None
+) -> ConfigOverlay:
     """
     Update default configuration with custom settings.
     
+    Nested sections are merged key by key; any other value replaces the
+    default. Nothing is copied but the custom settings themselves and
+    nothing shared is modified, so this is cheap and thread-safe.
+    
     Args:
         custom_config: Custom configuration to override defaults
+        base: Configuration to update instead of the defaults (optional)
         
     Returns:
-        Updated configuration dictionary
+        Read-only layered configuration
     """
-    config = get_default_config()
-    
-    def deep_update(original: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively update nested dictionaries."""
-        for key, value in update.items():
-            if (
-                key in original 
-                and isinstance(original[key], dict) 
-                and isinstance(value, dict)
-            ):
-                deep_update(original[key], value)
-            else:
-                original[key] = value
-        return original
-    
-    return deep_update(config, custom_config)
+    return ConfigOverlay(freeze(custom_config), DEFAULT_CONFIG if base is None else base)
 
-def validate_config(config: Dict[str, Any]) -> bool:
+def validate_config(config: Mapping[str, Any]) -> bool:
     """
     Validate configuration settings.
     
@@ -0,0 +1,155 @@
+"""Configuration files layered over the defaults.
+
+An organization keeps its settings (author, license, Python versions,
+hooks...) in a TOML file whose tables mirror the sections of the default
+configuration; teams add overlay files changing only what differs for
+them. Files are applied in order, later files winning, with the same
+deep merge as update_config:
+
+    # org.toml
+    [metadata]
+    author = "Example Org"
+    author_email = "dev@example.org"
+
+    # team.toml
+    [python_version]
+    min_version = "3.11"
+
+Batch workers and the generation server load the same files over and
+over, so parsed files and merged results are cached. Entries are keyed by
+each file's path, size and modification time: a file that changes on
+disk is parsed again on next use, and a lookup otherwise costs one
+stat() per file.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Mapping, Sequence, Tuple
+
+from .default import DEFAULT_CONFIG, update_config
+from .overlay import ConfigOverlay, freeze
+from .toml import TOMLUnavailableError, load_toml
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Identity of a file's content: (absolute path, size, mtime in nanoseconds)
+FileKey = Tuple[str, int, int]
+
+# Merged results kept; older ones are dropped when exceeded
+MAX_CACHED_CONFIGS = 64
+
+_cache_lock = threading.Lock()
+_parsed: Dict[str, Tuple[FileKey, Mapping[str, Any]]] = {}
+_merged: Dict[Tuple[FileKey, ...], ConfigOverlay] = {}
+
+class ConfigFileError(Exception):
+    """Exception for missing, unreadable or malformed configuration files."""
+    pass
+
+def file_key(path: str) -> FileKey:
+    """
+    Identify the current content of a configuration file.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Tuple of (absolute path, size, modification time in nanoseconds)
+
+    Raises:
+        ConfigFileError: If the file does not exist or cannot be accessed
+    """
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        raise ConfigFileError(f"Cannot read config file {path}: {e}")
+    return path, st.st_size, st.st_mtime_ns
+
+def _parse(path: str) -> Mapping[str, Any]:
+    """Parse a TOML configuration file into a read-only mapping."""
+    try:
+        document = load_toml(path)
+    except TOMLUnavailableError as e:
+        raise ConfigFileError(str(e))
+    except OSError as e:
+        raise ConfigFileError(f"Cannot read config file {path}: {e}")
+    except ValueError as e:
+        # tomllib.TOMLDecodeError is a ValueError
+        raise ConfigFileError(f"Invalid TOML in config file {path}: {e}")
+
+    unknown = sorted(set(document) - set(DEFAULT_CONFIG))
+    if unknown:
+        logger.warning(f"Unknown sections in config file {path}: {', '.join(unknown)}")
+    return freeze(document)
+
+def read_config_file(path: str) -> Mapping[str, Any]:
+    """
+    Read one configuration file, from the cache while it is unchanged.
+
+    Args:
+        path: Path to the TOML file
+
+    Returns:
+        Read-only mapping of the file's sections
+
+    Raises:
+        ConfigFileError: If the file cannot be read or parsed
+    """
+    key = file_key(path)
+    with _cache_lock:
+        cached = _parsed.get(key[0])
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    # Parse outside the lock; racing threads produce equal documents
+    document = _parse(key[0])
+    with _cache_lock:
+        _parsed[key[0]] = (key, document)
+    logger.debug(f"Parsed config file {key[0]}")
+    return document
+
+def load_config(paths: Sequence[str]) -> ConfigOverlay:
+    """
+    Load configuration files over the defaults.
+
+    As long as none of the files changed, the same configuration object
+    is returned, so callers may compare it by identity to find out
+    whether anything needs to be derived again.
+
+    Args:
+        paths: Configuration files, the organization's first and overlays
+            after it; later files win
+
+    Returns:
+        Read-only configuration, for use as the base of update_config
+
+    Raises:
+        ConfigFileError: If a file cannot be read or parsed
+    """
+    keys = tuple(file_key(path) for path in paths)
+    with _cache_lock:
+        cached = _merged.get(keys)
+    if cached is not None:
+        return cached
+
+    config = None
+    for key in keys:
+        config = update_config(read_config_file(key[0]), config)
+    if config is None:
+        config = update_config({})
+
+    with _cache_lock:
+        if len(_merged) >= MAX_CACHED_CONFIGS:
+            # Results of files that changed since are never asked for again
+            del _merged[next(iter(_merged))]
+        _merged[keys] = config
+    return config
+
+def clear_cache() -> None:
+    """Forget every parsed file and merged configuration."""
+    with _cache_lock:
+        _parsed.clear()
+        _merged.clear()
@@ -0,0 +1,138 @@
+"""Immutable configuration values and copy-on-write overlays."""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Tuple
+
+def freeze(value: Any) -> Any:
+    """
+    Make a configuration value read-only.
+
+    Mappings become read-only mapping proxies over fresh dicts, lists and
+    tuples become tuples and sets become frozensets, recursively. Overlays
+    are immutable already and returned as they are.
+
+    Args:
+        value: Configuration value
+
+    Returns:
+        Frozen copy of the value
+    """
+    if isinstance(value, ConfigOverlay):
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+def thaw(value: Any) -> Any:
+    """
+    Convert a (possibly frozen or layered) configuration value to plain
+    dicts and lists, e.g. to serialize or modify a copy of it.
+
+    Args:
+        value: Configuration value
+
+    Returns:
+        Mutable deep copy of the value
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+def _unpickle_overlay(data: Dict[str, Any]) -> 'ConfigOverlay':
+    return ConfigOverlay(freeze(data))
+
+class ConfigOverlay(Mapping):
+    """
+    Read-only, deep ChainMap over layers of configuration mappings.
+
+    Earlier layers win. A key holding mappings in several layers reads as
+    an overlay of those mappings, so nested sections merge exactly like
+    the old in-place deep update; any other value shadows the layers
+    below it. Layers are shared, never copied or modified, so deriving a
+    configuration costs O(size of the overrides) and overlays can be used
+    from several threads at once.
+
+    Args:
+        *maps: Layers, highest priority first; they must not be modified
+            afterwards (use freeze on mutable input)
+    """
+
+    __slots__ = ('maps', '_cache')
+
+    def __init__(self, *maps: Mapping):
+        self.maps: Tuple[Mapping, ...] = maps
+        self._cache: Dict[Any, Any] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        found = False
+        result = None
+        nested: List[Mapping] = []
+        for layer in self.maps:
+            try:
+                value = layer[key]
+            except KeyError:
+                continue
+            if isinstance(value, Mapping):
+                nested.append(value)
+                continue
+            if not nested:
+                found, result = True, value
+            # A plain value replaces whatever lower layers hold
+            break
+
+        if nested:
+            result = nested[0] if len(nested) == 1 else ConfigOverlay(*nested)
+        elif not found:
+            raise KeyError(key)
+
+        # Racing threads compute equal values, so a plain dict is enough
+        self._cache[key] = result
+        return result
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self.maps)
+
+    def __iter__(self) -> Iterator[Any]:
+        # Base keys first, like a dict updated with the overrides
+        seen = set()
+        for layer in reversed(self.maps):
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        return len(set().union(*self.maps))
+
+    def new_child(self, overrides: Mapping) -> 'ConfigOverlay':
+        """
+        Derive a configuration with overrides layered on top of this one.
+
+        Args:
+            overrides: Configuration overrides, frozen on the way in
+
+        Returns:
+            New overlay sharing this one's layers
+        """
+        return ConfigOverlay(freeze(overrides), *self.maps)
+
+    def __reduce__(self):
+        # Mapping proxies cannot be pickled, so ship a flattened plain copy
+        return _unpickle_overlay, (thaw(self),)
+
+    def __repr__(self) -> str:
+        return f"ConfigOverlay({thaw(self)!r})"
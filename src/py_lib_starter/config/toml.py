@@ -0,0 +1,36 @@
+"""Reading TOML files, with tomllib or, before Python 3.11, tomli."""
+
+from pathlib import Path
+from typing import Any, Dict, Union
+
+class TOMLUnavailableError(Exception):
+    """Exception raised when no TOML parser is installed."""
+    pass
+
+def load_toml(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Load a TOML document, using tomllib when available.
+
+    Args:
+        path: Path to the TOML file
+
+    Returns:
+        Parsed TOML document
+
+    Raises:
+        TOMLUnavailableError: If no TOML parser is available
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid TOML (tomllib.TOMLDecodeError)
+    """
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise TOMLUnavailableError(
+                f"Reading {path} requires Python 3.11+ or the 'tomli' package"
+            )
+
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
@@ -7,21 +7,37 @@ Usage: python -m library_setup my_library_name
 import sys
 import argparse
 from pathlib import Path
-from typing import Optional, Dict, Any
-import subprocess
+from typing import Optional, Dict, Any, List, BinaryIO, TYPE_CHECKING
 
-from .utils.file_ops import create_project_structure
+# Keep this module cheap to import: --help and argument or name validation
+# errors must not pay for the templates, file operations or subprocess.
+# Everything else is imported where it is first used.
 from .utils.validation import validate_project_name
 from .utils.user_input import get_user_input, UserInputError
-from .config.default import get_default_config, update_config
+
+if TYPE_CHECKING:
+    from .utils.sinks import OutputSink
+
+# Commands taking over the command line when given as the first argument:
+# name -> (module relative to this package, function called with the
+# remaining arguments)
+COMMANDS = {
+    'serve': ('.utils.server', 'serve'),
+    'wheelhouse': ('.utils.wheelhouse', 'main'),
+    'verify': ('.utils.verify', 'main'),
+    'index': ('.utils.name_index', 'main'),
+    'upgrade': ('.utils.upgrade', 'main'),
+}
 
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
-        description='Create a new Python library project structure'
+        description='Create a new Python library project structure',
+        epilog=f"commands: {', '.join(COMMANDS)} (see '%(prog)s COMMAND --help')"
     )
     parser.add_argument(
         'project_name',
+        nargs='?',
         help='Name of the project (use underscores for spaces)'
     )
     parser.add_argument(
@@ -29,19 +45,128 @@ def parse_args() -> argparse.Namespace:
         help='Base path for project creation (default: current directory)',
         default=None
     )
+    parser.add_argument(
+        '--config',
+        metavar='FILE',
+        action='append',
+        help='TOML configuration file layered over the defaults; repeat it to '
+             'add overlays, later files win (e.g. --config org.toml --config '
+             'team.toml)',
+        default=None
+    )
     parser.add_argument(
         '--full-readme',
         action='store_true',
         help='Generate a comprehensive README instead of the minimal version'
     )
+    parser.add_argument(
+        '--manifest',
+        help='JSONL or TOML manifest listing many projects to build in one run',
+        default=None
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Number of worker processes for --manifest (default: CPU count)',
+        default=None
+    )
+    parser.add_argument(
+        '--monorepo',
+        metavar='DIR',
+        help='Build the --manifest projects as packages/<name> of one '
+             'repository DIR (under --path), with shared root files and a '
+             'single commit',
+        default=None
+    )
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='After a --manifest run, import, test and type-check the built '
+             'projects (see create-pylib verify)'
+    )
+    parser.add_argument(
+        '--name-index',
+        metavar='FILE',
+        help='Reject names taken on a package index, using a local name index '
+             'built with create-pylib index build',
+        default=None
+    )
+    parser.add_argument(
+        '--io-threads',
+        type=int,
+        help='Write files from a thread pool of this size (helps on network '
+             'filesystems)',
+        default=None
+    )
+    parser.add_argument(
+        '--dedup',
+        choices=['hardlink', 'reflink', 'copy'],
+        help='Write each unique file once to a blob store and hardlink/reflink '
+             'it into projects (for generated fixtures: hardlinked files share '
+             'their content)',
+        default=None
+    )
+    parser.add_argument(
+        '--blob-store',
+        metavar='DIR',
+        help='Blob store for --dedup (default: .py_lib_starter_blobs next to '
+             'the projects)',
+        default=None
+    )
+    parser.add_argument(
+        '--date',
+        metavar='YYYY-MM-DD',
+        help='Date written into LICENSE and CHANGELOG.md (default: '
+             'SOURCE_DATE_EPOCH or today)',
+        default=None
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse identical renders from the cache in ~/.cache/py_lib_starter'
+    )
+    parser.add_argument(
+        '--venv',
+        action='store_true',
+        help='Create a virtual environment with the dev dependencies and the '
+             'project installed (cloned from a cached seed environment)'
+    )
+    parser.add_argument(
+        '--archive',
+        metavar='FILE',
+        help='Write the project as an archive to FILE ("-" for stdout) '
+             'instead of creating a directory',
+        default=None
+    )
+    parser.add_argument(
+        '--archive-format',
+        choices=['tar.gz', 'zip'],
+        help='Archive format for --archive (default: inferred from FILE, '
+             'tar.gz for stdout)',
+        default=None
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help='Write per-stage timings (render, write, git...) as JSON to FILE',
+        default=None
+    )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.project_name and not args.manifest:
+        parser.error('a project name or --manifest is required')
+    if args.monorepo and not args.manifest:
+        parser.error('--monorepo requires --manifest')
+    
+    return args
 
 def setup_project(
     project_name: str,
     base_path: Optional[str] = None,
-    config: Optional[Dict[str, Any]] = None
-) -> None:
+    config: Optional[Dict[str, Any]] = None,
+    sink: Optional['OutputSink'] = None,
+    config_files: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
     """
     Set up the project structure.
     
@@ -49,31 +174,220 @@ def setup_project(
         project_name: Name of the project
         base_path: Base path for project creation
         config: Custom configuration options
+        sink: Output sink replacing the project directory (optional)
+        config_files: Configuration files under the custom options (optional)
+        
+    Returns:
+        Written/skipped/conflicts counts for on-disk generation
     """
-    # Get default configuration
+    from .utils.file_ops import create_project_structure
+    from .config.default import get_default_config, update_config
+    
+    # Get default configuration, with the configuration files over it
     project_config = get_default_config()
+    if config_files:
+        from .config.loader import load_config
+        
+        project_config = load_config(config_files)
     
     # Update with custom config if provided
     if config:
-        project_config = update_config(config)
+        project_config = update_config(config, project_config)
     
     # Create project structure with configuration
-    create_project_structure(project_name, base_path, project_config)
+    return create_project_structure(project_name, base_path, project_config, sink)
+
+def cli_config_overrides(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Collect the configuration overrides given as command line options.
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        Configuration overrides (empty if no option was given)
+    """
+    overrides: Dict[str, Any] = {}
+    
+    io_config = {
+        key: value for key, value in (
+            ('write_threads', args.io_threads),
+            ('dedup', args.dedup),
+            ('blob_store', args.blob_store),
+        ) if value
+    }
+    if io_config:
+        overrides['io_config'] = io_config
+    
+    render_config = {
+        key: value for key, value in (
+            ('date', args.date),
+            ('cache', args.cache),
+        ) if value
+    }
+    if render_config:
+        overrides['render_config'] = render_config
+    
+    if args.venv:
+        overrides['venv_config'] = {'create_venv': True}
+    
+    return overrides
 
 def create_venv(path):
+    import subprocess
     subprocess.run([sys.executable, "-m", "venv", path], check=True)
 
 def run_python_command(command):
+    import subprocess
     subprocess.run([sys.executable, "-m"] + command, check=True)
 
+def run_manifest(args: argparse.Namespace) -> None:
+    """
+    Build every project listed in a manifest and print a summary.
+    
+    Args:
+        args: Parsed command line arguments
+    """
+    from .utils.batch import load_manifest, run_batch, format_batch_summary
+    from .utils.validation import preflight_batch
+    
+    entries = load_manifest(args.manifest)
+    base_path = args.path
+    if args.monorepo:
+        from .templates.workspace import PACKAGES_DIR
+        
+        # Every package goes under the repository's packages directory
+        entries = [dict(entry, path=None) for entry in entries]
+        base_path = str(Path(args.path or '.') / args.monorepo / PACKAGES_DIR)
+    # Report every problem up front instead of failing projects one by one
+    preflight_batch(entries, base_path, load_name_index(args.name_index))
+    config_files = args.config or []
+    if config_files:
+        from .config.loader import ConfigFileError, load_config
+        
+        # Validation pass only: the workers load the files themselves, but
+        # a broken file should stop the batch before any project is built
+        try:
+            load_config(config_files)
+        except ConfigFileError as e:
+            print(f"\nError in config file: {e}", file=sys.stderr)
+            sys.exit(1)
+    print(f"\nBuilding {len(entries)} projects from {args.manifest}...")
+    
+    if args.monorepo:
+        from .utils.monorepo import build_monorepo
+        
+        root = str(Path(args.path or '.') / args.monorepo)
+        monorepo = build_monorepo(
+            root, entries, args.jobs, cli_config_overrides(args), config_files
+        )
+        results = monorepo['results']
+        if monorepo['commit']:
+            print(f"\nCommitted all packages to {root} as {monorepo['commit'][:12]}")
+    else:
+        results = run_batch(
+            entries, base_path, args.jobs, cli_config_overrides(args), config_files
+        )
+    
+    print(format_batch_summary(results))
+    succeeded = all(result['success'] for result in results)
+    
+    if args.verify:
+        from .utils.verify import verify_projects, format_verify_summary
+        
+        built = [result['path'] for result in results if result['success']]
+        print(f"\nVerifying {len(built)} projects...")
+        verified = verify_projects(built, jobs=args.jobs)
+        print(format_verify_summary(verified))
+        succeeded = succeeded and all(result['success'] for result in verified)
+    
+    if not succeeded:
+        sys.exit(1)
+
+def load_name_index(path: Optional[str]):
+    """
+    Open the name index given with --name-index.
+    
+    Args:
+        path: Index file or None
+        
+    Returns:
+        The memory-mapped index, or None without a path
+    """
+    if not path:
+        return None
+    from .utils.name_index import load_name_index as load
+    
+    return load(path)
+
+def run_command(name: str, argv: list) -> None:
+    """
+    Run one of the COMMANDS.
+    
+    Args:
+        name: Command name
+        argv: Arguments following the command name
+    """
+    import importlib
+    
+    module_name, function_name = COMMANDS[name]
+    module = importlib.import_module(module_name, __package__)
+    getattr(module, function_name)(argv)
+
 def main() -> None:
     """Main function to create the project structure."""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        run_command(sys.argv[1], sys.argv[2:])
+        return
+    
+    # Parse command line arguments
+    args = parse_args()
+    
+    if args.profile:
+        from .utils.profiling import Profiler
+        
+        profiler = Profiler()
+        try:
+            with profiler:
+                dispatch(args)
+        finally:
+            profiler.write(args.profile)
+    else:
+        dispatch(args)
+
+def dispatch(args: argparse.Namespace) -> None:
+    """
+    Run the command, streaming a requested archive to stdout if needed.
+    
+    Args:
+        args: Parsed command line arguments
+    """
+    # Keep stdout clean for the archive when streaming it there
+    if args.archive == '-':
+        import contextlib
+        
+        archive_stream = sys.stdout.buffer
+        with contextlib.redirect_stdout(sys.stderr):
+            run(args, archive_stream)
+    else:
+        run(args)
+
+def run(args: argparse.Namespace, archive_stream: Optional[BinaryIO] = None) -> None:
+    """
+    Create the project(s) requested on the command line.
+    
+    Args:
+        args: Parsed command line arguments
+        archive_stream: Binary stream for an archive written to stdout
+    """
     try:
-        # Parse command line arguments
-        args = parse_args()
+        # Batch mode takes all metadata from the manifest
+        if args.manifest:
+            run_manifest(args)
+            return
         
         # Validate project name
-        validate_project_name(args.project_name)
+        validate_project_name(args.project_name, load_name_index(args.name_index))
         
         # Get user information
         print("\nWelcome to the Python Library Setup Tool!")
@@ -94,18 +408,40 @@ def main() -> None:
                 }
             }
         }
+        config.update(cli_config_overrides(args))
         
         print(f"\nCreating project '{args.project_name}'...")
         
+        # Stream an archive instead of creating a directory if requested
+        if args.archive:
+            from .utils.sinks import open_archive_sink
+            
+            with open_archive_sink(
+                args.archive, args.archive_format, args.project_name, archive_stream
+            ) as sink:
+                setup_project(args.project_name, args.path, config, sink, args.config)
+            print(f"\nSuccessfully wrote {args.project_name} to {args.archive}")
+            return
+        
         # Create project structure
-        setup_project(args.project_name, args.path, config)
+        stats = setup_project(args.project_name, args.path, config, config_files=args.config)
+        
+        print(
+            f"\n{stats['rendered']} templates rendered, {stats['written']} files written, "
+            f"{stats['skipped']} unchanged, {len(stats['conflicts'])} conflicts"
+        )
+        for conflict in stats['conflicts']:
+            print(f"  modified locally, not overwritten: {conflict}")
         
         print(f"\nSuccessfully created project structure for {args.project_name}")
         print("\nNext steps:")
         print(f"1. cd {args.project_name}")
-        print("2. python -m venv venv")
-        print("3. source venv/bin/activate  # On Windows: venv\\Scripts\\activate")
-        print("4. pip install -e \".[dev]\"")
+        if args.venv:
+            print("2. source venv/bin/activate  # On Windows: venv\\Scripts\\activate")
+        else:
+            print("2. python -m venv venv")
+            print("3. source venv/bin/activate  # On Windows: venv\\Scripts\\activate")
+            print("4. pip install -e \".[dev]\"")
         print("\nHappy coding!")
         
     except UserInputError as e:
@@ -1,15 +1,31 @@
-"""Templates for project creation."""
-
-from .pyproject import get_pyproject_template
-from .setup_cfg import get_setup_cfg_template
-from .readme import get_readme_template
-from .gitignore import get_gitignore_template
-from .core import get_core_templates
-from .tests import get_test_templates
-from .docs import get_doc_templates
-from .changelog import get_changelog_template
-from .license import get_license_template
-from .conda_meta import get_conda_meta_template 
+"""Templates for project creation.
+
+Template modules are imported on first use (PEP 562), so importing this
+package is cheap and ``from py_lib_starter.templates import X`` only loads
+the module that defines X.
+"""
+
+import importlib
+import os
+from functools import lru_cache
+from typing import Any
+
+# Public name -> submodule defining it
+_LAZY_ATTRIBUTES = {
+    'get_pyproject_template': 'pyproject',
+    'get_setup_cfg_template': 'setup_cfg',
+    'get_readme_template': 'readme',
+    'get_gitignore_template': 'gitignore',
+    'get_core_templates': 'core',
+    'get_test_templates': 'tests',
+    'get_doc_templates': 'docs',
+    'get_changelog_template': 'changelog',
+    'get_license_template': 'license',
+    'get_conda_meta_template': 'conda_meta',
+    'get_pre_commit_hook_template': 'git_hooks',
+    'get_workspace_pyproject_template': 'workspace',
+    'get_workspace_readme_template': 'workspace',
+}
 
 __all__ = [
     'get_pyproject_template',
@@ -22,4 +38,42 @@ __all__ = [
     'get_changelog_template',
     'get_conda_meta_template',
     'get_license_template',
+    'get_pre_commit_hook_template',
+    'get_workspace_pyproject_template',
+    'get_workspace_readme_template',
+    'get_template_version',
 ]
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+@lru_cache(maxsize=None)
+def get_template_version() -> str:
+    """
+    Get a version identifier for the template sources.
+
+    The identifier is a hash of every module in this package, so it changes
+    whenever any template changes.
+
+    Returns:
+        Short hex digest
+    """
+    import hashlib
+
+    package_dir = os.path.dirname(__file__)
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(package_dir)):
+        if not name.endswith('.py'):
+            continue
+        digest.update(name.encode('utf-8'))
+        with open(os.path.join(package_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
@@ -1,24 +1,18 @@
 """Changelog template."""
 
-from datetime import datetime
+from typing import Any, Mapping, Optional
 
-def get_changelog_template() -> str:
-    """
-    Get the CHANGELOG.md template.
-    
-    Returns:
-        Changelog content
-    """
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    return f'''# Changelog
+from .dates import get_render_date
+from .engine import register_template
+
+CHANGELOG_TEMPLATE = register_template('CHANGELOG.md', '''# Changelog
 
 All notable changes to this project will be documented in this file.
 
 The format is based on [Keep a Changelog](https://keepachangelog.com/en/1.0.0/),
 and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0.html).
 
-## [0.1.0] - {today}
+## [0.1.0] - ${today}
 
 ### Added
 - Initial release
@@ -34,4 +28,18 @@ and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0
   - API documentation
   - Getting started guide
   - Usage examples
-'''
\ No newline at end of file
+''')
+
+def get_changelog_template(config: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Get the CHANGELOG.md template.
+    
+    Args:
+        config: Configuration dictionary containing user settings
+        
+    Returns:
+        Changelog content
+    """
+    today = get_render_date(config).strftime("%Y-%m-%d")
+    
+    return CHANGELOG_TEMPLATE.render({'today': today})
\ No newline at end of file
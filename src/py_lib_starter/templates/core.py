@@ -2,19 +2,12 @@
 
 from typing import Dict
 
-def get_core_templates(project_name: str) -> Dict[str, str]:
-    """
-    Get the core module templates.
-    
-    Args:
-        project_name: Name of the project
-        
-    Returns:
-        Dictionary of filename to content mappings
-    """
-    return {
-        "__init__.py": f'''"""
-{project_name} - Internal library for common functionality across projects
+from .engine import register_template
+
+# Template sources by file name, relative to src/{project_name}/
+_CORE_SOURCES = {
+    "__init__.py": '''"""
+${project_name} - Internal library for common functionality across projects
 """
 
 from .core import *
@@ -24,7 +17,7 @@ from .exceptions import *
 __version__ = "0.1.0"
 ''',
 
-        "core.py": '''"""Core functionality of the library."""
+    "core.py": '''"""Core functionality of the library."""
 from typing import Any, Dict, List, Optional
 
 class CoreFeature:
@@ -46,7 +39,7 @@ class CoreFeature:
         return data
 ''',
 
-        "utils.py": '''"""Utility functions for the library."""
+    "utils.py": '''"""Utility functions for the library."""
 from typing import Any, List
 import logging
 from .exceptions import ValidationError
@@ -83,7 +76,7 @@ def validate_input(data: List[Any]) -> bool:
     return True
 ''',
 
-        "exceptions.py": '''"""Custom exceptions for the library."""
+    "exceptions.py": '''"""Custom exceptions for the library."""
 
 class LibraryError(Exception):
     """Base exception for the library."""
@@ -97,4 +90,24 @@ class ProcessingError(LibraryError):
     """Raised when processing fails."""
     pass
 '''
+}
+
+CORE_TEMPLATES = {
+    filename: register_template(f'core/{filename}', source)
+    for filename, source in _CORE_SOURCES.items()
+}
+
+def get_core_templates(project_name: str) -> Dict[str, str]:
+    """
+    Get the core module templates.
+    
+    Args:
+        project_name: Name of the project
+        
+    Returns:
+        Dictionary of filename to content mappings
+    """
+    return {
+        filename: template.render({'project_name': project_name})
+        for filename, template in CORE_TEMPLATES.items()
     }
\ No newline at end of file
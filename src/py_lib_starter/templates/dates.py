@@ -0,0 +1,46 @@
+"""Render date used by the templates."""
+
+import os
+from datetime import date, datetime, timezone
+from typing import Any, Optional, Mapping
+
+def get_source_date_epoch() -> Optional[int]:
+    """
+    Get the reproducible-builds timestamp from SOURCE_DATE_EPOCH.
+    
+    Returns:
+        Seconds since the epoch, or None if the variable is unset or invalid
+    """
+    value = os.environ.get('SOURCE_DATE_EPOCH', '').strip()
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+def get_render_date(config: Optional[Mapping[str, Any]] = None) -> date:
+    """
+    Get the date written into generated files.
+    
+    An explicit render_config.date (YYYY-MM-DD) wins, then
+    SOURCE_DATE_EPOCH, then today's date.
+    
+    Args:
+        config: Configuration dictionary containing user settings
+        
+    Returns:
+        Date to render
+    """
+    if config is None:
+        config = {}
+    
+    explicit = config.get('render_config', {}).get('date')
+    if explicit:
+        if isinstance(explicit, date):
+            return explicit
+        return datetime.strptime(str(explicit), '%Y-%m-%d').date()
+    
+    epoch = get_source_date_epoch()
+    if epoch is not None:
+        return datetime.fromtimestamp(epoch, tz=timezone.utc).date()
+    
+    return datetime.now().date()
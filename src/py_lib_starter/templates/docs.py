@@ -2,18 +2,11 @@
 
 from typing import Dict
 
-def get_doc_templates(project_name: str) -> Dict[str, str]:
-    """
-    Get the documentation templates.
-    
-    Args:
-        project_name: Name of the project
-        
-    Returns:
-        Dictionary of filename to content mappings
-    """
-    return {
-        "api.md": f'''# API Documentation
+from .engine import register_template
+
+# Template sources by file name, relative to docs/
+_DOC_SOURCES = {
+    "api.md": '''# API Documentation
 
 ## Core
 
@@ -60,7 +53,7 @@ Main feature class of the library.
 - `ProcessingError`: Raised when processing fails
 ''',
 
-        "getting_started.md": f'''# Getting Started
+    "getting_started.md": '''# Getting Started
 
 ## Installation
 
@@ -78,8 +71,8 @@ Main feature class of the library.
 ## Basic Usage
 
 ```python
-from {project_name} import CoreFeature
-from {project_name}.utils import setup_logging
+from ${project_name} import CoreFeature
+from ${project_name}.utils import setup_logging
 
 # Set up logging
 setup_logging()
@@ -116,41 +109,41 @@ result = feature.process(data)
    ```
 ''',
 
-        "examples.md": f'''# Examples
+    "examples.md": '''# Examples
 
 ## Basic Usage
 
 ```python
-from {project_name} import CoreFeature
+from ${project_name} import CoreFeature
 
 # Initialize with default configuration
 feature = CoreFeature()
 result = feature.process([1, 2, 3])
 
 # Initialize with custom configuration
-feature = CoreFeature({{"param": "value"}})
+feature = CoreFeature({"param": "value"})
 result = feature.process([4, 5, 6])
 ```
 
 ## Error Handling
 
 ```python
-from {project_name} import CoreFeature
-from {project_name}.exceptions import ValidationError, ProcessingError
+from ${project_name} import CoreFeature
+from ${project_name}.exceptions import ValidationError, ProcessingError
 
 try:
     feature = CoreFeature()
     result = feature.process(data)
 except ValidationError as e:
-    print(f"Validation failed: {{e}}")
+    print(f"Validation failed: {e}")
 except ProcessingError as e:
-    print(f"Processing failed: {{e}}")
+    print(f"Processing failed: {e}")
 ```
 
 ## Logging Setup
 
 ```python
-from {project_name}.utils import setup_logging
+from ${project_name}.utils import setup_logging
 
 # Set up with default level (INFO)
 setup_logging()
@@ -159,4 +152,24 @@ setup_logging()
 setup_logging(level="DEBUG")
 ```
 '''
+}
+
+DOC_TEMPLATES = {
+    filename: register_template(f'docs/{filename}', source)
+    for filename, source in _DOC_SOURCES.items()
+}
+
+def get_doc_templates(project_name: str) -> Dict[str, str]:
+    """
+    Get the documentation templates.
+    
+    Args:
+        project_name: Name of the project
+        
+    Returns:
+        Dictionary of filename to content mappings
+    """
+    return {
+        filename: template.render({'project_name': project_name})
+        for filename, template in DOC_TEMPLATES.items()
     }
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""Precompiled templates: parsed once, rendered in a single pass.
+
+Template sources are plain text with three kinds of markup:
+
+- ``${name}`` is a placeholder, replaced by the value passed for ``name``
+- ``$[name]`` is an insertion point, replaced by the snippets inserted
+  there (nothing by default); generated files are extended through these
+  instead of searching and replacing text in the rendered output
+- ``$$`` is a literal ``$``; any other ``$`` is kept as is
+"""
+
+import re
+from typing import Dict, List, Optional, Iterable, Mapping
+
+# One match per markup element, see the module docstring
+MARKUP_PATTERN = re.compile(
+    r'\$(?:(?P<escaped>\$)'
+    r'|\{(?P<placeholder>[A-Za-z_][A-Za-z0-9_]*)\}'
+    r'|\[(?P<insertion>[A-Za-z_][A-Za-z0-9_]*)\])'
+)
+
+_NO_VALUES: Mapping[str, object] = {}
+_NO_INSERTIONS: Mapping[str, Iterable[str]] = {}
+
+class TemplateError(Exception):
+    """Raised when a template cannot be rendered."""
+    pass
+
+def _compile(name: str, source: str) -> tuple:
+    """
+    Translate a template into a Python function returning one f-string.
+
+    Static segments become literal parts of the f-string and every
+    placeholder or insertion point a local variable, so CPython builds the
+    result with a single BUILD_STRING, exactly like a handwritten f-string.
+
+    Args:
+        name: Template name, used in the code object's file name
+        source: Template source
+
+    Returns:
+        Tuple of (render function, placeholders, insertion points)
+    """
+    placeholders: Dict[str, str] = {}
+    insertion_points: Dict[str, str] = {}
+    pieces: List[str] = []
+    static: List[str] = []
+
+    def flush() -> None:
+        if static:
+            text = ''.join(static).replace('{', '{{').replace('}', '}}')
+            pieces.append('f' + repr(text))
+            static.clear()
+
+    position = 0
+    for match in MARKUP_PATTERN.finditer(source):
+        static.append(source[position:match.start()])
+        position = match.end()
+        if match.group('escaped'):
+            static.append('$')
+            continue
+        flush()
+        if match.group('placeholder'):
+            variable = placeholders.setdefault(match.group('placeholder'), f'_p{len(placeholders)}')
+        else:
+            variable = insertion_points.setdefault(match.group('insertion'), f'_i{len(insertion_points)}')
+        pieces.append(f"f'{{{variable}}}'")
+    static.append(source[position:])
+    flush()
+
+    lines = ['def render(_values, _insertions):']
+    lines += [f'    {variable} = _values[{key!r}]' for key, variable in placeholders.items()]
+    lines += [
+        f"    {variable} = ''.join(_insertions[{key!r}]) if {key!r} in _insertions else ''"
+        for key, variable in insertion_points.items()
+    ]
+    lines.append(f"    return {' '.join(pieces) or repr('')}")
+
+    namespace: Dict[str, object] = {}
+    exec(compile('\n'.join(lines), f'<template {name}>', 'exec'), namespace)
+    return namespace['render'], frozenset(placeholders), frozenset(insertion_points)
+
+class Template:
+    """
+    A template compiled once into a Python function.
+
+    Rendering runs that function, which evaluates one f-string made of the
+    static segments and the values, so no part of the source is re-parsed
+    and the result is assembled in a single pass.
+
+    Args:
+        name: Name the template is registered under
+        source: Template source
+    """
+
+    __slots__ = ('name', 'placeholders', 'insertion_points', '_render')
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self._render, self.placeholders, self.insertion_points = _compile(name, source)
+
+    def render(
+        self,
+        values: Optional[Mapping[str, object]] = None,
+        insertions: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> str:
+        """
+        Render the template.
+
+        Args:
+            values: Value for every placeholder, formatted like an f-string
+                field
+            insertions: Snippets to insert at declared insertion points
+
+        Returns:
+            Rendered text
+
+        Raises:
+            TemplateError: If a placeholder has no value or an insertion
+                point is not declared by the template
+        """
+        if insertions:
+            unknown = set(insertions) - self.insertion_points
+            if unknown:
+                raise TemplateError(
+                    f"Template {self.name} has no insertion point {sorted(unknown)[0]!r}"
+                )
+        else:
+            insertions = _NO_INSERTIONS
+
+        try:
+            return self._render(values or _NO_VALUES, insertions)
+        except KeyError as e:
+            raise TemplateError(f"Template {self.name} needs a value for {e.args[0]!r}")
+
+    def __repr__(self) -> str:
+        return f"Template({self.name!r})"
+
+# Compiled templates by name
+_REGISTRY: Dict[str, Template] = {}
+
+def register_template(name: str, source: str) -> Template:
+    """
+    Compile a template and register it under a name.
+
+    Args:
+        name: Template name, conventionally the generated file's path
+        source: Template source
+
+    Returns:
+        The compiled template
+    """
+    template = Template(name, source)
+    _REGISTRY[name] = template
+    return template
+
+def get_template(name: str) -> Template:
+    """
+    Get a registered template.
+
+    Args:
+        name: Template name
+
+    Returns:
+        The compiled template
+
+    Raises:
+        TemplateError: If no template is registered under the name
+    """
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise TemplateError(f"Unknown template: {name}")
+
+def get_template_names() -> List[str]:
+    """Get the names of all registered templates, sorted."""
+    return sorted(_REGISTRY)
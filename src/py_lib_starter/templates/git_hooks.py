@@ -0,0 +1,86 @@
+"""Git hook templates."""
+
+import shlex
+from typing import Dict, Any
+
+from .engine import register_template
+
+# Staged-files-only pre-commit hook. The formatters run over chunks of the
+# staged files in parallel, each chunk through every formatter in order, so
+# no two formatters ever touch the same file at once.
+PRE_COMMIT_TEMPLATE = register_template('.git/hooks/pre-commit', '''#!/bin/sh
+# Checks the staged Python files only. Generated by py_lib_starter.
+set -u
+
+jobs=${jobs}
+if [ "$jobs" -le 0 ] 2>/dev/null; then
+    jobs=$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)
+fi
+
+staged=$(mktemp)
+typed=$(mktemp)
+trap 'rm -f "$staged" "$typed"' EXIT
+git diff --cached --name-only --diff-filter=ACMR -z -- '*.py' '*.pyi' > "$staged"
+[ -s "$staged" ] || exit 0
+
+# Formatters: stop the commit if they changed any staged file
+before=$(xargs -0 git hash-object -- < "$staged")
+xargs -0 -n ${chunk_size} -P "$jobs" sh -c '${formatters}' sh < "$staged" || exit 1
+after=$(xargs -0 git hash-object -- < "$staged")
+if [ "$before" != "$after" ]; then
+    echo "pre-commit: staged files were reformatted; review and 'git add' them" >&2
+    exit 1
+fi
+
+${type_check}''')
+
+_DMYPY_CHECK = '''# Type checking with the mypy daemon, which stays warm between commits
+if command -v dmypy >/dev/null 2>&1; then
+    dmypy run -- ${target}
+else
+    mypy --incremental --cache-dir .mypy_cache ${target}
+fi
+'''
+
+_MYPY_CHECK = '''# Type checking of the staged files; the cache covers what they import
+git diff --cached --name-only --diff-filter=ACMR -z -- ${target_glob} > "$typed"
+[ -s "$typed" ] || exit 0
+xargs -0 mypy --incremental --cache-dir .mypy_cache < "$typed"
+'''
+
+DMYPY_CHECK_TEMPLATE = register_template('.git/hooks/pre-commit:dmypy', _DMYPY_CHECK)
+MYPY_CHECK_TEMPLATE = register_template('.git/hooks/pre-commit:mypy', _MYPY_CHECK)
+
+def get_pre_commit_hook_template(hook_config: Dict[str, Any]) -> str:
+    """
+    Get the pre-commit hook script.
+
+    Args:
+        hook_config: The git_config['git_hooks']['pre-commit'] settings:
+            'formatters' (commands run in order on each chunk of staged
+            files), 'type_checker' ('dmypy', 'mypy' or None), 'mypy_target'
+            (directory to type-check), 'jobs' (parallel formatter
+            processes, None for one per CPU) and 'chunk_size' (files per
+            formatter invocation)
+
+    Returns:
+        Hook script content
+    """
+    formatters = ' && '.join(f'{command} "$@"' for command in hook_config.get('formatters', ()))
+    target = hook_config.get('mypy_target', 'src')
+    type_checker = hook_config.get('type_checker')
+    if type_checker == 'dmypy':
+        type_check = DMYPY_CHECK_TEMPLATE.render({'target': shlex.quote(target)})
+    elif type_checker == 'mypy':
+        type_check = MYPY_CHECK_TEMPLATE.render({
+            'target_glob': shlex.quote(f'{target}/*.py') + ' ' + shlex.quote(f'{target}/*.pyi'),
+        })
+    else:
+        type_check = 'exit 0\n'
+
+    return PRE_COMMIT_TEMPLATE.render({
+        'jobs': int(hook_config.get('jobs') or 0),
+        'chunk_size': int(hook_config.get('chunk_size') or 50),
+        'formatters': formatters or 'true',
+        'type_check': type_check,
+    })
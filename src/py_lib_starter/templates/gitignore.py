@@ -1,13 +1,8 @@
 """Gitignore template."""
 
-def get_gitignore_template() -> str:
-    """
-    Get the .gitignore template.
-    
-    Returns:
-        Gitignore content
-    """
-    return '''# Python
+from .engine import register_template
+
+GITIGNORE_TEMPLATE = register_template('.gitignore', '''# Python
 __pycache__/
 *.py[cod]
 *$py.class
@@ -69,4 +64,13 @@ docs/_build/
 .mypy_cache/
 .dmypy.json
 dmypy.json
-'''
\ No newline at end of file
+''')
+
+def get_gitignore_template() -> str:
+    """
+    Get the .gitignore template.
+    
+    Returns:
+        Gitignore content
+    """
+    return GITIGNORE_TEMPLATE.render()
\ No newline at end of file
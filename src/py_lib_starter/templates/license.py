@@ -1,29 +1,13 @@
 """License template generator."""
 
-from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Mapping, Optional
 
-def get_license_template(config: Dict[str, Any] = None) -> str:
-    """
-    Generate the MIT license template with user configuration.
-    
-    Args:
-        config: Configuration dictionary containing user settings
-        
-    Returns:
-        Formatted license content
-    """
-    if config is None:
-        config = {}
-    
-    # Get user information from config or use defaults
-    metadata = config.get('metadata', {})
-    author = metadata.get('author', 'Your Name')
-    current_year = datetime.now().year
-    
-    return f'''MIT License
+from .dates import get_render_date
+from .engine import register_template
+
+LICENSE_TEMPLATE = register_template('LICENSE', '''MIT License
 
-Copyright (c) {current_year} {author}
+Copyright (c) ${current_year} ${author}
 
 Permission is hereby granted, free of charge, to any person obtaining a copy
 of this software and associated documentation files (the "Software"), to deal
@@ -42,4 +26,27 @@ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
 LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
-'''
\ No newline at end of file
+''')
+
+def get_license_template(config: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Generate the MIT license template with user configuration.
+    
+    Args:
+        config: Configuration dictionary containing user settings
+        
+    Returns:
+        Formatted license content
+    """
+    if config is None:
+        config = {}
+    
+    # Get user information from config or use defaults
+    metadata = config.get('metadata', {})
+    author = metadata.get('author', 'Your Name')
+    current_year = get_render_date(config).year
+    
+    return LICENSE_TEMPLATE.render({
+        'current_year': current_year,
+        'author': author,
+    })
\ No newline at end of file
@@ -1,53 +1,58 @@
 """PyProject.toml template generator."""
 
-from typing import Dict, Any
-
-def get_pyproject_template(
-    project_name: str,
-    config: Dict[str, Any] = None
-) -> str:
-    """
-    Generate the pyproject.toml template with user configuration.
-    
-    Args:
-        project_name: Name of the project
-        config: Configuration dictionary containing user settings
-        
-    Returns:
-        Formatted pyproject.toml content
-    """
-    if config is None:
-        config = {}
-    
-    # Get user information from config or use defaults
-    metadata = config.get('metadata', {})
-    author = metadata.get('author', 'Your Name')
-    author_email = metadata.get('author_email', 'your.email@company.com')
-    
-    # Get Python version requirements
-    python_version = config.get('python_version', {})
-    min_python = python_version.get('min_version', '3.8')
-    
-    # Get code style settings
-    code_style = config.get('code_style', {})
-    line_length = code_style.get('line_length', 88)
-    
-    return f'''[build-system]
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Tuple, Mapping, Optional
+
+from .engine import register_template
+
+# Development dependencies of generated projects, in file order
+DEV_DEPENDENCIES = (
+    'pytest>=7.0.0',
+    'pytest-cov>=4.1.0',
+    'black>=22.0.0',
+    'isort>=5.0.0',
+    'mypy>=0.950',
+    'pylint>=2.17.0',
+    'pre-commit>=3.3.0',
+)
+
+# End of the distribution name in a requirement string
+_NAME_END = re.compile(r'[\s<>=!~;\[]')
+
+def _format_dependencies(requirements: Iterable[str]) -> str:
+    return ''.join(f'    "{requirement}",\n' for requirement in requirements)
+
+def _requirement_name(requirement: str) -> str:
+    return _NAME_END.split(requirement, 1)[0].lower()
+
+_DEV_DEPENDENCY_LINES = _format_dependencies(DEV_DEPENDENCIES)
+_DEV_DEPENDENCY_NAMES = frozenset(_requirement_name(dep) for dep in DEV_DEPENDENCIES)
+
+@lru_cache(maxsize=None)
+def _extra_dev_dependency_lines(requirements: Tuple[str, ...]) -> str:
+    """Format the requirements not already among DEV_DEPENDENCIES."""
+    return _format_dependencies(
+        dep for dep in requirements
+        if _requirement_name(dep) not in _DEV_DEPENDENCY_NAMES
+    )
+
+PYPROJECT_TEMPLATE = register_template('pyproject.toml', '''[build-system]
 requires = ["hatchling"]
 build-backend = "hatchling.build"
 
 [project]
-name = "{project_name}"
+name = "${project_name}"
 version = "0.1.0"
 description = "Internal library for common functionality across projects"
 readme = "README.md"
-requires-python = ">={min_python}"
+requires-python = ">=${min_python}"
 license = "MIT"
 authors = [
-    {{name = "{author}", email = "{author_email}"}}
+    {name = "${author}", email = "${author_email}"}
 ]
 maintainers = [
-    {{name = "{author}", email = "{author_email}"}}
+    {name = "${author}", email = "${author_email}"}
 ]
 keywords = [
     "internal",
@@ -59,7 +64,7 @@ classifiers = [
     "Intended Audience :: Developers",
     "License :: OSI Approved :: MIT License",
     "Programming Language :: Python :: 3",
-    "Programming Language :: Python :: {min_python}",
+    "Programming Language :: Python :: ${min_python}",
     "Programming Language :: Python :: 3.9",
     "Programming Language :: Python :: 3.10",
     "Programming Language :: Python :: 3.11",
@@ -70,26 +75,19 @@ dependencies = []
 
 [project.optional-dependencies]
 dev = [
-    "pytest>=7.0.0",
-    "pytest-cov>=4.1.0",
-    "black>=22.0.0",
-    "isort>=5.0.0",
-    "mypy>=0.950",
-    "pylint>=2.17.0",
-    "pre-commit>=3.3.0",
-]
+${dev_dependencies}$[dev_dependencies]]
 
 [project.urls]
-"Homepage" = "https://github.com/username/{project_name}"
-"Bug Tracker" = "https://github.com/username/{project_name}/issues"
-"Documentation" = "https://github.com/username/{project_name}/docs"
-"Source Code" = "https://github.com/username/{project_name}"
+"Homepage" = "https://github.com/username/${project_name}"
+"Bug Tracker" = "https://github.com/username/${project_name}/issues"
+"Documentation" = "https://github.com/username/${project_name}/docs"
+"Source Code" = "https://github.com/username/${project_name}"
 
 [tool.hatch.build.targets.wheel]
-packages = ["src/{project_name}"]
+packages = ["src/${project_name}"]
 
 [tool.black]
-line-length = {line_length}
+line-length = ${line_length}
 target-version = ['py38']
 include = '\\.pyi?$'
 extend-exclude = """
@@ -102,12 +100,12 @@ extend-exclude = """
 [tool.isort]
 profile = "black"
 multi_line_output = 3
-line_length = {line_length}
-known_first_party = ["{project_name}"]
+line_length = ${line_length}
+known_first_party = ["${project_name}"]
 known_third_party = ["pytest"]
 
 [tool.mypy]
-python_version = "{min_python}"
+python_version = "${min_python}"
 warn_return_any = true
 warn_unused_configs = true
 disallow_untyped_defs = true
@@ -124,7 +122,7 @@ ignore_missing_imports = true
 
 [tool.pytest.ini_options]
 minversion = "7.0"
-addopts = "-ra -q --cov={project_name} --cov-report=term-missing"
+addopts = "-ra -q --cov=${project_name} --cov-report=term-missing"
 testpaths = [
     "tests",
 ]
@@ -170,7 +168,7 @@ disable = [
 ]
 
 [tool.pylint.format]
-max-line-length = {line_length}
+max-line-length = ${line_length}
 
 [tool.pylint.basic]
 good-names = [
@@ -199,5 +197,53 @@ ignore = [
     "C901",  # too complex
 ]
 target-version = "py38"
-line-length = {line_length}
-'''
\ No newline at end of file
+line-length = ${line_length}
+'''
+)
+
+def get_pyproject_template(
+    project_name: str,
+    config: Optional[Mapping[str, Any]] = None,
+    extra_dev_dependencies: Iterable[str] = ()
+) -> str:
+    """
+    Generate the pyproject.toml template with user configuration.
+    
+    Args:
+        project_name: Name of the project
+        config: Configuration dictionary containing user settings
+        extra_dev_dependencies: Requirements to append to the dev extra,
+            unless a dependency of the same name is already listed
+        
+    Returns:
+        Formatted pyproject.toml content
+    """
+    if config is None:
+        config = {}
+    
+    # Get user information from config or use defaults
+    metadata = config.get('metadata', {})
+    author = metadata.get('author', 'Your Name')
+    author_email = metadata.get('author_email', 'your.email@company.com')
+    
+    # Get Python version requirements
+    python_version = config.get('python_version', {})
+    min_python = python_version.get('min_version', '3.8')
+    
+    # Get code style settings
+    code_style = config.get('code_style', {})
+    line_length = code_style.get('line_length', 88)
+    
+    extra = _extra_dev_dependency_lines(tuple(extra_dev_dependencies))
+    
+    return PYPROJECT_TEMPLATE.render(
+        {
+            'project_name': project_name,
+            'author': author,
+            'author_email': author_email,
+            'min_python': min_python,
+            'line_length': line_length,
+            'dev_dependencies': _DEV_DEPENDENCY_LINES,
+        },
+        {'dev_dependencies': (extra,)} if extra else None
+    )
@@ -1,21 +1,10 @@
 """README.md template generator."""
 
-from typing import Dict, Any
+from typing import Any, Mapping, Optional
 
-def get_readme_template(
-    project_name: str,
-    config: Dict[str, Any] = None
-) -> str:
-    """Generate README.md content."""
-    if config is None:
-        config = {}
-    
-    # Get user information
-    metadata = config.get('metadata', {})
-    author = metadata.get('author', 'Your Name')
-    github_username = metadata.get('github_username', 'your-github-username')
-    
-    return f'''# {project_name}
+from .engine import register_template
+
+README_TEMPLATE = register_template('README.md', '''# ${project_name}
 
 [Brief description of your project]
 
@@ -50,7 +39,7 @@ You can install this package using either pip or conda.
    python -m build
 
    # Install the built package
-   pip install dist/{project_name}-0.1.0-py3-none-any.whl
+   pip install dist/${project_name}-0.1.0-py3-none-any.whl
    ```
 
 ### Option 2: Installation with conda
@@ -58,8 +47,8 @@ You can install this package using either pip or conda.
 1. **Development Installation**:
    ```bash
    # Create and activate conda environment
-   conda create -n {project_name} python=3.11
-   conda activate {project_name}
+   conda create -n ${project_name} python=3.11
+   conda activate ${project_name}
 
    # Install conda-build if not already installed
    conda install conda-build
@@ -74,7 +63,7 @@ You can install this package using either pip or conda.
    conda build .
 
    # Install the local package
-   conda install --use-local {project_name}
+   conda install --use-local ${project_name}
    ```
 
 3. **Installing Dependencies**:
@@ -87,8 +76,8 @@ You can install this package using either pip or conda.
 
 1. **Clone the repository**:
    ```bash
-   git clone https://github.com/{github_username}/{project_name}.git
-   cd {project_name}
+   git clone https://github.com/${github_username}/${project_name}.git
+   cd ${project_name}
    ```
 
 2. **Set up the development environment**:
@@ -99,8 +88,8 @@ You can install this package using either pip or conda.
    pip install -e ".[dev]"
 
    # OR using conda
-   conda create -n {project_name} python=3.11
-   conda activate {project_name}
+   conda create -n ${project_name} python=3.11
+   conda activate ${project_name}
    pip install -e ".[dev]"
    ```
 
@@ -124,7 +113,7 @@ You can install this package using either pip or conda.
 ## Usage
 
 ```python
-from {project_name} import CoreFeature
+from ${project_name} import CoreFeature
 
 # Initialize the feature
 feature = CoreFeature()
@@ -136,9 +125,9 @@ result = feature.process(data)
 ## Project Structure
 
 ```
-{project_name}/
+${project_name}/
 ├── src/
-│   └── {project_name}/
+│   └── ${project_name}/
 │       ├── __init__.py      # Package initialization
 │       ├── core.py          # Core functionality
 │       ├── utils.py         # Utility functions
@@ -163,7 +152,7 @@ result = feature.process(data)
 ### Using pip
 
 1. **Update version number**:
-   - Edit `src/{project_name}/__init__.py`
+   - Edit `src/${project_name}/__init__.py`
    - Update `__version__ = "x.y.z"`
 
 2. **Clean previous builds**:
@@ -189,7 +178,7 @@ result = feature.process(data)
 
 2. **Install locally**:
    ```bash
-   conda install --use-local {project_name}
+   conda install --use-local ${project_name}
    ```
 
 3. **Create conda environment file**:
@@ -217,9 +206,28 @@ This project is licensed under the MIT License - see the LICENSE file for detail
 
 ## Authors
 
-- {author}
+- ${author}
 
 ## Acknowledgments
 
 - List any acknowledgments here
-'''
\ No newline at end of file
+''')
+
+def get_readme_template(
+    project_name: str,
+    config: Optional[Mapping[str, Any]] = None
+) -> str:
+    """Generate README.md content."""
+    if config is None:
+        config = {}
+    
+    # Get user information
+    metadata = config.get('metadata', {})
+    author = metadata.get('author', 'Your Name')
+    github_username = metadata.get('github_username', 'your-github-username')
+    
+    return README_TEMPLATE.render({
+        'project_name': project_name,
+        'github_username': github_username,
+        'author': author,
+    })
\ No newline at end of file
@@ -1,8 +1,15 @@
 """Setup.cfg template."""
 
-from typing import Dict, Any
+from typing import Any, Mapping, Optional
 
-def get_setup_cfg_template(project_name: str, config: Dict[str, Any] = None) -> str:
+from .engine import register_template
+
+SETUP_CFG_TEMPLATE = register_template('setup.cfg', """[metadata]
+name = ${project_name}
+# Additional setup.cfg content...
+""")
+
+def get_setup_cfg_template(project_name: str, config: Optional[Mapping[str, Any]] = None) -> str:
     """
     Generate setup.cfg template with user configuration.
     
@@ -16,7 +23,4 @@ def get_setup_cfg_template(project_name: str, config: Dict[str, Any] = None) ->
     if config is None:
         config = {}
         
-    return f"""[metadata]
-name = {project_name}
-# Additional setup.cfg content...
-"""
\ No newline at end of file
+    return SETUP_CFG_TEMPLATE.render({'project_name': project_name})
\ No newline at end of file
@@ -2,30 +2,23 @@
 
 from typing import Dict
 
-def get_test_templates(project_name: str) -> Dict[str, str]:
-    """
-    Get the test module templates.
-    
-    Args:
-        project_name: Name of the project
-        
-    Returns:
-        Dictionary of filename to content mappings
-    """
-    return {
-        "__init__.py": "",  # Empty init file
+from .engine import register_template
+
+# Template sources by file name, relative to tests/
+_TEST_SOURCES = {
+    "__init__.py": "",  # Empty init file
 
-        "test_core.py": f'''"""Tests for core functionality."""
+    "test_core.py": '''"""Tests for core functionality."""
 import pytest
-from {project_name}.core import CoreFeature
-from {project_name}.exceptions import ValidationError
+from ${project_name}.core import CoreFeature
+from ${project_name}.exceptions import ValidationError
 
 def test_core_feature_initialization():
     """Test CoreFeature initialization."""
     feature = CoreFeature()
-    assert feature.config == {{}}
+    assert feature.config == {}
     
-    config = {{"param": "value"}}
+    config = {"param": "value"}
     feature = CoreFeature(config)
     assert feature.config == config
 
@@ -37,10 +30,10 @@ def test_core_feature_process():
     assert isinstance(result, list)
 ''',
 
-        "test_utils.py": f'''"""Tests for utility functions."""
+    "test_utils.py": '''"""Tests for utility functions."""
 import pytest
-from {project_name}.utils import validate_input, setup_logging
-from {project_name}.exceptions import ValidationError
+from ${project_name}.utils import validate_input, setup_logging
+from ${project_name}.exceptions import ValidationError
 
 def test_validate_input_with_valid_data():
     """Test validate_input with valid data."""
@@ -64,4 +57,24 @@ def test_setup_logging():
     setup_logging(level="DEBUG")
     # Add assertions for logging configuration if needed
 '''
+}
+
+TEST_TEMPLATES = {
+    filename: register_template(f'tests/{filename}', source)
+    for filename, source in _TEST_SOURCES.items()
+}
+
+def get_test_templates(project_name: str) -> Dict[str, str]:
+    """
+    Get the test module templates.
+    
+    Args:
+        project_name: Name of the project
+        
+    Returns:
+        Dictionary of filename to content mappings
+    """
+    return {
+        filename: template.render({'project_name': project_name})
+        for filename, template in TEST_TEMPLATES.items()
     }
\ No newline at end of file
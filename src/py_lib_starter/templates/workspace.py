@@ -0,0 +1,129 @@
+"""Root templates of a monorepo holding many packages."""
+
+from typing import Any, Sequence, Mapping, Optional
+
+from .engine import register_template
+
+# Directory of the packages, relative to the repository root
+PACKAGES_DIR = 'packages'
+
+WORKSPACE_PYPROJECT_TEMPLATE = register_template('workspace/pyproject.toml', '''# Workspace of the packages under packages/. Each package keeps its own
+# pyproject.toml; the settings here apply when tools run from the root.
+
+[tool.uv.workspace]
+members = ["packages/*"]
+
+[tool.black]
+line-length = ${line_length}
+target-version = ['py38']
+include = '\\.pyi?$'
+
+[tool.isort]
+profile = "black"
+multi_line_output = 3
+line_length = ${line_length}
+known_first_party = [
+${first_party}]
+known_third_party = ["pytest"]
+
+[tool.mypy]
+python_version = "${min_python}"
+warn_return_any = true
+warn_unused_configs = true
+disallow_untyped_defs = true
+disallow_incomplete_defs = true
+check_untyped_defs = true
+no_implicit_optional = true
+warn_redundant_casts = true
+warn_unused_ignores = true
+strict_equality = true
+ignore_missing_imports = true
+
+[tool.pytest.ini_options]
+minversion = "7.0"
+# Every package has a tests/ package; importlib mode keeps them apart
+addopts = "-ra -q --import-mode=importlib"
+testpaths = [
+    "packages",
+]
+pythonpath = [
+${source_dirs}]
+filterwarnings = [
+    "error",
+    "ignore::DeprecationWarning",
+    "ignore::UserWarning",
+]
+''')
+
+WORKSPACE_README_TEMPLATE = register_template('workspace/README.md', '''# ${workspace_name}
+
+Monorepo of Python packages, one per directory under `packages/`:
+
+${package_list}
+## Development
+
+Each package is a complete project with its own `pyproject.toml`. To work
+on all of them at once, install them into one environment and run the
+tools from this directory:
+
+```bash
+python -m venv venv
+source venv/bin/activate  # On Windows: venv\\Scripts\\activate
+${install_commands}pytest
+```
+
+## License
+
+This repository is licensed under the MIT License - see the
+[LICENSE](LICENSE) file for details.
+''')
+
+def get_workspace_pyproject_template(
+    package_names: Sequence[str],
+    config: Optional[Mapping[str, Any]] = None
+) -> str:
+    """
+    Generate the pyproject.toml at the root of a monorepo.
+
+    Args:
+        package_names: Names of the packages under packages/
+        config: Configuration dictionary containing user settings
+
+    Returns:
+        Formatted pyproject.toml content
+    """
+    if config is None:
+        config = {}
+
+    python_version = config.get('python_version', {})
+    code_style = config.get('code_style', {})
+
+    return WORKSPACE_PYPROJECT_TEMPLATE.render({
+        'line_length': code_style.get('line_length', 88),
+        'min_python': python_version.get('min_version', '3.8'),
+        'first_party': ''.join(f'    "{name}",\n' for name in package_names),
+        'source_dirs': ''.join(
+            f'    "{PACKAGES_DIR}/{name}/src",\n' for name in package_names
+        ),
+    })
+
+def get_workspace_readme_template(workspace_name: str, package_names: Sequence[str]) -> str:
+    """
+    Generate the README.md at the root of a monorepo.
+
+    Args:
+        workspace_name: Name of the repository directory
+        package_names: Names of the packages under packages/
+
+    Returns:
+        Formatted README content
+    """
+    return WORKSPACE_README_TEMPLATE.render({
+        'workspace_name': workspace_name,
+        'package_list': ''.join(
+            f'- [{name}]({PACKAGES_DIR}/{name})\n' for name in package_names
+        ),
+        'install_commands': ''.join(
+            f'pip install -e "{PACKAGES_DIR}/{name}[dev]"\n' for name in package_names
+        ),
+    })
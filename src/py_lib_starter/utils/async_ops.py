@@ -0,0 +1,235 @@
+"""Asyncio front end of project creation.
+
+create_project_structure_async does the same work as
+create_project_structure without blocking the event loop: rendering and
+file writes run in an executor, git subprocesses run through
+asyncio.create_subprocess_exec. A per-loop semaphore bounds how many
+generations run at once, and a generation cancelled before it finished
+removes the project directory it created.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import shutil
+import subprocess
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TYPE_CHECKING, Mapping
+
+from .file_ops import (
+    FileOperationError,
+    _resolve_git_identity,
+    create_project_structure,
+    initialize_git,
+    setup_git_hooks,
+    write_project,
+)
+
+if TYPE_CHECKING:
+    from .sinks import OutputSink
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Generations running at once per event loop by default; matches the
+# default executor's thread count, which bounds the useful parallelism
+DEFAULT_CONCURRENCY = min(32, (os.cpu_count() or 1) + 4)
+
+# Default semaphore of each event loop (semaphores are bound to a loop)
+_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = (
+    weakref.WeakKeyDictionary()
+)
+
+def _default_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(DEFAULT_CONCURRENCY)
+    return semaphore
+
+async def _run_blocking(
+    executor: Optional[concurrent.futures.Executor],
+    func: Callable[..., Any],
+    *args: Any
+) -> Any:
+    """
+    Run a blocking call in an executor.
+
+    Executor threads cannot be interrupted, so when the awaiting task is
+    cancelled the call is waited for before the cancellation propagates;
+    nothing keeps writing to a project that is about to be removed.
+
+    Args:
+        executor: Executor (default: the loop's default executor)
+        func: Blocking function
+        *args: Arguments for func
+
+    Returns:
+        The function's return value
+    """
+    future = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        raise
+
+async def _run_git(args: List[str], cwd: Path, env: Optional[Dict[str, str]] = None) -> None:
+    """
+    Run a git command without blocking the event loop.
+
+    Args:
+        args: Arguments following 'git'
+        cwd: Working directory
+        env: Environment (default: inherited)
+
+    Raises:
+        FileOperationError: If git exits with an error
+    """
+    process = await asyncio.create_subprocess_exec(
+        'git', *args, cwd=str(cwd), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        _, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # Do not leave git running on a directory about to be removed
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    if process.returncode != 0:
+        raise FileOperationError(
+            f"Git operation failed: git {args[0]} exited with {process.returncode}: "
+            f"{stderr.decode('utf-8', 'replace').strip()}"
+        )
+
+async def initialize_git_async(
+    project_path: Path,
+    config: Mapping[str, Any],
+    files: Optional[Iterable[str]] = None,
+    executor: Optional[concurrent.futures.Executor] = None
+) -> None:
+    """
+    Initialize a git repository like initialize_git, without blocking.
+
+    The native backend only does file I/O and runs in the executor; the
+    subprocess backend runs git through asyncio subprocesses.
+
+    Args:
+        project_path: Path to project directory
+        config: Project configuration
+        files: Paths of the files written to project_path, relative to it
+            (optional)
+        executor: Executor for blocking work (default: the loop's)
+
+    Raises:
+        FileOperationError: If git initialization fails
+    """
+    git_config = config.get('git_config', {})
+    if not git_config.get('init_git', True):
+        logger.info("Skipping git initialization as per configuration")
+        return
+
+    if files is not None and git_config.get('backend', 'native') == 'native':
+        await _run_blocking(executor, initialize_git, project_path, config, files)
+        return
+
+    initial_branch = git_config.get('initial_branch') or 'main'
+    try:
+        author_name, author_email = await _run_blocking(executor, _resolve_git_identity, config)
+        await _run_git(['init'], project_path)
+        await _run_blocking(
+            executor, (project_path / '.git' / 'HEAD').write_text, f"ref: refs/heads/{initial_branch}\n"
+        )
+        await _run_git(['config', 'user.name', author_name], project_path)
+        await _run_git(['config', 'user.email', author_email], project_path)
+        await _run_git(['add', '.'], project_path)
+        await _run_git(
+            ['commit', '-m', 'Initial commit'],
+            project_path,
+            {**os.environ, 'GIT_AUTHOR_NAME': author_name, 'GIT_AUTHOR_EMAIL': author_email},
+        )
+
+        git_hooks = git_config.get('git_hooks', {})
+        if git_hooks:
+            await _run_blocking(executor, setup_git_hooks, project_path, git_hooks)
+    except FileOperationError:
+        raise
+    except OSError as e:
+        raise FileOperationError(f"Failed to initialize git: {e}")
+    logger.info("Git repository initialized with initial commit")
+
+async def create_project_structure_async(
+    project_name: str,
+    base_path: Optional[str] = None,
+    config: Optional[Mapping[str, Any]] = None,
+    sink: Optional['OutputSink'] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Create the complete project structure without blocking the event loop.
+
+    Behaves like create_project_structure. When the task is cancelled
+    while creating a new project, the blocking work in flight is allowed
+    to finish and the project directory is removed before the
+    cancellation propagates. An existing project being regenerated is
+    left as it is.
+
+    Args:
+        project_name: Name of the project
+        base_path: Base path for project creation
+        config: Configuration options including user information
+        sink: Destination of the project files (default: a directory named
+            after the project under base_path); rendered in the executor
+        executor: Executor for rendering and file writes (default: the
+            loop's default executor)
+        semaphore: Bounds concurrent generations (default: one semaphore of
+            DEFAULT_CONCURRENCY per event loop)
+
+    Returns:
+        For on-disk generation, the statistics of create_project_structure;
+        None otherwise
+
+    Raises:
+        FileOperationError: If project creation fails
+    """
+    async with semaphore or _default_semaphore():
+        if sink is not None:
+            return await _run_blocking(
+                executor, create_project_structure, project_name, None, config, sink
+            )
+
+        project_path = Path(base_path if base_path is not None else os.getcwd()) / project_name
+        is_new = not project_path.exists()
+        logger.info(f"Creating project structure at: {project_path}")
+
+        try:
+            stats, committed_files = await _run_blocking(
+                executor, write_project, project_name, project_path, config
+            )
+            if committed_files is not None:
+                await initialize_git_async(project_path, config, committed_files, executor)
+            if config and config.get('venv_config', {}).get('create_venv'):
+                from .venv_seed import provision_venv
+
+                await _run_blocking(executor, provision_venv, project_path, config)
+        except asyncio.CancelledError:
+            if is_new:
+                # Shielded so a repeated cancellation cannot skip the cleanup
+                await asyncio.shield(
+                    _run_blocking(executor, shutil.rmtree, project_path, True)
+                )
+                logger.info(f"Removed partially created project at {project_path}")
+            raise
+        except FileOperationError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to create project structure: {e}")
+            raise FileOperationError(f"Failed to create project structure: {e}")
+
+        logger.info(f"Successfully created project structure for {project_name}")
+        return stats
@@ -0,0 +1,268 @@
+"""Batch generation of many projects from a single manifest."""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Sequence
+
+from ..config.default import update_config
+from ..config.loader import load_config
+from ..config.toml import load_toml
+from . import profiling
+from .file_ops import create_project_structure
+from .validation import validate_project_name
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Keys of a manifest entry that describe the project rather than its config
+ENTRY_KEYS = ('name', 'path')
+
+class ManifestError(Exception):
+    """Exception for unreadable or malformed manifests."""
+    pass
+
+def _normalize_entry(
+    raw: Dict[str, Any],
+    defaults: Optional[Dict[str, Any]] = None,
+    where: str = ''
+) -> Dict[str, Any]:
+    """
+    Turn a raw manifest entry into a project specification.
+
+    Args:
+        raw: Entry as read from the manifest
+        defaults: Config overrides shared by every entry
+        where: Location of the entry, used in error messages
+
+    Returns:
+        Dictionary with 'name', 'path' and 'config' keys
+
+    Raises:
+        ManifestError: If the entry has no project name
+    """
+    if not isinstance(raw, dict):
+        raise ManifestError(f"{where}: manifest entry must be a table/object")
+
+    name = raw.get('name')
+    if not name or not isinstance(name, str):
+        raise ManifestError(f"{where}: manifest entry is missing 'name'")
+
+    overrides = {key: value for key, value in raw.items() if key not in ENTRY_KEYS}
+
+    return {
+        'name': name,
+        'path': raw.get('path'),
+        'config': _merge(defaults or {}, overrides),
+    }
+
+def _merge(base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge two override dictionaries into a new one."""
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(merged.get(key), dict) and isinstance(value, dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Load a batch manifest.
+
+    JSONL manifests hold one JSON object per line. TOML manifests hold a
+    ``[[projects]]`` array and an optional ``[defaults]`` table that is
+    merged under every project. Each entry needs a ``name``, may set a
+    ``path`` and treats any other key as a configuration override.
+
+    Args:
+        path: Path to a .jsonl or .toml manifest
+
+    Returns:
+        List of project specifications
+
+    Raises:
+        ManifestError: If the manifest cannot be read or is malformed
+    """
+    manifest_path = Path(path)
+    entries: List[Dict[str, Any]] = []
+
+    try:
+        if manifest_path.suffix == '.toml':
+            document = load_toml(manifest_path)
+            defaults = document.get('defaults', {})
+            for index, raw in enumerate(document.get('projects', [])):
+                entries.append(
+                    _normalize_entry(raw, defaults, f"{path}: projects[{index}]")
+                )
+        else:
+            with open(manifest_path, encoding='utf-8') as f:
+                for lineno, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    entries.append(
+                        _normalize_entry(json.loads(line), None, f"{path}:{lineno}")
+                    )
+    except ManifestError:
+        raise
+    except Exception as e:
+        raise ManifestError(f"Failed to read manifest {path}: {e}")
+
+    if not entries:
+        raise ManifestError(f"Manifest {path} does not list any projects")
+
+    return entries
+
+def build_project(
+    entry: Dict[str, Any],
+    base_path: Optional[str] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+    profile: bool = False,
+    config_files: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """
+    Build a single project from a manifest entry.
+
+    Runs in a worker process, so failures are returned rather than raised.
+
+    Args:
+        entry: Project specification from load_manifest
+        base_path: Base path used when the entry does not set one
+        overrides: Config overrides applied on top of the entry's own
+        profile: Record profiling spans and return them as 'profile', along
+            with the wall-clock 'started' time they are relative to
+        config_files: Configuration files under the entry's own config
+            (see config.loader); each worker parses them once
+
+    Returns:
+        Result dictionary with 'name', 'path', 'success', 'error' and 'duration'
+    """
+    if profile:
+        started = time.time()
+        with profiling.Profiler() as profiler:
+            result = build_project(entry, base_path, overrides, config_files=config_files)
+        result['started'] = started
+        result['profile'] = profiler.report()['spans']
+        return result
+
+    start = time.perf_counter()
+    project_base = entry.get('path') or base_path or os.getcwd()
+    result = {
+        'name': entry['name'],
+        'path': str(Path(project_base) / entry['name']),
+        'success': True,
+        'error': None,
+    }
+
+    try:
+        validate_project_name(entry['name'])
+
+        base = load_config(config_files) if config_files else None
+        config = update_config(entry.get('config') or {}, base)
+        if overrides:
+            config = update_config(overrides, config)
+        result['stats'] = create_project_structure(entry['name'], project_base, config)
+    except Exception as e:
+        logger.error(f"Failed to build {entry['name']}: {e}")
+        result['success'] = False
+        result['error'] = str(e)
+
+    result['duration'] = time.perf_counter() - start
+    return result
+
+def run_batch(
+    entries: List[Dict[str, Any]],
+    base_path: Optional[str] = None,
+    jobs: Optional[int] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+    config_files: Sequence[str] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Build every project in a manifest across a process pool.
+
+    While profiling is enabled, the spans recorded by worker processes are
+    replayed to this process's listeners.
+
+    Args:
+        entries: Project specifications from load_manifest
+        base_path: Base path for entries that do not set one
+        jobs: Number of worker processes (default: CPU count)
+        overrides: Config overrides applied to every project (e.g. CLI flags)
+        config_files: Configuration files under every entry's own config
+
+    Returns:
+        One result dictionary per entry, in manifest order
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(entries)))
+
+    logger.info(f"Building {len(entries)} projects with {jobs} worker(s)")
+
+    # Avoid the pool start-up cost when there is nothing to parallelize
+    if jobs == 1:
+        return [
+            build_project(entry, base_path, overrides, config_files=config_files)
+            for entry in entries
+        ]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+    profile = profiling.enabled()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                build_project, entry, base_path, overrides, profile, config_files
+            ): index
+            for index, entry in enumerate(entries)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+                if profile:
+                    # Map the worker's clock onto ours through the wall clock
+                    started = results[index].pop('started')
+                    origin = time.perf_counter() - (time.time() - started)
+                    profiling.replay(results[index].pop('profile'), origin)
+            except Exception as e:
+                # The worker itself died (e.g. killed or unpicklable result)
+                results[index] = {
+                    'name': entries[index]['name'],
+                    'path': None,
+                    'success': False,
+                    'error': f"Worker failed: {e}",
+                    'duration': 0.0,
+                }
+
+    return results
+
+def format_batch_summary(results: List[Dict[str, Any]]) -> str:
+    """
+    Format a per-project success/failure summary.
+
+    Args:
+        results: Results returned by run_batch
+
+    Returns:
+        Human readable summary
+    """
+    lines = []
+    for result in results:
+        status = 'ok' if result['success'] else 'FAILED'
+        line = f"  [{status:>6}] {result['name']} ({result['duration']:.2f}s)"
+        if result['error']:
+            line += f": {result['error']}"
+        elif result.get('stats') and result['stats']['conflicts']:
+            line += f": {len(result['stats']['conflicts'])} locally modified file(s) kept"
+        lines.append(line)
+
+    failed = sum(1 for result in results if not result['success'])
+    lines.append(
+        f"\n{len(results) - failed} succeeded, {failed} failed, "
+        f"{len(results)} total"
+    )
+    return "\n".join(lines)
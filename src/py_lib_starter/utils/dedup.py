@@ -0,0 +1,256 @@
+"""Deduplicated materialization: one blob per unique content, linked into projects."""
+
+import errno
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+
+from .bulk_write import BulkFileWriter, _unlink_if_exists
+from .file_ops import FileOperationError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Linux ioctl cloning a whole file (copy-on-write), see ioctl_ficlone(2)
+FICLONE = 0x40049409
+
+DEDUP_METHODS = ('hardlink', 'reflink', 'copy')
+
+# Name of the default blob store, created next to the generated projects
+BLOB_STORE_DIRNAME = '.py_lib_starter_blobs'
+
+# Blobs are read-only: a hardlinked project file must not be edited in place
+BLOB_MODE = 0o444
+
+# Bits dropped from a file's mode before comparing it with BLOB_MODE
+WRITE_BITS = 0o222
+
+class BlobStore:
+    """
+    Directory holding each unique file content exactly once.
+
+    Blobs are named after the SHA-256 of their content and written through
+    a temporary file and an atomic rename, so concurrent batch workers can
+    share one store safely. A blob found on disk is only reused once its
+    content matches its name: a hardlinked project file written in place
+    (by root, or after a chmod) changes the blob with it, and is then
+    replaced by a fresh copy.
+
+    Args:
+        root: Store directory; must be on the same filesystem as the
+            projects for hardlinks and reflinks to work
+        mode: Permissions of stored blobs (shared by every hardlink)
+    """
+
+    def __init__(self, root: Union[str, Path], mode: int = BLOB_MODE):
+        self.root = Path(root)
+        self.mode = mode
+        # Digest -> (size, mtime in nanoseconds) of blobs verified by this process
+        self._known: Dict[str, Tuple[int, int]] = {}
+
+    def _intact(self, path: str, digest: str, size: int) -> bool:
+        """Tell whether a blob exists and still holds the content it is named after."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        signature = (st.st_size, st.st_mtime_ns)
+        if self._known.get(digest) == signature:
+            return True
+        if st.st_size != size:
+            return False
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                hasher.update(chunk)
+        if hasher.hexdigest() != digest:
+            return False
+        if stat.S_IMODE(st.st_mode) != self.mode:
+            # Stored by a version that left blobs writable
+            os.chmod(path, self.mode)
+        self._known[digest] = signature
+        return True
+
+    def put(self, data: bytes) -> str:
+        """
+        Store content unless it is already present.
+
+        Args:
+            data: File content
+
+        Returns:
+            Path of the blob
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.root, digest[:2], digest)
+        if self._intact(path, digest, len(data)):
+            return path
+        if os.path.exists(path):
+            logger.warning(f"Replacing modified blob {path}")
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_name, self.mode)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+        st = os.stat(path)
+        self._known[digest] = (st.st_size, st.st_mtime_ns)
+        return path
+
+def _reflink(src: str, dst: str) -> None:
+    """
+    Clone a file with FICLONE, then copy_file_range, then a plain copy.
+
+    Args:
+        src: Source file
+        dst: Destination file (must not exist)
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            import fcntl
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return
+        except (ImportError, OSError):
+            pass
+
+        copy_file_range = getattr(os, 'copy_file_range', None)
+        if copy_file_range is not None:
+            try:
+                size = os.fstat(fsrc.fileno()).st_size
+                copied = 0
+                while copied < size:
+                    count = copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                    if count == 0:
+                        break
+                    copied += count
+                if copied == size:
+                    return
+            except OSError:
+                pass
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+
+        shutil.copyfileobj(fsrc, fdst)
+
+def link_blob(src: str, dst: str, method: str) -> str:
+    """
+    Materialize a blob at dst, falling back to cheaper-to-support methods.
+
+    Args:
+        src: Blob path
+        dst: Destination path (must not exist)
+        method: 'hardlink', 'reflink' or 'copy'
+
+    Returns:
+        The method that was actually used
+    """
+    if method == 'hardlink':
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EMLINK, errno.EPERM, errno.ENOTSUP):
+                raise
+            logger.debug(f"Hardlink failed ({e}), falling back to reflink/copy")
+        method = 'reflink'
+
+    if method == 'reflink':
+        _reflink(src, dst)
+        return 'reflink'
+
+    shutil.copyfile(src, dst)
+    return 'copy'
+
+class DedupFileWriter(BulkFileWriter):
+    """
+    Bulk writer that links files from a blob store instead of writing them.
+
+    Identical content written into many projects occupies one inode with
+    hardlinks, or shares extents with reflinks. Hardlinked files share
+    their mode and content, so they are read-only, and this mode is meant
+    for generated fixtures rather than working trees. Files whose mode
+    does not match the store's even without write bits (e.g. executables)
+    are copied (reflinked where possible) and given their own mode.
+
+    Args:
+        root: Project root
+        store: Blob store on the same filesystem
+        method: 'hardlink', 'reflink' or 'copy'
+        dir_mode: Mode of created directories
+        max_workers: Thread pool size for linking (optional)
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        store: BlobStore,
+        method: str = 'hardlink',
+        dir_mode: int = 0o755,
+        max_workers: Optional[int] = None
+    ):
+        if method not in DEDUP_METHODS:
+            raise FileOperationError(f"Unknown dedup method: {method}")
+        super().__init__(root, dir_mode, max_workers)
+        self.store = store
+        self.method = method
+
+    def _write(self, path: str, data: bytes, mode: int, replace: bool) -> None:
+        """Store the content as a blob and link it into place."""
+        method = self.method
+        if method == 'hardlink' and mode & ~WRITE_BITS != self.store.mode:
+            method = 'reflink'
+        try:
+            blob = self.store.put(data)
+            # Never write through an existing (possibly shared) inode
+            _unlink_if_exists(path)
+            if link_blob(blob, path, method) != 'hardlink':
+                os.chmod(path, mode)
+        except OSError as e:
+            raise FileOperationError(f"Failed to link file {path}: {e}")
+        logger.debug(f"Linked file: {path}")
+
+@lru_cache(maxsize=None)
+def get_blob_store(root: str) -> BlobStore:
+    """Get the process-wide BlobStore for a directory."""
+    return BlobStore(root)
+
+def make_dedup_writer(
+    project_path: Path,
+    io_config: Dict[str, Any]
+) -> Optional[DedupFileWriter]:
+    """
+    Build the writer for io_config['dedup'], if deduplication is enabled.
+
+    Args:
+        project_path: Project root
+        io_config: The 'io_config' configuration section
+
+    Returns:
+        A DedupFileWriter, or None when io_config['dedup'] is not set
+    """
+    method = io_config.get('dedup')
+    if not method:
+        return None
+
+    # Default store sits next to the projects, i.e. on the same filesystem
+    store_root = io_config.get('blob_store') or project_path.parent / BLOB_STORE_DIRNAME
+    return DedupFileWriter(
+        project_path,
+        get_blob_store(str(store_root)),
+        method,
+        max_workers=io_config.get('write_threads'),
+    )
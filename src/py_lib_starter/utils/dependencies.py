@@ -0,0 +1,188 @@
+"""Recording which configuration keys each template reads."""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Set, Tuple
+
+# Fingerprint of a key that is absent from the configuration
+MISSING = '<missing>'
+
+class TrackingConfig(Mapping):
+    """
+    Read-only view of a configuration that records the keys being read.
+
+    Reading a scalar (or missing) key records its dotted path, e.g.
+    'metadata.author'. Nested mappings are returned as tracking views, so
+    only the leaves a template actually uses become dependencies.
+    Iterating over a mapping records the whole mapping, since any added or
+    removed key could change the output.
+
+    Args:
+        data: Configuration mapping to wrap
+        accessed: Set receiving the dotted paths that were read
+        prefix: Dotted path of data within the root configuration
+    """
+
+    def __init__(self, data: Mapping, accessed: Set[str], prefix: str = ''):
+        self._data = data
+        self._accessed = accessed
+        self._prefix = prefix
+
+    def _path(self, key: str) -> str:
+        return f"{self._prefix}.{key}" if self._prefix else str(key)
+
+    def _wrap(self, key: str, value: Any) -> Any:
+        if isinstance(value, Mapping):
+            return TrackingConfig(value, self._accessed, self._path(key))
+        self._accessed.add(self._path(key))
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self._accessed.add(self._path(key))
+            raise
+        return self._wrap(key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._data:
+            self._accessed.add(self._path(key))
+            return default
+        return self._wrap(key, self._data[key])
+
+    def __contains__(self, key: object) -> bool:
+        if key not in self._data:
+            self._accessed.add(self._path(str(key)))
+            return False
+        return True
+
+    def _record_all(self) -> None:
+        self._accessed.add(self._prefix)
+
+    def __iter__(self) -> Iterator[str]:
+        self._record_all()
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        self._record_all()
+        return len(self._data)
+
+def resolve_key(config: Any, dotted: str) -> Tuple[bool, Any]:
+    """
+    Look up a dotted key in a nested configuration.
+
+    Args:
+        config: Root configuration (may be None)
+        dotted: Dotted path such as 'metadata.author', '' for the root
+
+    Returns:
+        Tuple of (found, value)
+    """
+    value = config if config is not None else {}
+    if not dotted:
+        return True, value
+    for part in dotted.split('.'):
+        if not isinstance(value, Mapping) or part not in value:
+            return False, None
+        value = value[part]
+    return True, value
+
+def _plain(value: Any) -> Any:
+    """Convert mappings to plain dicts so they can be serialized."""
+    if isinstance(value, Mapping):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+def fingerprint(config: Any, dotted: str) -> str:
+    """
+    Fingerprint the value a dotted key has in a configuration.
+
+    Args:
+        config: Root configuration
+        dotted: Dotted path of the key
+
+    Returns:
+        Short hash of the value, or MISSING if the key is absent
+    """
+    found, value = resolve_key(config, dotted)
+    if not found:
+        return MISSING
+    data = json.dumps(_plain(value), sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+def fingerprint_all(config: Any, keys: Set[str]) -> Dict[str, str]:
+    """
+    Fingerprint every recorded dependency of a template.
+
+    Args:
+        config: Root configuration
+        keys: Dotted paths recorded by a TrackingConfig
+
+    Returns:
+        Mapping of dotted path to fingerprint
+    """
+    return {key: fingerprint(config, key) for key in sorted(keys)}
+
+def record_inputs(config: Any, keys: Set[str]) -> Dict[str, Any]:
+    """
+    Record the values of the dependencies of a render.
+
+    Together with the templates, these values are enough to render the
+    same files again, e.g. to rebuild the merge base of an upgrade.
+
+    Args:
+        config: Root configuration
+        keys: Dotted paths recorded by TrackingConfigs
+
+    Returns:
+        Mapping of dotted path to plain value, for the keys present
+    """
+    inputs = {}
+    for key in sorted(keys):
+        found, value = resolve_key(config, key)
+        if found and key:
+            inputs[key] = _plain(value)
+    return inputs
+
+def inputs_to_config(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn recorded inputs back into nested configuration overrides.
+
+    Args:
+        inputs: Mapping from record_inputs
+
+    Returns:
+        Nested dictionary for update_config
+    """
+    config: Dict[str, Any] = {}
+    # Shorter paths first, so a recorded mapping is refined by its leaves
+    for key in sorted(inputs, key=lambda dotted: dotted.count('.')):
+        *parents, leaf = key.split('.')
+        node = config
+        for part in parents:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+        value = inputs[key]
+        node[leaf] = dict(value) if isinstance(value, dict) else value
+    return config
+
+def dependencies_changed(config: Any, recorded: Dict[str, str]) -> bool:
+    """
+    Check whether any recorded dependency has a different value now.
+
+    Args:
+        config: Current root configuration
+        recorded: Fingerprints stored by a previous generation
+
+    Returns:
+        True if at least one dependency changed
+    """
+    return any(
+        fingerprint(config, key) != value for key, value in recorded.items()
+    )
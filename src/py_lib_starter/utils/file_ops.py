@@ -2,28 +2,29 @@
 
 import os
 import shutil
-import subprocess
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import (
+    Optional, Dict, Any, List, Tuple, Set, Iterable, Iterator, Callable, Mapping, Union,
+    TYPE_CHECKING,
+)
 import logging
 
-from py_lib_starter.templates.conda_meta import get_conda_meta_template
-from py_lib_starter.templates.license import get_license_template
-
-from ..templates import (
-    get_pyproject_template,
-    get_setup_cfg_template,
-    get_readme_template,
-    get_gitignore_template,
-    get_core_templates,
-    get_test_templates,
-    get_doc_templates,
-    get_changelog_template
-)
+# Template modules load on first attribute access, subprocess where git or
+# venv commands actually run, so importing this module stays cheap
+from .. import templates
+from . import profiling
+
+if TYPE_CHECKING:
+    import subprocess
+
+    from .sinks import OutputSink
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# A rendered file as streamed to sinks: (relative path, mode, content)
+FileEntry = Tuple[str, int, bytes]
+
 class FileOperationError(Exception):
     """Base exception for file operations."""
     pass
@@ -59,7 +60,7 @@ def write_file(path: Path, content: str, mode: int = 0o644) -> None:
         FileOperationError: If file writing fails
     """
     
-    print(f"Writing file: {path}")
+    logger.debug(f"Writing file: {path}")
     
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -69,81 +70,165 @@ def write_file(path: Path, content: str, mode: int = 0o644) -> None:
             path.touch()
             logger.debug(f"Created new file: {path}")
         
-        path.write_text(content, encoding='utf-8')
+        profiling.add_bytes(path.write_text(content, encoding='utf-8'))
         os.chmod(path, mode)
         logger.debug(f"Written file: {path}")
     except Exception as e:
         raise FileOperationError(f"Failed to write file {path}: {e}")
 
-def initialize_git(project_path: Path, config: Dict[str, Any]) -> None:
+def _run_subprocess(args: List[str], **kwargs: Any) -> 'subprocess.CompletedProcess':
+    """Run a command with subprocess.run, counting it in the active profiling span."""
+    import subprocess
+    
+    profiling.add_subprocess()
+    return subprocess.run(args, **kwargs)
+
+def _resolve_git_identity(config: Mapping[str, Any]) -> Tuple[str, str]:
     """
-    Initialize git repository and create initial commit.
+    Get the commit identity from the metadata, falling back to git's global config.
     
     Args:
-        project_path: Path to project directory
         config: Project configuration
         
-    Raises:
-        FileOperationError: If git initialization fails
+    Returns:
+        Tuple of (author name, author email)
     """
-    try:
-        # Get git configuration
-        git_config = config.get('git_config', {})
-        init_git = git_config.get('init_git', True)
-        
-        if not init_git:
-            logger.info("Skipping git initialization as per configuration")
-            return
-        
-        # Initialize git repository
-        subprocess.run(['git', 'init'], cwd=project_path, check=True)
-        logger.info("Initialized git repository")
-        
-        # Configure git user if provided
-        metadata = config.get('metadata', {})
-        author_name = metadata.get('author')
-        author_email = metadata.get('author_email')
+    metadata = config.get('metadata', {})
+    author_name = metadata.get('author')
+    author_email = metadata.get('author_email')
+    
+    # Set default git config if not provided
+    if not author_name or not author_email:
+        import subprocess
         
-        # Set default git config if not provided
-        if not author_name or not author_email:
-            try:
-                # Try to get global git config
-                author_name = subprocess.check_output(['git', 'config', '--global', 'user.name'], text=True).strip()
-                author_email = subprocess.check_output(['git', 'config', '--global', 'user.email'], text=True).strip()
-            except subprocess.CalledProcessError:
-                # Use default values if global config not available
-                author_name = "Anonymous"
-                author_email = "anonymous@example.com"
+        try:
+            # Try to get global git config
+            author_name = _run_subprocess(
+                ['git', 'config', '--global', 'user.name'],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True
+            ).stdout.strip()
+            author_email = _run_subprocess(
+                ['git', 'config', '--global', 'user.email'],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True
+            ).stdout.strip()
+        except (subprocess.CalledProcessError, OSError):
+            # Use default values if global config not available
+            author_name = "Anonymous"
+            author_email = "anonymous@example.com"
+    
+    return author_name, author_email
+
+def read_back_files(project_path: Path, relpaths: Iterable[str]) -> Iterator[FileEntry]:
+    """
+    Read written files back from disk, one at a time.
+    
+    Args:
+        project_path: Project directory
+        relpaths: File paths relative to project_path
         
-        # Configure local repo
-        subprocess.run(['git', 'config', 'user.name', author_name], cwd=project_path, check=True)
-        subprocess.run(['git', 'config', 'user.email', author_email], cwd=project_path, check=True)
+    Yields:
+        Tuples of (relative path, file mode, content)
         
-        # Initial commit
-        subprocess.run(['git', 'add', '.'], cwd=project_path, check=True)
-        subprocess.run(
-            ['git', 'commit', '-m', 'Initial commit'],
-            cwd=project_path,
-            check=True,
-            env={**os.environ, 'GIT_AUTHOR_NAME': author_name, 'GIT_AUTHOR_EMAIL': author_email}
-        )
+    Raises:
+        FileOperationError: If a file cannot be read
+    """
+    for relpath in relpaths:
+        path = project_path / relpath
+        try:
+            with open(path, 'rb') as f:
+                yield relpath, os.fstat(f.fileno()).st_mode, f.read()
+        except OSError as e:
+            raise FileOperationError(f"Failed to read file {path}: {e}")
+
+def initialize_git(
+    project_path: Path,
+    config: Mapping[str, Any],
+    files: Optional[Iterable[str]] = None
+) -> None:
+    """
+    Initialize git repository and create initial commit.
+    
+    With the default 'native' backend and the list of generated files at
+    hand, the repository (objects, refs, index) is written in-process
+    without spawning git, reading the files back from disk one at a time.
+    Otherwise git init/config/add/commit are run as subprocesses.
+    
+    Args:
+        project_path: Path to project directory
+        config: Project configuration
+        files: Paths of the files written to project_path, relative to it
+            (optional; a mapping of rendered files works too)
         
-        # Set up pre-commit hooks if configured
-        git_hooks = git_config.get('git_hooks', {})
-        if git_hooks:
-            setup_git_hooks(project_path, git_hooks)
+    Raises:
+        FileOperationError: If git initialization fails
+    """
+    import subprocess
+    
+    with profiling.span('git', str(project_path)):
+        try:
+            # Get git configuration
+            git_config = config.get('git_config', {})
+            init_git = git_config.get('init_git', True)
+            initial_branch = git_config.get('initial_branch') or 'main'
             
-        logger.info("Git repository initialized with initial commit")
-        
-    except subprocess.CalledProcessError as e:
-        raise FileOperationError(f"Git operation failed: {e}")
-    except Exception as e:
-        raise FileOperationError(f"Failed to initialize git: {e}")
+            if not init_git:
+                logger.info("Skipping git initialization as per configuration")
+                return
+            
+            author_name, author_email = _resolve_git_identity(config)
+            
+            if files is not None and git_config.get('backend', 'native') == 'native':
+                from .git_native import create_repository
+                
+                create_repository(
+                    project_path,
+                    read_back_files(project_path, files),
+                    author_name,
+                    author_email,
+                    initial_branch,
+                )
+                logger.info("Initialized git repository in-process")
+            else:
+                # Initialize git repository on the configured branch; writing HEAD
+                # directly also works with git versions that lack --initial-branch
+                _run_subprocess(['git', 'init'], cwd=project_path, check=True)
+                (project_path / '.git' / 'HEAD').write_text(f"ref: refs/heads/{initial_branch}\n")
+                logger.info("Initialized git repository")
+                
+                # Configure local repo
+                _run_subprocess(['git', 'config', 'user.name', author_name], cwd=project_path, check=True)
+                _run_subprocess(['git', 'config', 'user.email', author_email], cwd=project_path, check=True)
+                
+                # Initial commit
+                _run_subprocess(['git', 'add', '.'], cwd=project_path, check=True)
+                _run_subprocess(
+                    ['git', 'commit', '-m', 'Initial commit'],
+                    cwd=project_path,
+                    check=True,
+                    env={**os.environ, 'GIT_AUTHOR_NAME': author_name, 'GIT_AUTHOR_EMAIL': author_email}
+                )
+            
+            # Set up pre-commit hooks if configured
+            git_hooks = git_config.get('git_hooks', {})
+            if git_hooks:
+                setup_git_hooks(project_path, git_hooks)
+                
+            logger.info("Git repository initialized with initial commit")
+            
+        except subprocess.CalledProcessError as e:
+            raise FileOperationError(f"Git operation failed: {e}")
+        except Exception as e:
+            raise FileOperationError(f"Failed to initialize git: {e}")
 
-def setup_git_hooks(project_path: Path, hooks_config: Dict[str, List[str]]) -> None:
+def setup_git_hooks(project_path: Path, hooks_config: Dict[str, Any]) -> None:
     """
     Set up git hooks based on configuration.
     
+    A hook configured with a list of shell commands runs them as they are.
+    The pre-commit hook can instead be configured with a mapping of
+    settings for the generated staged-files-only hook (see
+    templates.get_pre_commit_hook_template).
+    
     Args:
         project_path: Path to project directory
         hooks_config: Hook configuration dictionary
@@ -151,18 +236,26 @@ def setup_git_hooks(project_path: Path, hooks_config: Dict[str, List[str]]) -> N
     Raises:
         FileOperationError: If hook setup fails
     """
-    hooks_dir = project_path / '.git' / 'hooks'
+    from collections.abc import Mapping
     
-    try:
-        for hook_name, commands in hooks_config.items():
-            hook_path = hooks_dir / hook_name
-            hook_content = "#!/bin/sh\n\n" + "\n".join(commands)
-            
-            write_file(hook_path, hook_content, mode=0o755)
-            logger.debug(f"Created git hook: {hook_name}")
-            
-    except Exception as e:
-        raise FileOperationError(f"Failed to set up git hooks: {e}")
+    with profiling.span('git_hooks'):
+        hooks_dir = project_path / '.git' / 'hooks'
+        
+        try:
+            for hook_name, commands in hooks_config.items():
+                hook_path = hooks_dir / hook_name
+                if not isinstance(commands, Mapping):
+                    hook_content = "#!/bin/sh\n\n" + "\n".join(commands)
+                elif hook_name == 'pre-commit':
+                    hook_content = templates.get_pre_commit_hook_template(commands)
+                else:
+                    raise FileOperationError(f"No generated {hook_name} hook; configure its commands")
+                
+                write_file(hook_path, hook_content, mode=0o755)
+                logger.debug(f"Created git hook: {hook_name}")
+                
+        except Exception as e:
+            raise FileOperationError(f"Failed to set up git hooks: {e}")
 
 def setup_virtual_environment(project_path: Path, python_version: str = None) -> None:
     """
@@ -175,124 +268,464 @@ def setup_virtual_environment(project_path: Path, python_version: str = None) ->
     Raises:
         FileOperationError: If venv creation fails
     """
-    try:
-        venv_path = project_path / 'venv'
-        
-        if python_version:
-            subprocess.run(['python' + python_version, '-m', 'venv', 'venv'], cwd=project_path, check=True)
-        else:
-            subprocess.run(['python', '-m', 'venv', 'venv'], cwd=project_path, check=True)
+    import subprocess
+    
+    with profiling.span('venv'):
+        try:
+            venv_path = project_path / 'venv'
+            
+            if python_version:
+                _run_subprocess(['python' + python_version, '-m', 'venv', 'venv'], cwd=project_path, check=True)
+            else:
+                _run_subprocess(['python', '-m', 'venv', 'venv'], cwd=project_path, check=True)
+                
+            logger.info("Created virtual environment")
             
-        logger.info("Created virtual environment")
+        except subprocess.CalledProcessError as e:
+            raise FileOperationError(f"Failed to create virtual environment: {e}")
+
+def get_project_directories(project_name: str) -> List[str]:
+    """
+    Get the directories of a project, relative to its root.
+    
+    Args:
+        project_name: Name of the project
         
-    except subprocess.CalledProcessError as e:
-        raise FileOperationError(f"Failed to create virtual environment: {e}")
+    Returns:
+        List of directory paths, parents before children
+    """
+    return [
+        'src',
+        f'src/{project_name}',
+        'tests',
+        'docs',
+        'scripts',
+        'examples'
+    ]
 
-def create_project_structure(
+# Dev dependencies the generated pytest configuration relies on
+REQUIRED_DEV_DEPENDENCIES = ('pytest', 'pytest-cov')
+
+def _render_pyproject(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    """Render pyproject.toml, making sure pytest coverage is configured."""
+    # The template always carries [tool.pytest.ini_options] with --cov;
+    # missing dev dependencies go into its dev_dependencies insertion point
+    return {
+        'pyproject.toml': templates.get_pyproject_template(
+            project_name, config, REQUIRED_DEV_DEPENDENCIES
+        )
+    }
+
+def _render_setup_cfg(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {'setup.cfg': templates.get_setup_cfg_template(project_name, config)}
+
+def _render_readme(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {'README.md': templates.get_readme_template(project_name, config)}
+
+def _render_gitignore(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {'.gitignore': templates.get_gitignore_template()}
+
+def _render_changelog(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {'CHANGELOG.md': templates.get_changelog_template(config)}
+
+def _render_conda_meta(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {'meta.yaml': templates.get_conda_meta_template(project_name, config)}
+
+def _render_license(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {'LICENSE': templates.get_license_template(config)}
+
+def _render_core(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {
+        f'src/{project_name}/{filename}': content
+        for filename, content in templates.get_core_templates(project_name).items()
+    }
+
+def _render_tests(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {
+        f'tests/{filename}': content
+        for filename, content in templates.get_test_templates(project_name).items()
+    }
+
+def _render_docs(project_name: str, config: Mapping[str, Any]) -> Dict[str, str]:
+    return {
+        f'docs/{filename}': content
+        for filename, content in templates.get_doc_templates(project_name).items()
+    }
+
+# Render units: each renders one or more files from the project name and config
+RENDER_UNITS: List[Tuple[str, Callable[[str, Mapping[str, Any]], Dict[str, str]]]] = [
+    ('pyproject', _render_pyproject),
+    ('setup_cfg', _render_setup_cfg),
+    ('readme', _render_readme),
+    ('gitignore', _render_gitignore),
+    ('changelog', _render_changelog),
+    ('conda_meta', _render_conda_meta),
+    ('license', _render_license),
+    ('core', _render_core),
+    ('tests', _render_tests),
+    ('docs', _render_docs),
+]
+
+def _skipped_units(config: Optional[Mapping[str, Any]]) -> Set[str]:
+    """Get the render units the configuration leaves out (render_config.skip_units)."""
+    return set((config or {}).get('render_config', {}).get('skip_units') or ())
+
+def render_units(
     project_name: str,
-    base_path: Optional[str] = None,
-    config: Optional[Dict[str, Any]] = None
-) -> None:
+    config: Optional[Mapping[str, Any]] = None,
+    skip: Optional[Set[str]] = None
+) -> Iterator[Tuple[str, Dict[str, str], Set[str]]]:
     """
-    Create the complete project structure.
+    Render a project unit by unit, recording the config keys each one reads.
+    
+    When render_config.cache is enabled, a previous render with the same
+    project name, configuration, template version and date is served from
+    the on-disk render cache instead, and a fresh render is kept in memory
+    until it is stored there. Otherwise only the unit being yielded is
+    alive at any time.
     
     Args:
         project_name: Name of the project
-        base_path: Base path for project creation
         config: Configuration options including user information
+        skip: Names of units not to render
         
-    Raises:
-        FileOperationError: If project creation fails
+    Yields:
+        Tuples of (unit name, rendered files, dotted config keys read)
     """
-    try:
-        # Set up base path
-        if base_path is None:
-            base_path = os.getcwd()
-        base_path = Path(base_path) / project_name
+    from .dependencies import TrackingConfig
+    from . import render_cache
+    from ..templates import get_template_version
+    
+    cache_key = None
+    if render_cache.cache_enabled(config):
+        with profiling.span('render_cache', 'load'):
+            cache_key = render_cache.render_key(project_name, config, get_template_version())
+            cached = render_cache.load_render(cache_key)
+        if cached is not None:
+            logger.debug(f"Render cache hit for {project_name}")
+            for unit_name, files, accessed in cached:
+                if not (skip and unit_name in skip):
+                    yield unit_name, files, set(accessed)
+            return
+    
+    rendered = []
+    for unit_name, render in RENDER_UNITS:
+        if skip and unit_name in skip:
+            continue
+        accessed: Set[str] = set()
+        with profiling.span('render', unit_name):
+            files = render(project_name, TrackingConfig(config or {}, accessed))
+        if cache_key is not None:
+            rendered.append([unit_name, files, sorted(accessed)])
+        yield unit_name, files, accessed
+        # Let the unit go before rendering the next one
+        del files
+    
+    # Only complete renders are worth caching
+    if cache_key is not None and not skip:
+        with profiling.span('render_cache', 'store'):
+            render_cache.store_render(cache_key, rendered)
+
+def iter_project_files(
+    project_name: str,
+    config: Optional[Mapping[str, Any]] = None
+) -> Iterator[FileEntry]:
+    """
+    Render a project as a stream of files for a sink to consume.
+    
+    Files are rendered unit by unit as the stream is consumed, so memory
+    use is bounded by the largest render unit rather than the project.
+    
+    Args:
+        project_name: Name of the project
+        config: Configuration options including user information
         
-        logger.info(f"Creating project structure at: {base_path}")
+    Yields:
+        Tuples of (relative path, file mode, UTF-8 content)
+    """
+    for _, files, _ in render_units(project_name, config, _skipped_units(config)):
+        for relpath, content in files.items():
+            yield relpath, 0o644, content.encode('utf-8')
+        del files
+
+def render_project(
+    project_name: str,
+    config: Optional[Mapping[str, Any]] = None
+) -> Dict[str, str]:
+    """
+    Render every file of a project without touching the filesystem.
+    
+    Holds the whole project in memory; use iter_project_files to stream.
+    
+    Args:
+        project_name: Name of the project
+        config: Configuration options including user information
         
-        # Create directory structure
-        dirs = [
-            'src',
-            f'src/{project_name}',
-            'tests',
-            'docs',
-            'scripts',
-            'examples'
-        ]
+    Returns:
+        Dictionary of relative file path to content mappings
+    """
+    files_to_create: Dict[str, str] = {}
+    for _, files, _ in render_units(project_name, config, _skipped_units(config)):
+        files_to_create.update(files)
+    return files_to_create
+
+def _reusable_units(
+    previous_lock: Dict[str, Any],
+    project_name: str,
+    config: Optional[Mapping[str, Any]],
+    project_path: Path
+) -> Set[str]:
+    """
+    Find the render units whose output cannot have changed since the last run.
+    
+    A unit is reusable when the templates and project name are the same as
+    in the previous generation, none of the config keys it read changed
+    value, and all of its files are still present.
+    
+    Args:
+        previous_lock: Lock document of the previous generation
+        project_name: Name of the project
+        config: Current configuration
+        project_path: Project directory
         
-        for dir_path in dirs:
-            create_directory(base_path / dir_path)
+    Returns:
+        Names of reusable units
+    """
+    from .dependencies import dependencies_changed
+    from ..templates import get_template_version
+    
+    if (
+        previous_lock.get('template_version') != get_template_version()
+        or previous_lock.get('project_name') != project_name
+    ):
+        return set()
+    
+    known_units = {unit_name for unit_name, _ in RENDER_UNITS}
+    reusable = set()
+    for unit_name, record in previous_lock.get('units', {}).items():
+        if unit_name not in known_units or dependencies_changed(config, record['deps']):
+            continue
+        if all((project_path / relpath).exists() for relpath in record['files']):
+            reusable.add(unit_name)
+    return reusable
+
+def _pin_render_date(config: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Resolve the render date of a configuration into render_config.date.
+    
+    The templates, the dependency fingerprints and the recorded inputs
+    then all see the same value, whether the date was given, came from
+    SOURCE_DATE_EPOCH or is today's; an upgrade, which renders with the
+    recorded date, fingerprints it the same way as the generation did.
+    
+    Args:
+        config: Configuration options including user information
         
-        # Create project files
-        files_to_create = {
-            'pyproject.toml': get_pyproject_template(project_name, config),
-            'setup.cfg': get_setup_cfg_template(project_name, config),
-            'README.md': get_readme_template(project_name, config),
-            '.gitignore': get_gitignore_template(),
-            'CHANGELOG.md': get_changelog_template(),
-            'meta.yaml': get_conda_meta_template(project_name, config),
-            'LICENSE': get_license_template(config),
-        }
+    Returns:
+        Shallow copy of the configuration with an explicit date
+    """
+    from ..templates.dates import get_render_date
+    
+    config = dict(config or {})
+    render_config = dict(config.get('render_config') or {})
+    render_config['date'] = get_render_date(config).isoformat()
+    config['render_config'] = render_config
+    return config
+
+def _render_inputs(
+    config: Optional[Mapping[str, Any]],
+    units: Dict[str, Any],
+    skipped: Set[str]
+) -> Dict[str, Any]:
+    """
+    Record what the templates of a render read, for the lock file.
+    
+    With these values the same files can be rendered again, e.g. by
+    upgrade, without the manifest or CLI flags of the original run. The
+    config should have its render date pinned (see _pin_render_date), so
+    it does not move to the day of the rerun.
+    
+    Args:
+        config: Configuration the units were rendered with
+        units: Lock records of the render units, with their 'deps'
+        skipped: Names of the units that were not rendered
         
-        # Update pyproject.toml
-        if 'pyproject.toml' in files_to_create:
-            content = files_to_create['pyproject.toml']
-            if '[tool.pytest.ini_options]' not in content:
-                content += '''
-[tool.pytest.ini_options]
-addopts = "--cov={} --cov-report=term-missing"
-testpaths = ["tests"]
-'''.format(project_name)
-            
-            if '[project.optional-dependencies]' not in content:
-                content += '\n[project.optional-dependencies]\ndev = ["pytest", "pytest-cov"]\n'
-            elif 'pytest-cov' not in content:
-                content = content.replace(
-                    '[project.optional-dependencies]\ndev = ["pytest"',
-                    '[project.optional-dependencies]\ndev = ["pytest", "pytest-cov"'
-                )
-            
-            files_to_create['pyproject.toml'] = content
+    Returns:
+        Mapping of dotted config path to plain value
+    """
+    from .dependencies import record_inputs
+    
+    inputs = record_inputs(config or {}, {key for unit in units.values() for key in unit['deps']})
+    if skipped:
+        inputs['render_config.skip_units'] = sorted(skipped)
+    return inputs
+
+def materialize_project(
+    project_name: str,
+    files: Union[Mapping[str, str], Iterable[FileEntry]],
+    sink: 'OutputSink'
+) -> None:
+    """
+    Send a rendered project to an output sink.
+    
+    Args:
+        project_name: Name of the project
+        files: File stream from iter_project_files, or rendered files from
+            render_project
+        sink: Destination of the project files
+    """
+    if isinstance(files, Mapping):
+        files = ((relpath, 0o644, content) for relpath, content in files.items())
+    
+    with profiling.span('directories'):
+        for dir_path in get_project_directories(project_name):
+            sink.add_directory(dir_path)
+    
+    with profiling.span('write'):
+        sink.add_files(files)
+
+def write_project(
+    project_name: str,
+    project_path: Path,
+    config: Optional[Mapping[str, Any]] = None
+) -> Tuple[Dict[str, Any], Optional[List[str]]]:
+    """
+    Render a project and write its directories, changed files and lock file.
+    
+    This is the on-disk part of create_project_structure, everything but
+    git initialization. Each render unit is written as soon as it is
+    rendered and then dropped, so no more than one unit is held in memory.
+    
+    Args:
+        project_name: Name of the project
+        project_path: Project directory
+        config: Configuration options including user information
         
-        # Create core module files
-        core_files = get_core_templates(project_name)
-        for filename, content in core_files.items():
-            files_to_create[f'src/{project_name}/{filename}'] = content
+    Returns:
+        Tuple of (write statistics, paths of the files to commit); the
+        paths, including the lock file, are only returned when a new git
+        repository should be initialized, None otherwise
+    """
+    from .sinks import IncrementalDiskSink
+    from .lockfile import LOCK_FILENAME
+    from .dedup import make_dedup_writer
+    from .dependencies import fingerprint_all
+    from ..templates import get_template_version
+    
+    init_git = bool(config and config.get('git_config', {}).get('init_git', True))
+    init_git = init_git and not (project_path / '.git').exists()
+    config = _pin_render_date(config)
+    
+    # Write all directories and changed files
+    io_config = (config or {}).get('io_config', {})
+    writer = make_dedup_writer(project_path, io_config)
+    with IncrementalDiskSink(
+        project_path, io_config.get('write_threads'), writer
+    ) as disk_sink:
+        with profiling.span('directories'):
+            for dir_path in get_project_directories(project_name):
+                disk_sink.add_directory(dir_path)
         
-        # Create test files
-        test_files = get_test_templates(project_name)
-        for filename, content in test_files.items():
-            files_to_create[f'tests/{filename}'] = content
+        # A new repository commits every file, so render them all then
+        skipped = _skipped_units(config)
+        with profiling.span('plan'):
+            reused = set() if init_git else _reusable_units(
+                disk_sink.previous_lock, project_name, config, project_path
+            ) - skipped
+        units: Dict[str, Any] = {}
+        for unit_name in reused:
+            units[unit_name] = disk_sink.previous_lock['units'][unit_name]
+            for relpath in units[unit_name]['files']:
+                disk_sink.keep(relpath)
         
-        # Create documentation files
-        doc_files = get_doc_templates(project_name)
-        for filename, content in doc_files.items():
-            files_to_create[f'docs/{filename}'] = content
+        for unit_name, files, accessed in render_units(project_name, config, reused | skipped):
+            with profiling.span('write', unit_name):
+                for relpath, content in files.items():
+                    disk_sink.add_file(relpath, content)
+            units[unit_name] = {
+                'deps': fingerprint_all(config, accessed),
+                'files': sorted(files),
+            }
         
-        # Write all files
-        for filepath, content in files_to_create.items():
-            write_file(base_path / filepath, content)
+        disk_sink.lock.update({
+            'project_name': project_name,
+            'template_version': get_template_version(),
+            'units': units,
+            'inputs': _render_inputs(config, units, skipped),
+        })
+    stats = disk_sink.stats()
+    stats['rendered'] = len(units) - len(reused)
+    
+    logger.info(
+        f"Rendered {stats['rendered']} of {len(units)} templates, "
+        f"wrote {stats['written']} files, skipped {stats['skipped']} unchanged, "
+        f"{len(stats['conflicts'])} conflicts"
+    )
+    
+    if not init_git:
+        return stats, None
+    committed_files = [relpath for unit in units.values() for relpath in unit['files']]
+    committed_files.append(LOCK_FILENAME)
+    return stats, committed_files
+
+def create_project_structure(
+    project_name: str,
+    base_path: Optional[str] = None,
+    config: Optional[Mapping[str, Any]] = None,
+    sink: Optional['OutputSink'] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Create the complete project structure.
+    
+    Re-running on an existing project only rewrites files whose rendered
+    bytes changed; see IncrementalDiskSink.
+    
+    Args:
+        project_name: Name of the project
+        base_path: Base path for project creation
+        config: Configuration options including user information
+        sink: Destination of the project files (default: a directory named
+            after the project under base_path). Git initialization only
+            happens for the default on-disk destination.
         
-        # Initialize git repository if configured
-        if config and config.get('git_config', {}).get('init_git', True):
-            initialize_git(base_path, config)
+    Returns:
+        For on-disk generation, a dictionary with the number of 'written'
+        and 'skipped' files and the list of 'conflicts'; None otherwise
         
-        # # Set up virtual environment if configured
-        # if config and config.get('venv_config', {}).get('create_venv', True):
-        #     python_version = config.get('python_version', {}).get('min_version')
-        #     setup_virtual_environment(base_path, python_version)
+    Raises:
+        FileOperationError: If project creation fails
+    """
+    try:
+        with profiling.span('create_project_structure', project_name):
+            if sink is not None:
+                logger.info(f"Streaming project structure for {project_name}")
+                materialize_project(project_name, iter_project_files(project_name, config), sink)
+                logger.info(f"Successfully rendered project structure for {project_name}")
+                return None
+            
+            # Set up base path
+            if base_path is None:
+                base_path = os.getcwd()
+            base_path = Path(base_path) / project_name
+            
+            logger.info(f"Creating project structure at: {base_path}")
+            
+            stats, committed_files = write_project(project_name, base_path, config)
+            
+            # Initialize git repository if configured and not already a repository
+            if committed_files is not None:
+                initialize_git(base_path, config, committed_files)
             
-        #     # Install dev dependencies
-        #     venv_python = base_path / 'venv' / 'bin' / 'python'
-        #     subprocess.run([str(venv_python), '-m', 'pip', 'install', '-e', '.[dev]'], cwd=base_path, check=True)
-        #     logger.info("Installed dev dependencies")
+            # Set up virtual environment if configured
+            if config and config.get('venv_config', {}).get('create_venv'):
+                from .venv_seed import provision_venv
+                
+                provision_venv(base_path, config)
             
-        logger.info(f"Successfully created project structure for {project_name}")
+            logger.info(f"Successfully created project structure for {project_name}")
+            return stats
         
     except Exception as e:
-        print(e)
         logger.error(f"Failed to create project structure: {e}")
         # Clean up if project creation fails
         # if base_path.exists():
@@ -0,0 +1,408 @@
+"""In-process creation of a git repository holding one initial commit.
+
+Writes the same on-disk layout ``git init && git add . && git commit``
+produces: loose zlib-compressed objects, a branch ref, HEAD, a repository
+config carrying the user identity, reflogs and a version 2 index whose
+stat data matches the working tree, so ``git status`` is clean and
+``git fsck --strict`` is happy without spawning a single git process.
+"""
+
+import hashlib
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from ..templates.dates import get_source_date_epoch
+from . import profiling
+from .file_ops import FileOperationError
+
+# Git object modes
+MODE_FILE = 0o100644
+MODE_EXECUTABLE = 0o100755
+MODE_TREE = 0o40000
+
+ZERO_SHA = '0' * 40
+
+Entry = Tuple[str, int, Union[str, bytes]]
+
+def hash_object(obj_type: str, data: bytes) -> Tuple[str, bytes]:
+    """
+    Compute the id of a git object.
+
+    Args:
+        obj_type: 'blob', 'tree' or 'commit'
+        data: Object payload
+
+    Returns:
+        Tuple of (hex object id, serialized object including its header)
+    """
+    raw = f"{obj_type} {len(data)}\0".encode() + data
+    return hashlib.sha1(raw).hexdigest(), raw
+
+def _git_mode(mode: int) -> int:
+    """Map a filesystem mode to the git file mode stored in trees."""
+    return MODE_EXECUTABLE if mode & 0o111 else MODE_FILE
+
+def _quote_config_value(value: str) -> str:
+    """Quote a value for a git config file."""
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+def _timezone_offset(timestamp: int) -> str:
+    """Format the local UTC offset at a point in time as git does (+HHMM)."""
+    offset = time.localtime(timestamp).tm_gmtoff // 60
+    sign = '+' if offset >= 0 else '-'
+    offset = abs(offset)
+    return f"{sign}{offset // 60:02d}{offset % 60:02d}"
+
+class NativeRepository:
+    """
+    Minimal writer for a freshly initialized, non-bare git repository.
+
+    Args:
+        work_tree: Project directory; the repository goes into work_tree/.git
+        initial_branch: Name of the branch HEAD points to
+    """
+
+    def __init__(self, work_tree: Union[str, Path], initial_branch: str = 'main'):
+        self.work_tree = Path(work_tree)
+        self.git_dir = self.work_tree / '.git'
+        self.initial_branch = initial_branch
+        self._written = set()
+
+    def init(self, user_name: Optional[str] = None, user_email: Optional[str] = None) -> None:
+        """
+        Create the repository skeleton, like ``git init`` plus ``git config user.*``.
+
+        Args:
+            user_name: Value for user.name in the repository config
+            user_email: Value for user.email in the repository config
+        """
+        for subdir in ('objects/info', 'objects/pack', 'refs/heads', 'refs/tags',
+                       'hooks', 'info'):
+            (self.git_dir / subdir).mkdir(parents=True, exist_ok=True)
+
+        config = (
+            "[core]\n"
+            "\trepositoryformatversion = 0\n"
+            "\tfilemode = true\n"
+            "\tbare = false\n"
+            "\tlogallrefupdates = true\n"
+        )
+        if user_name or user_email:
+            config += "[user]\n"
+            if user_name:
+                config += f"\tname = {_quote_config_value(user_name)}\n"
+            if user_email:
+                config += f"\temail = {_quote_config_value(user_email)}\n"
+
+        self._write(self.git_dir / 'config', config.encode())
+        self._write(self.git_dir / 'HEAD', f"ref: refs/heads/{self.initial_branch}\n".encode())
+        self._write(
+            self.git_dir / 'description',
+            b"Unnamed repository; edit this file 'description' to name the repository.\n"
+        )
+        self._write(
+            self.git_dir / 'info' / 'exclude',
+            b"# git ls-files --others --exclude-from=.git/info/exclude\n"
+        )
+
+    @staticmethod
+    def _write(path: Union[str, Path], data: bytes) -> None:
+        with open(path, 'wb') as f:
+            f.write(data)
+        profiling.add_bytes(len(data))
+
+    def write_object(self, obj_type: str, data: bytes) -> str:
+        """
+        Store a loose object unless it already exists.
+
+        Args:
+            obj_type: 'blob', 'tree' or 'commit'
+            data: Object payload
+
+        Returns:
+            Hex object id
+        """
+        sha, raw = hash_object(obj_type, data)
+        if sha in self._written:
+            return sha
+
+        # Plain strings: pathlib interns every path component, and object
+        # names are unique, so Path objects here would grow memory forever
+        obj_dir = os.path.join(self.git_dir, 'objects', sha[:2])
+        obj_path = os.path.join(obj_dir, sha[2:])
+        if not os.path.exists(obj_path):
+            os.makedirs(obj_dir, exist_ok=True)
+            tmp_path = os.path.join(obj_dir, f"tmp_obj_{os.getpid()}_{sha[2:8]}")
+            self._write(tmp_path, zlib.compress(raw, 1))
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, obj_path)
+
+        self._written.add(sha)
+        return sha
+
+    def write_tree(self, files: Dict[str, Tuple[int, str]]) -> str:
+        """
+        Store the tree objects for a set of files.
+
+        Args:
+            files: Mapping of '/'-separated path to (git mode, blob id)
+
+        Returns:
+            Hex id of the root tree
+        """
+        children: Dict[str, Dict[str, Tuple[int, str]]] = {}
+        entries = []
+        for path, (mode, sha) in files.items():
+            name, sep, rest = path.partition('/')
+            if sep:
+                children.setdefault(name, {})[rest] = (mode, sha)
+            else:
+                entries.append((name, mode, sha))
+
+        for name, subtree in children.items():
+            entries.append((name, MODE_TREE, self.write_tree(subtree)))
+
+        # Git orders entries by name, comparing directories as 'name/'
+        entries.sort(key=lambda e: e[0].encode() + (b'/' if e[1] == MODE_TREE else b''))
+        data = b''.join(
+            f"{mode:o} {name}\0".encode() + bytes.fromhex(sha)
+            for name, mode, sha in entries
+        )
+        return self.write_object('tree', data)
+
+    def commit(
+        self,
+        entries: Iterable[Entry],
+        message: str,
+        author_name: str,
+        author_email: str,
+        timestamp: Optional[int] = None
+    ) -> str:
+        """
+        Commit files that already exist in the work tree.
+
+        Writes one blob per file, the trees, the commit, the branch ref,
+        reflogs and an index matching the work tree.
+
+        Args:
+            entries: Iterable of (relative path, file mode, content)
+            message: Commit message
+            author_name: Author and committer name
+            author_email: Author and committer email
+            timestamp: Commit time in seconds since the epoch (default:
+                SOURCE_DATE_EPOCH, then now)
+
+        Returns:
+            Hex id of the commit
+        """
+        files: Dict[str, Tuple[int, str]] = {}
+        for relpath, mode, content in entries:
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            files[relpath] = (_git_mode(mode), self.write_object('blob', content))
+
+        tree = self.write_tree(files)
+
+        if timestamp is None:
+            timestamp = get_source_date_epoch() or int(time.time())
+        ident = f"{author_name} <{author_email}> {timestamp} {_timezone_offset(timestamp)}"
+        commit_data = (
+            f"tree {tree}\n"
+            f"author {ident}\n"
+            f"committer {ident}\n"
+            f"\n"
+            f"{message}\n"
+        ).encode('utf-8')
+        commit = self.write_object('commit', commit_data)
+
+        ref = f"refs/heads/{self.initial_branch}"
+        ref_path = self.git_dir / ref
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(ref_path, f"{commit}\n".encode())
+
+        reflog = f"{ZERO_SHA} {commit} {ident}\tcommit (initial): {message}\n".encode('utf-8')
+        for log in ('HEAD', ref):
+            log_path = self.git_dir / 'logs' / log
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._write(log_path, reflog)
+
+        self.write_index(files)
+        return commit
+
+    def write_index(self, files: Dict[str, Tuple[int, str]]) -> None:
+        """
+        Write a version 2 index using the work tree's current stat data.
+
+        Args:
+            files: Mapping of '/'-separated path to (git mode, blob id)
+        """
+        body = [b'DIRC', struct.pack('>II', 2, len(files))]
+        for relpath in sorted(files, key=lambda p: p.encode()):
+            mode, sha = files[relpath]
+            st = os.stat(self.work_tree / relpath)
+            name = relpath.encode('utf-8')
+            entry = struct.pack(
+                '>10I20sH',
+                int(st.st_ctime) & 0xFFFFFFFF, st.st_ctime_ns % 1000000000,
+                int(st.st_mtime) & 0xFFFFFFFF, st.st_mtime_ns % 1000000000,
+                st.st_dev & 0xFFFFFFFF, st.st_ino & 0xFFFFFFFF,
+                mode, st.st_uid, st.st_gid, st.st_size & 0xFFFFFFFF,
+                bytes.fromhex(sha), min(len(name), 0xFFF),
+            )
+            entry += name
+            # Entries are NUL-terminated and padded to a multiple of 8 bytes
+            entry += b'\0' * (8 - len(entry) % 8)
+            body.append(entry)
+
+        data = b''.join(body)
+        self._write(self.git_dir / 'index', data + hashlib.sha1(data).digest())
+
+def create_repository(
+    project_path: Union[str, Path],
+    entries: Iterable[Entry],
+    author_name: str,
+    author_email: str,
+    initial_branch: str = 'main',
+    message: str = 'Initial commit',
+    timestamp: Optional[int] = None
+) -> str:
+    """
+    Initialize a repository and commit the given files in-process.
+
+    Args:
+        project_path: Project directory whose files are already written
+        entries: Iterable of (relative path, file mode, content)
+        author_name: Commit author and repository user.name
+        author_email: Commit author and repository user.email
+        initial_branch: Branch to create and check out
+        message: Commit message
+        timestamp: Commit time in seconds since the epoch (default: now)
+
+    Returns:
+        Hex id of the initial commit
+
+    Raises:
+        FileOperationError: If the repository cannot be written
+    """
+    try:
+        repo = NativeRepository(project_path, initial_branch)
+        repo.init(author_name, author_email)
+        return repo.commit(entries, message, author_name, author_email, timestamp)
+    except OSError as e:
+        raise FileOperationError(f"Failed to write git repository: {e}")
+
+def read_blobs(project_path: Union[str, Path], blob_ids: Iterable[str]) -> Dict[str, bytes]:
+    """
+    Read blobs from a project's git repository.
+
+    Loose objects are read in-process; anything else (packed objects) is
+    looked up with a single ``git cat-file --batch``, if git is available.
+
+    Args:
+        project_path: Work tree of the repository
+        blob_ids: Hex ids of the wanted blobs
+
+    Returns:
+        Mapping of blob id to content for the blobs that were found
+    """
+    git_dir = os.path.join(project_path, '.git')
+    found: Dict[str, bytes] = {}
+    missing = []
+    for sha in set(blob_ids):
+        try:
+            with open(os.path.join(git_dir, 'objects', sha[:2], sha[2:]), 'rb') as f:
+                raw = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            missing.append(sha)
+            continue
+        header, _, data = raw.partition(b'\0')
+        if header.startswith(b'blob '):
+            found[sha] = data
+
+    if missing and os.path.isdir(git_dir):
+        import subprocess
+
+        try:
+            output = subprocess.run(
+                ['git', 'cat-file', '--batch'], cwd=project_path, check=True,
+                input=''.join(f'{sha}\n' for sha in missing).encode(),
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return found
+        profiling.add_subprocess()
+        # Each answer is "<id> <type> <size>\n<content>\n" or "<id> missing\n"
+        position = 0
+        while position < len(output):
+            end = output.index(b'\n', position)
+            fields = output[position:end].split()
+            position = end + 1
+            if len(fields) == 3:
+                size = int(fields[2])
+                if fields[1] == b'blob':
+                    found[fields[0].decode()] = output[position:position + size]
+                position += size + 1
+    return found
+
+def store_snapshot(
+    project_path: Union[str, Path],
+    entries: Iterable[Entry],
+    ref: str,
+    message: str,
+    author_name: str,
+    author_email: str
+) -> str:
+    """
+    Commit files to a ref of an existing repository without checking them out.
+
+    The work tree, index and HEAD are left alone; the commit only keeps
+    the blobs reachable, so git gc does not prune them. The previous
+    commit of the ref, if any, becomes the parent.
+
+    Args:
+        project_path: Work tree of the repository
+        entries: Iterable of (relative path, file mode, content)
+        ref: Full ref name, e.g. 'refs/py-lib-starter/base'
+        message: Commit message
+        author_name: Author and committer name
+        author_email: Author and committer email
+
+    Returns:
+        Hex id of the commit
+
+    Raises:
+        FileOperationError: If the objects or the ref cannot be written
+    """
+    try:
+        repo = NativeRepository(project_path)
+        files: Dict[str, Tuple[int, str]] = {}
+        for relpath, mode, content in entries:
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            files[relpath] = (_git_mode(mode), repo.write_object('blob', content))
+        tree = repo.write_tree(files)
+
+        ref_path = repo.git_dir / ref
+        try:
+            parent = ref_path.read_text().strip()
+        except FileNotFoundError:
+            parent = None
+
+        timestamp = get_source_date_epoch() or int(time.time())
+        ident = f"{author_name} <{author_email}> {timestamp} {_timezone_offset(timestamp)}"
+        commit = repo.write_object('commit', (
+            f"tree {tree}\n"
+            + (f"parent {parent}\n" if parent else "")
+            + f"author {ident}\ncommitter {ident}\n\n{message}\n"
+        ).encode('utf-8'))
+
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        repo._write(ref_path, f"{commit}\n".encode())
+        return commit
+    except OSError as e:
+        raise FileOperationError(f"Failed to write git snapshot: {e}")
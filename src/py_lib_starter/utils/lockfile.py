@@ -0,0 +1,134 @@
+"""Content-hash lock file recording what was generated into a project."""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+LOCK_FILENAME = '.py_lib_starter.lock'
+LOCK_VERSION = 1
+
+# Outcomes of comparing a freshly rendered file with the project on disk
+WRITE = 'write'
+SKIP = 'skip'
+CONFLICT = 'conflict'
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash file content for the lock file.
+
+    Args:
+        data: File content
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def blob_id(data: bytes) -> str:
+    """
+    Compute the git blob id of file content, as ``git hash-object`` does.
+
+    The lock records it so the content can be found again in the
+    project's git repository, e.g. as the merge base of an upgrade.
+
+    Args:
+        data: File content
+
+    Returns:
+        Hex SHA-1 object id
+    """
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+def file_record(data: bytes) -> Dict[str, str]:
+    """
+    Build the lock entry of a generated file.
+
+    Args:
+        data: Generated content
+
+    Returns:
+        Dictionary with the 'sha256' and git 'blob' id of the content
+    """
+    return {'sha256': content_hash(data), 'blob': blob_id(data)}
+
+def new_lock() -> Dict[str, Any]:
+    """Return an empty lock document."""
+    return {'version': LOCK_VERSION, 'files': {}}
+
+def load_lock(project_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read the lock file of a project.
+
+    A missing or unreadable lock file yields an empty lock, so every file
+    that differs on disk is treated as a conflict rather than overwritten.
+
+    Args:
+        project_path: Project directory
+
+    Returns:
+        Lock document with a 'files' mapping of path to {'sha256': ...,
+        'blob': ...}
+    """
+    path = Path(project_path) / LOCK_FILENAME
+    try:
+        with open(path, encoding='utf-8') as f:
+            lock = json.load(f)
+    except FileNotFoundError:
+        return new_lock()
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable lock file {path}: {e}")
+        return new_lock()
+
+    if not isinstance(lock, dict) or not isinstance(lock.get('files'), dict):
+        logger.warning(f"Ignoring malformed lock file {path}")
+        return new_lock()
+    return lock
+
+def dump_lock(lock: Dict[str, Any]) -> str:
+    """
+    Serialize a lock document deterministically.
+
+    Args:
+        lock: Lock document
+
+    Returns:
+        JSON text with sorted keys and a trailing newline
+    """
+    return json.dumps(lock, indent=2, sort_keys=True) + '\n'
+
+def classify(
+    relpath: str,
+    data: bytes,
+    disk_data: Optional[bytes],
+    lock: Dict[str, Any]
+) -> str:
+    """
+    Decide what to do with a freshly rendered file.
+
+    Args:
+        relpath: File path relative to the project root
+        data: Freshly rendered content
+        disk_data: Current content on disk, or None if the file is missing
+        lock: Lock document from the previous generation
+
+    Returns:
+        WRITE if the file is missing or still exactly as last generated,
+        SKIP if the bytes on disk already match, CONFLICT if the file was
+        modified since it was generated (or was never generated by us)
+    """
+    if disk_data is None:
+        return WRITE
+
+    disk_hash = content_hash(disk_data)
+    if disk_hash == content_hash(data):
+        return SKIP
+
+    recorded = lock['files'].get(relpath, {}).get('sha256')
+    if recorded == disk_hash:
+        return WRITE
+    return CONFLICT
@@ -0,0 +1,108 @@
+"""Line-based three-way merge of text files.
+
+Merges two descendants of a common base the way ``diff3 -m`` does: the
+lines every version agrees on are synchronization points, and between
+them a region changed on one side only takes that side's lines, a region
+changed identically on both sides is taken once, and anything else is a
+conflict, written out between the usual ``<<<<<<<``/``=======``/``>>>>>>>``
+markers.
+"""
+
+from difflib import SequenceMatcher
+from typing import List, Sequence, Tuple
+
+# Synchronization region: (base start, base end, a start, a end, b start, b end)
+SyncRegion = Tuple[int, int, int, int, int, int]
+
+def _sync_regions(base: Sequence[str], a: Sequence[str], b: Sequence[str]) -> List[SyncRegion]:
+    """
+    Find the runs of base lines that both descendants kept unchanged.
+
+    Args:
+        base: Lines of the common ancestor
+        a: Lines of the first descendant
+        b: Lines of the second descendant
+
+    Returns:
+        Regions in order, ending with an empty region at the end of all
+        three sequences
+    """
+    a_matches = SequenceMatcher(None, base, a, autojunk=False).get_matching_blocks()
+    b_matches = SequenceMatcher(None, base, b, autojunk=False).get_matching_blocks()
+
+    regions: List[SyncRegion] = []
+    ia = ib = 0
+    while ia < len(a_matches) and ib < len(b_matches):
+        a_base, a_start, a_length = a_matches[ia]
+        b_base, b_start, b_length = b_matches[ib]
+
+        start = max(a_base, b_base)
+        end = min(a_base + a_length, b_base + b_length)
+        if start < end:
+            length = end - start
+            a_sub = a_start + start - a_base
+            b_sub = b_start + start - b_base
+            regions.append((start, end, a_sub, a_sub + length, b_sub, b_sub + length))
+
+        # Move on from whichever block finishes first in the base
+        if a_base + a_length < b_base + b_length:
+            ia += 1
+        else:
+            ib += 1
+
+    regions.append((len(base), len(base), len(a), len(a), len(b), len(b)))
+    return regions
+
+def _terminated(lines: Sequence[str]) -> List[str]:
+    """Make sure the last line ends with a newline, so a marker can follow it."""
+    lines = list(lines)
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    return lines
+
+def merge3(
+    base: str,
+    ours: str,
+    theirs: str,
+    labels: Tuple[str, str] = ('ours', 'theirs')
+) -> Tuple[str, int]:
+    """
+    Merge two versions of a text that both derive from base.
+
+    Args:
+        base: Common ancestor
+        ours: First descendant, e.g. the file as edited locally
+        theirs: Second descendant, e.g. the file as rendered now
+        labels: Names written after the opening and closing conflict markers
+
+    Returns:
+        Tuple of (merged text, number of conflicts); conflicting regions
+        are written with both sides between markers
+    """
+    base_lines = base.splitlines(keepends=True)
+    a = ours.splitlines(keepends=True)
+    b = theirs.splitlines(keepends=True)
+
+    merged: List[str] = []
+    conflicts = 0
+    iz = ia = ib = 0
+    for z_start, z_end, a_start, a_end, b_start, b_end in _sync_regions(base_lines, a, b):
+        if a_start > ia or b_start > ib:
+            base_chunk = base_lines[iz:z_start]
+            a_chunk = a[ia:a_start]
+            b_chunk = b[ib:b_start]
+            if a_chunk == b_chunk or b_chunk == base_chunk:
+                merged.extend(a_chunk)
+            elif a_chunk == base_chunk:
+                merged.extend(b_chunk)
+            else:
+                conflicts += 1
+                merged.append(f'<<<<<<< {labels[0]}\n')
+                merged.extend(_terminated(a_chunk))
+                merged.append('=======\n')
+                merged.extend(_terminated(b_chunk))
+                merged.append(f'>>>>>>> {labels[1]}\n')
+        merged.extend(base_lines[z_start:z_end])
+        iz, ia, ib = z_end, a_end, b_end
+
+    return ''.join(merged), conflicts
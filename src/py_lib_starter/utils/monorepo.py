@@ -0,0 +1,211 @@
+"""Generation of many packages into one repository.
+
+Packages are built like batch projects, in parallel, under
+``packages/<name>/``. What a standalone project carries itself is shared
+at the repository root instead: a workspace pyproject.toml holding the
+tool settings, a README listing the packages, one .gitignore and one
+LICENSE. A new repository gets a single initial commit of every package,
+written in-process, rather than a git repository per package.
+"""
+
+import logging
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Sequence, Mapping
+
+from ..config.default import update_config
+from ..config.loader import load_config
+from ..templates.workspace import PACKAGES_DIR
+from . import profiling
+from .batch import _merge, run_batch
+from .file_ops import FileOperationError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Render units of a package whose files the repository root provides
+SHARED_UNITS = ('gitignore', 'license')
+
+def package_overrides(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get the config overrides of a package inside a monorepo.
+
+    Args:
+        overrides: Config overrides applied to every package (e.g. CLI flags)
+
+    Returns:
+        The overrides, without per-package git repositories or shared files
+    """
+    return _merge(overrides or {}, {
+        'git_config': {'init_git': False},
+        'render_config': {'skip_units': list(SHARED_UNITS)},
+    })
+
+def list_packages(root: Path) -> List[str]:
+    """
+    List the packages of a monorepo.
+
+    Args:
+        root: Repository directory
+
+    Returns:
+        Sorted names of the directories under packages/ holding a
+        pyproject.toml
+    """
+    packages_dir = root / PACKAGES_DIR
+    if not packages_dir.is_dir():
+        return []
+    with os.scandir(packages_dir) as scan:
+        return sorted(
+            entry.name for entry in scan
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'pyproject.toml'))
+        )
+
+def _package_files(root: Path, name: str) -> List[str]:
+    """Get the generated files of a package from its lock, relative to the root."""
+    from .lockfile import LOCK_FILENAME, load_lock
+
+    package_dir = f'{PACKAGES_DIR}/{name}'
+    relpaths = sorted(load_lock(root / package_dir)['files'])
+    return [f'{package_dir}/{relpath}' for relpath in relpaths + [LOCK_FILENAME]]
+
+def write_root_files(root: Path, package_names: List[str], config: Mapping[str, Any]) -> List[str]:
+    """
+    Write the shared files at the root of a monorepo.
+
+    Args:
+        root: Repository directory
+        package_names: Every package of the repository
+        config: Configuration of the root files (author, license year...)
+
+    Returns:
+        Paths of the written files, including the root lock file
+    """
+    from .. import templates
+    from .lockfile import LOCK_FILENAME
+    from .sinks import IncrementalDiskSink
+
+    files = {
+        'pyproject.toml': templates.get_workspace_pyproject_template(package_names, config),
+        'README.md': templates.get_workspace_readme_template(root.name, package_names),
+        '.gitignore': templates.get_gitignore_template(),
+        'LICENSE': templates.get_license_template(config),
+    }
+    with profiling.span('write', 'workspace'):
+        with IncrementalDiskSink(root) as sink:
+            for relpath, content in files.items():
+                sink.add_file(relpath, content)
+    return sorted(files) + [LOCK_FILENAME]
+
+def build_monorepo(
+    root: str,
+    entries: List[Dict[str, Any]],
+    jobs: Optional[int] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+    config_files: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """
+    Build the packages of a manifest into one repository.
+
+    The 'path' of manifest entries is ignored: every package goes under
+    packages/. Re-running regenerates packages and root files like any
+    project and adds new packages to the workspace; git is only
+    initialized, with one commit of everything, for a new repository.
+
+    Args:
+        root: Repository directory
+        entries: Package specifications from load_manifest
+        jobs: Number of worker processes (default: CPU count)
+        overrides: Config overrides applied to every package (e.g. CLI flags)
+        config_files: Configuration files under every package's own config
+
+    Returns:
+        Dictionary with the repository 'path', the per-package 'results'
+        of run_batch and the initial 'commit' (None if none was made)
+
+    Raises:
+        FileOperationError: If the root files or the repository cannot be
+            written
+    """
+    root_path = Path(root).absolute()
+    new_repository = not (root_path / '.git').exists()
+    packages = [dict(entry, path=None) for entry in entries]
+
+    results = run_batch(
+        packages, str(root_path / PACKAGES_DIR), jobs, package_overrides(overrides), config_files
+    )
+
+    # The root takes its metadata from the first package
+    base = load_config(config_files) if config_files else None
+    config = update_config(entries[0].get('config') or {}, base)
+    if overrides:
+        config = update_config(overrides, config)
+
+    try:
+        root_files = write_root_files(root_path, list_packages(root_path), config)
+    except Exception as e:
+        raise FileOperationError(f"Failed to write the workspace files: {e}")
+
+    commit = None
+    git_config = config.get('git_config', {})
+    if new_repository and git_config.get('init_git', True):
+        built = [result['name'] for result in results if result['success']]
+        commit = initialize_monorepo_git(root_path, config, root_files, built)
+
+    return {'path': str(root_path), 'results': results, 'commit': commit}
+
+def initialize_monorepo_git(
+    root: Path,
+    config: Mapping[str, Any],
+    root_files: List[str],
+    package_names: List[str]
+) -> str:
+    """
+    Create the repository of a monorepo with one commit of every package.
+
+    Args:
+        root: Repository directory
+        config: Configuration of the root files
+        root_files: Shared files from write_root_files
+        package_names: Packages to commit
+
+    Returns:
+        Hex id of the commit
+
+    Raises:
+        FileOperationError: If the repository cannot be written
+    """
+    from .file_ops import _resolve_git_identity, read_back_files, setup_git_hooks
+    from .git_native import create_repository
+
+    git_config = config.get('git_config', {})
+    relpaths = list(root_files)
+    for name in package_names:
+        relpaths.extend(_package_files(root, name))
+
+    with profiling.span('git', str(root)):
+        author_name, author_email = _resolve_git_identity(config)
+        commit = create_repository(
+            root,
+            read_back_files(root, relpaths),
+            author_name,
+            author_email,
+            git_config.get('initial_branch') or 'main',
+        )
+
+        # The pre-commit hook type-checks the staged sources of every
+        # package; dmypy only takes whole directories, so plain mypy it is
+        git_hooks = dict(git_config.get('git_hooks', {}))
+        pre_commit = git_hooks.get('pre-commit')
+        if isinstance(pre_commit, Mapping):
+            git_hooks['pre-commit'] = dict(
+                pre_commit,
+                mypy_target=f'{PACKAGES_DIR}/*/src',
+                type_checker='mypy' if pre_commit.get('type_checker') else None,
+            )
+        if git_hooks:
+            setup_git_hooks(root, git_hooks)
+
+    logger.info(f"Committed {len(package_names)} packages to {root} as {commit[:12]}")
+    return commit
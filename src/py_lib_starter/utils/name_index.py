@@ -0,0 +1,248 @@
+"""Local index of taken package names.
+
+New project names should not clash with packages on a package index. A
+name index is a compact file of the PEP 503 normalized names of a PyPI
+snapshot, an internal index or both, checked locally without any network
+access. The file is memory-mapped and binary-searched, so opening it is
+instant and a lookup takes a few microseconds even for hundreds of
+thousands of names; only the pages a lookup touches are ever read.
+
+File layout (integers are little-endian uint32)::
+
+    magic       b'PLSNIDX1'
+    count       number of names
+    offsets     count + 1 offsets of the names, relative to the data
+    data        sorted UTF-8 names, each followed by b'\\n'
+"""
+
+import array
+import bisect
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .validation import normalize_name
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PLSNIDX1'
+
+_UINT32 = struct.Struct('<I')
+_HEADER_SIZE = len(MAGIC) + _UINT32.size
+
+# Names per block: a lookup bisects an in-memory sample of the first name
+# of every block, then reads and scans the one block that may hold the name
+BLOCK_SIZE = 32
+
+# Project links in a PEP 503 simple index page
+_SIMPLE_LINK = re.compile(r'<a\b[^>]*>([^<]+)</a>', re.IGNORECASE)
+
+class NameIndexError(Exception):
+    """Raised when a name index cannot be built or read."""
+    pass
+
+class NameIndex:
+    """
+    Read-only, memory-mapped name index.
+
+    Args:
+        path: Index file written by build_name_index
+
+    Raises:
+        NameIndexError: If the file is not a name index
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        try:
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise NameIndexError(f"Failed to open name index {self.path}: {e}")
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise NameIndexError(f"{self.path} is not a name index")
+        self._count = _UINT32.unpack_from(self._map, len(MAGIC))[0]
+        self._data = _HEADER_SIZE + (self._count + 1) * _UINT32.size
+        self._view = memoryview(self._map)
+        offsets = self._view[_HEADER_SIZE:self._data]
+        if sys.byteorder == 'little':
+            self._offsets = offsets.cast('I')
+        else:
+            self._offsets = array.array('I', offsets)
+            self._offsets.byteswap()
+        self._sample: Optional[List[bytes]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _name(self, position: int) -> bytes:
+        return self._map[self._data + self._offsets[position]:
+                         self._data + self._offsets[position + 1] - 1]
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        if self._sample is None:
+            # Every BLOCK_SIZE-th name, kept in memory to find the block
+            self._sample = [self._name(position) for position in range(0, self._count, BLOCK_SIZE)]
+        key = normalize_name(name).encode('utf-8')
+        block = bisect.bisect_right(self._sample, key) - 1
+        if block < 0:
+            return False
+        first = block * BLOCK_SIZE
+        last = min(first + BLOCK_SIZE, self._count)
+        names = self._map[self._data + self._offsets[first]:self._data + self._offsets[last] - 1]
+        return key in names.split(b'\n')
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._count):
+            yield self._name(position).decode('utf-8')
+
+    def close(self) -> None:
+        """Unmap the file."""
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._view.release()
+        self._map.close()
+
+    def __repr__(self) -> str:
+        return f"NameIndex({self.path!r}, {self._count} names)"
+
+@lru_cache(maxsize=None)
+def load_name_index(path: str) -> NameIndex:
+    """
+    Open a name index once per process.
+
+    Args:
+        path: Index file
+
+    Returns:
+        The shared NameIndex
+    """
+    return NameIndex(path)
+
+def build_name_index(names: Iterable[str], output: Union[str, Path]) -> int:
+    """
+    Write a name index.
+
+    Args:
+        names: Package names, normalized and de-duplicated here
+        output: Index file, replaced atomically
+
+    Returns:
+        Number of names in the index
+
+    Raises:
+        NameIndexError: If the index cannot be written
+    """
+    keys = sorted({normalize_name(name).encode('utf-8') for name in names if name})
+    offsets: List[int] = [0]
+    for key in keys:
+        offsets.append(offsets[-1] + len(key) + 1)
+
+    output = Path(output)
+    try:
+        fd, tmp_name = tempfile.mkstemp(prefix=f'.{output.name}.', dir=output.parent)
+    except OSError as e:
+        raise NameIndexError(f"Failed to write name index {output}: {e}")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_UINT32.pack(len(keys)))
+            f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+            f.write(b''.join(key + b'\n' for key in keys))
+        os.replace(tmp_name, output)
+    except OSError as e:
+        os.unlink(tmp_name)
+        raise NameIndexError(f"Failed to write name index {output}: {e}")
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return len(keys)
+
+def read_names(path: Union[str, Path]) -> List[str]:
+    """
+    Read package names from a source file.
+
+    Understands PEP 691 simple index JSON (``{"projects": [{"name": ...}]}``)
+    or a JSON list of names, PEP 503 simple index HTML, and plain text with
+    one name per line ('#' starts a comment).
+
+    Args:
+        path: Source file
+
+    Returns:
+        Names as found in the source
+
+    Raises:
+        NameIndexError: If the source cannot be read
+    """
+    path = Path(path)
+    try:
+        text = path.read_text(encoding='utf-8')
+        if path.suffix == '.json':
+            document = json.loads(text)
+            if isinstance(document, dict):
+                return [project['name'] for project in document.get('projects', [])]
+            return [str(name) for name in document]
+        if path.suffix in ('.html', '.htm'):
+            return [match.strip() for match in _SIMPLE_LINK.findall(text)]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise NameIndexError(f"Failed to read names from {path}: {e}")
+    return [
+        line.split('#', 1)[0].strip() for line in text.splitlines()
+        if line.split('#', 1)[0].strip()
+    ]
+
+def parse_index_args(argv: Optional[list] = None):
+    """Parse the command line of ``create-pylib index``."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='create-pylib index',
+        description='Build or query a local index of taken package names'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser(
+        'build',
+        help='Build an index from simple index pages (HTML/JSON) or name lists'
+    )
+    build_parser.add_argument('output', help='Index file to write')
+    build_parser.add_argument('sources', nargs='+', help='Files listing package names')
+
+    check_parser = commands.add_parser('check', help='Check whether names are taken')
+    check_parser.add_argument('--index', required=True, help='Index file')
+    check_parser.add_argument('names', nargs='+', help='Names to check')
+    return parser.parse_args(argv)
+
+def main(argv: Optional[list] = None) -> None:
+    """Run ``create-pylib index``."""
+    args = parse_index_args(argv)
+    try:
+        if args.command == 'build':
+            names: List[str] = []
+            for source in args.sources:
+                names.extend(read_names(source))
+            count = build_name_index(names, args.output)
+            print(f"Indexed {count} names from {len(args.sources)} source(s) in {args.output}")
+            return
+
+        index = load_name_index(args.index)
+        taken = [name for name in args.names if name in index]
+        for name in args.names:
+            print(f"{name}: {'taken' if name in taken else 'free'}")
+    except NameIndexError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if taken:
+        sys.exit(1)
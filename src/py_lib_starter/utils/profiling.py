@@ -0,0 +1,236 @@
+"""Lightweight timing spans for the stages of project generation.
+
+Instrumented code wraps each stage in ``with span('render', unit): ...``
+and reports bytes written and subprocesses spawned through add_bytes and
+add_subprocess, and any other measurement through add_metric.
+
+Spans are only timed while at least one listener is registered;
+otherwise span() hands out a shared no-op object, so disabled profiling
+costs one truthiness check per call.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Callbacks receiving every finished span
+_listeners: List[Callable[['Span'], None]] = []
+
+# Per-thread stack of open spans, innermost last
+_local = threading.local()
+
+class Span:
+    """
+    A timed stage of project generation.
+
+    Attributes:
+        name: Stage name, e.g. 'render' or 'git'
+        detail: What the stage worked on, e.g. a unit or file name
+        start: time.perf_counter() at entry
+        duration: Seconds spent in the stage
+        bytes_written: Bytes written directly within the stage
+        subprocesses: Subprocesses spawned directly within the stage
+        depth: Nesting level, 0 for outermost spans
+        metrics: Other measurements by name, e.g. 'install_seconds_saved'
+    """
+
+    __slots__ = ('name', 'detail', 'start', 'duration', 'bytes_written',
+                 'subprocesses', 'depth', 'metrics')
+
+    def __init__(self, name: str, detail: Optional[str] = None):
+        self.name = name
+        self.detail = detail
+        self.start = 0.0
+        self.duration = 0.0
+        self.bytes_written = 0
+        self.subprocesses = 0
+        self.depth = 0
+        self.metrics: Dict[str, float] = {}
+
+    def __enter__(self) -> 'Span':
+        stack = _stack()
+        self.depth = len(stack)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.duration = time.perf_counter() - self.start
+        _stack().pop()
+        for listener in list(_listeners):
+            listener(self)
+
+    def to_dict(self, origin: float = 0.0) -> Dict[str, Any]:
+        """Convert to a JSON-friendly dictionary with start relative to origin."""
+        return {
+            'name': self.name,
+            'detail': self.detail,
+            'start': self.start - origin,
+            'duration': self.duration,
+            'bytes_written': self.bytes_written,
+            'subprocesses': self.subprocesses,
+            'depth': self.depth,
+            'metrics': dict(self.metrics),
+        }
+
+class _NullSpan:
+    """Stand-in returned by span() while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+def _stack() -> List[Span]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def enabled() -> bool:
+    """Check whether any listener is registered."""
+    return bool(_listeners)
+
+def span(name: str, detail: Optional[str] = None):
+    """
+    Time a stage of project generation.
+
+    Args:
+        name: Stage name
+        detail: What the stage works on (optional)
+
+    Returns:
+        Context manager timing the stage, a no-op when profiling is disabled
+    """
+    if not _listeners:
+        return _NULL_SPAN
+    return Span(name, detail)
+
+def add_bytes(count: int) -> None:
+    """Attribute written bytes to the innermost open span of this thread."""
+    if _listeners:
+        stack = _stack()
+        if stack:
+            stack[-1].bytes_written += count
+
+def add_subprocess() -> None:
+    """Attribute a spawned subprocess to the innermost open span of this thread."""
+    if _listeners:
+        stack = _stack()
+        if stack:
+            stack[-1].subprocesses += 1
+
+def add_metric(name: str, value: float) -> None:
+    """Add a measurement to the innermost open span of this thread."""
+    if _listeners:
+        stack = _stack()
+        if stack:
+            metrics = stack[-1].metrics
+            metrics[name] = metrics.get(name, 0) + value
+
+def replay(spans: List[Dict[str, Any]], origin: float) -> None:
+    """
+    Deliver spans recorded in another process to this process's listeners.
+
+    Args:
+        spans: Span dictionaries from that process's Profiler.report()
+        origin: time.perf_counter() value in this process matching the
+            other Profiler's start
+    """
+    if not _listeners:
+        return
+    for entry in spans:
+        finished = Span(entry['name'], entry['detail'])
+        finished.start = origin + entry['start']
+        finished.duration = entry['duration']
+        finished.bytes_written = entry['bytes_written']
+        finished.subprocesses = entry['subprocesses']
+        finished.depth = entry['depth']
+        finished.metrics = dict(entry.get('metrics', {}))
+        for listener in list(_listeners):
+            listener(finished)
+
+def add_listener(callback: Callable[[Span], None]) -> None:
+    """
+    Register a callback receiving every finished span.
+
+    Args:
+        callback: Called with the Span, in the thread that ran the stage
+    """
+    _listeners.append(callback)
+
+def remove_listener(callback: Callable[[Span], None]) -> None:
+    """Unregister a callback added with add_listener."""
+    _listeners.remove(callback)
+
+class Profiler:
+    """
+    Collect spans while active and summarize them.
+
+    Use as a context manager around the code to profile::
+
+        with Profiler() as profiler:
+            create_project_structure('my_lib')
+        report = profiler.report()
+
+    Span start times in the report are relative to the profiler's start.
+    """
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+        self._origin = 0.0
+        self._lock = threading.Lock()
+
+    def _collect(self, finished: Span) -> None:
+        entry = finished.to_dict(self._origin)
+        with self._lock:
+            self.spans.append(entry)
+
+    def __enter__(self) -> 'Profiler':
+        self._origin = time.perf_counter()
+        add_listener(self._collect)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        remove_listener(self._collect)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the profile report.
+
+        Returns:
+            Dictionary with the 'spans' in start order and per-stage
+            'totals' of count, duration, bytes_written, subprocesses and
+            the sums of any metrics
+        """
+        spans = sorted(self.spans, key=lambda entry: entry['start'])
+        totals: Dict[str, Dict[str, Any]] = {}
+        for entry in spans:
+            total = totals.setdefault(entry['name'], {
+                'count': 0, 'duration': 0.0, 'bytes_written': 0, 'subprocesses': 0,
+            })
+            total['count'] += 1
+            total['duration'] += entry['duration']
+            total['bytes_written'] += entry['bytes_written']
+            total['subprocesses'] += entry['subprocesses']
+            for name, value in entry['metrics'].items():
+                total[name] = total.get(name, 0) + value
+        return {'spans': spans, 'totals': totals}
+
+    def write(self, path: str) -> None:
+        """
+        Write the report to a JSON file.
+
+        Args:
+            path: Output file
+        """
+        import json
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+            f.write('\n')
@@ -0,0 +1,129 @@
+"""Persistent content-addressed cache of rendered projects."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Any, List, Mapping
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Top-level config sections that do not affect rendered content
+NON_RENDERING_SECTIONS = ('io_config', 'venv_config')
+
+def get_cache_dir() -> Path:
+    """
+    Get the root directory of the py_lib_starter cache.
+
+    PY_LIB_STARTER_CACHE_DIR wins, then $XDG_CACHE_HOME/py_lib_starter,
+    then ~/.cache/py_lib_starter.
+
+    Returns:
+        Cache directory (not necessarily existing yet)
+    """
+    explicit = os.environ.get('PY_LIB_STARTER_CACHE_DIR')
+    if explicit:
+        return Path(explicit)
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'py_lib_starter'
+
+def cache_enabled(config: Optional[Mapping[str, Any]]) -> bool:
+    """Check whether the render cache is switched on in a configuration."""
+    return bool((config or {}).get('render_config', {}).get('cache'))
+
+def _plain(value: Any) -> Any:
+    """Convert nested mappings and sequences into JSON-friendly values."""
+    if hasattr(value, 'items'):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+def render_key(
+    project_name: str,
+    config: Optional[Mapping[str, Any]],
+    template_version: str
+) -> str:
+    """
+    Compute the cache key of a rendered project.
+
+    The key covers the project name, the normalized configuration, the
+    template version and the resolved render date, so a date that falls
+    back to "today" naturally expires cached renders the next day.
+
+    Args:
+        project_name: Name of the project
+        config: Configuration used for rendering
+        template_version: Version of the template sources
+
+    Returns:
+        Hex SHA-256 key
+    """
+    from ..templates.dates import get_render_date
+
+    normalized = {
+        key: value for key, value in _plain(config or {}).items()
+        if key not in NON_RENDERING_SECTIONS
+    }
+    normalized.pop('render_config', None)
+    document = {
+        'project_name': project_name,
+        'config': normalized,
+        'template_version': template_version,
+        'date': get_render_date(config).isoformat(),
+    }
+    data = json.dumps(document, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def _entry_path(key: str) -> Path:
+    return get_cache_dir() / 'renders' / key[:2] / f'{key}.json'
+
+def load_render(key: str) -> Optional[List[List[Any]]]:
+    """
+    Load a cached render.
+
+    Args:
+        key: Cache key from render_key
+
+    Returns:
+        List of [unit name, files, config keys read] entries, or None on a miss
+    """
+    try:
+        with open(_entry_path(key), encoding='utf-8') as f:
+            entry = json.load(f)
+        return entry['units']
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring corrupt render cache entry {key}: {e}")
+        return None
+
+def store_render(key: str, units: List[List[Any]]) -> None:
+    """
+    Store a render in the cache.
+
+    The entry is written to a temporary file and renamed into place, so
+    concurrent generations never observe a partial entry. Failures are
+    logged and otherwise ignored: the cache is an optimization only.
+
+    Args:
+        key: Cache key from render_key
+        units: List of [unit name, files, config keys read] entries
+    """
+    path = _entry_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'units': units}, f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        logger.debug(f"Stored render cache entry {key}")
+    except OSError as e:
+        logger.warning(f"Failed to store render cache entry {key}: {e}")
@@ -0,0 +1,481 @@
+"""Warm generation server for ``create-pylib serve``.
+
+Keeps templates, defaults and imports loaded and answers generation
+requests over localhost HTTP or a Unix domain socket:
+
+- ``GET /health`` returns the server status and template version
+- ``POST /generate`` takes a JSON object (sent as ``application/json``)
+  with the project ``name``, an optional ``path`` relative to the
+  server's base path, an optional ``config`` overlay limited to the
+  REQUEST_CONFIG_SECTIONS and an optional ``archive`` format. Without
+  ``archive`` the project is written to disk and the response is JSON
+  with its ``path`` and write ``stats``; with ``archive`` ('tar.gz' or
+  'zip') nothing touches the disk and the archive is streamed back.
+
+Configuration files given with ``--config`` are layered under every
+request's ``config``. They are checked on each request and picked up as
+soon as they change, without a restart.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from ..config.default import get_default_config, update_config
+from ..config.loader import ConfigFileError, load_config
+from .file_ops import FileOperationError, create_project_structure
+from .sinks import ARCHIVE_FORMATS, TarSink, ZipSink
+from .validation import ValidationError, validate_project_name
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Largest accepted request body
+MAX_REQUEST_BYTES = 1 << 20
+
+# Config sections a request may override: what goes into the rendered
+# files. Anything that runs programs, writes outside the project or sets
+# up git (venv_config, io_config, git_config, render_config...) stays
+# under the control of whoever started the server.
+REQUEST_CONFIG_SECTIONS = frozenset({
+    'metadata',
+    'python_version',
+    'dev_dependencies',
+    'optional_features',
+    'template_config',
+    'code_style',
+    'test_config',
+    'doc_config',
+    'build_config',
+    'project_urls',
+})
+
+ARCHIVE_CONTENT_TYPES = {
+    'tar.gz': 'application/gzip',
+    'zip': 'application/zip',
+}
+
+class RequestError(Exception):
+    """Raised for malformed generation requests (HTTP 400)."""
+    pass
+
+def warm_up() -> str:
+    """
+    Import and compile everything a generation needs.
+
+    Returns:
+        Template version
+    """
+    from .. import templates
+
+    for name in templates.__all__:
+        getattr(templates, name)
+    get_default_config()
+    return templates.get_template_version()
+
+class _ChunkedWriter:
+    """Binary file object sending writes as HTTP/1.1 chunks."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self.wfile.write(b'%x\r\n' % len(data) + bytes(data) + b'\r\n')
+        return len(data)
+
+    def flush(self) -> None:
+        self.wfile.flush()
+
+    def close(self) -> None:
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+class GenerationService:
+    """
+    Turns generation requests into projects or archives.
+
+    Args:
+        base_path: Directory requested paths are resolved against; projects
+            are never written outside of it
+        overrides: Configuration applied below each request's own config
+        config_files: Configuration files applied below the overrides,
+            reloaded whenever they change (see config.loader)
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        overrides: Optional[Dict[str, Any]] = None,
+        config_files: Sequence[str] = ()
+    ):
+        self.base_path = Path(base_path).resolve()
+        self.overrides = overrides or {}
+        self.config_files = list(config_files)
+        self._loaded = load_config(self.config_files) if self.config_files else None
+        self.config = update_config(self.overrides, self._loaded)
+        self.template_version = warm_up()
+        # Project path -> [lock, requests holding or waiting for it]
+        self._locks: Dict[Path, List[Any]] = {}
+        self._locks_guard = threading.Lock()
+
+    def parse_request(self, body: bytes) -> Dict[str, Any]:
+        """
+        Validate a generation request.
+
+        Args:
+            body: Raw JSON request body
+
+        Returns:
+            The request with 'name', 'path', 'config' and 'archive' keys
+
+        Raises:
+            RequestError: If the request is malformed
+        """
+        try:
+            request = json.loads(body.decode('utf-8'))
+        except ValueError as e:
+            raise RequestError(f"Invalid JSON: {e}")
+        if not isinstance(request, dict):
+            raise RequestError("Request must be a JSON object")
+
+        name = request.get('name')
+        if not isinstance(name, str):
+            raise RequestError("Request is missing 'name'")
+        try:
+            validate_project_name(name)
+        except ValidationError as e:
+            raise RequestError(str(e))
+
+        config = request.get('config') or {}
+        if not isinstance(config, dict):
+            raise RequestError("'config' must be a JSON object")
+        forbidden = sorted(set(config) - REQUEST_CONFIG_SECTIONS)
+        if forbidden:
+            raise RequestError(
+                f"'config' may not set {', '.join(forbidden)}; allowed sections: "
+                f"{', '.join(sorted(REQUEST_CONFIG_SECTIONS))}"
+            )
+
+        archive = request.get('archive')
+        if archive is not None and archive not in ARCHIVE_FORMATS:
+            raise RequestError(f"'archive' must be one of {', '.join(ARCHIVE_FORMATS)}")
+
+        return {
+            'name': name,
+            'path': self._resolve(request.get('path')),
+            'config': config,
+            'archive': archive,
+        }
+
+    def _resolve(self, path: Optional[str]) -> Path:
+        if path is not None and not isinstance(path, str):
+            raise RequestError("'path' must be a string")
+        resolved = (self.base_path / (path or '')).resolve()
+        if resolved != self.base_path and self.base_path not in resolved.parents:
+            raise RequestError("'path' must stay inside the server's base path")
+        return resolved
+
+    def base_config(self) -> Mapping[str, Any]:
+        """
+        Get the configuration requests are applied to.
+
+        Returns:
+            The overrides over the configuration files, derived again only
+            when a file changed
+
+        Raises:
+            ConfigFileError: If a configuration file became unreadable
+        """
+        if self.config_files:
+            loaded = load_config(self.config_files)
+            if loaded is not self._loaded:
+                logger.info("Configuration files changed, reloaded them")
+                # Racing threads derive equal configurations
+                self.config = update_config(self.overrides, loaded)
+                self._loaded = loaded
+        return self.config
+
+    @contextlib.contextmanager
+    def _locked(self, project_path: Path) -> Iterator[None]:
+        """Serialize requests for one project; the lock goes once nobody needs it."""
+        with self._locks_guard:
+            entry = self._locks.setdefault(project_path, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[project_path]
+
+    def generate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write a project to disk.
+
+        Concurrent requests for the same project are serialized.
+
+        Args:
+            request: Request from parse_request without 'archive'
+
+        Returns:
+            Dictionary with the project 'path' and the write 'stats'
+        """
+        project_path = request['path'] / request['name']
+        config = update_config(request['config'], self.base_config())
+        with self._locked(project_path):
+            stats = create_project_structure(request['name'], str(request['path']), config)
+        return {'path': str(project_path), 'stats': stats}
+
+    def stream_archive(self, request: Dict[str, Any], fileobj) -> None:
+        """
+        Render a project straight into an archive.
+
+        Args:
+            request: Request from parse_request with 'archive' set
+            fileobj: Binary file object receiving the archive
+        """
+        config = update_config(request['config'], self.base_config())
+        sink_class = TarSink if request['archive'] == 'tar.gz' else ZipSink
+        with sink_class(fileobj, request['name']) as sink:
+            create_project_structure(request['name'], None, config, sink)
+
+class GenerationHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a GenerationService (set on the server)."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'py_lib_starter'
+
+    @property
+    def service(self) -> GenerationService:
+        return self.server.service
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status: int, document: Dict[str, Any]) -> None:
+        body = json.dumps(document).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path != '/health':
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+        self._send_json(200, {
+            'status': 'ok',
+            'template_version': self.service.template_version,
+        })
+
+    def do_POST(self) -> None:
+        if self.path != '/generate':
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+
+        # Browsers cannot send application/json across origins without a
+        # preflight, so this keeps web pages from posting requests
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            self._send_json(415, {'error': "Content-Type must be application/json"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length > MAX_REQUEST_BYTES:
+                raise RequestError("Request body too large")
+            request = self.service.parse_request(self.rfile.read(length))
+        except (RequestError, ValueError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        # Report broken configuration files before any response goes out
+        try:
+            self.service.base_config()
+        except ConfigFileError as e:
+            self._send_json(500, {'error': str(e)})
+            return
+
+        if request['archive'] is None:
+            try:
+                self._send_json(200, self.service.generate(request))
+            except FileOperationError as e:
+                self._send_json(500, {'error': str(e)})
+            return
+
+        # Headers go out before rendering starts, so errors past this point
+        # can only abort the response
+        self.send_response(200)
+        self.send_header('Content-Type', ARCHIVE_CONTENT_TYPES[request['archive']])
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        writer = _ChunkedWriter(self.wfile)
+        try:
+            self.service.stream_archive(request, writer)
+        except Exception as e:
+            logger.error(f"Failed to stream {request['name']}: {e}")
+            self.close_connection = True
+            return
+        writer.close()
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+class UnixHTTPConnection(HTTPConnection):
+    """http.client connection to a server on a Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+def make_server(
+    service: GenerationService,
+    host: str = '127.0.0.1',
+    port: int = 8765,
+    socket_path: Optional[str] = None
+) -> socketserver.BaseServer:
+    """
+    Create the HTTP server for a service.
+
+    Args:
+        service: Generation service answering requests
+        host: Interface for TCP; keep it local, requests are not authenticated
+        port: TCP port (0 picks a free one)
+        socket_path: Listen on this Unix domain socket instead of TCP
+
+    Returns:
+        Bound server, ready for serve_forever()
+
+    Raises:
+        FileOperationError: If socket_path exists and is not a socket
+    """
+    if socket_path:
+        # A stale socket from a previous run would make bind() fail
+        try:
+            st = os.lstat(socket_path)
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(st.st_mode):
+                raise FileOperationError(f"Not replacing {socket_path}: it is not a socket")
+            os.unlink(socket_path)
+        # Bind under a umask leaving the socket to its owner (0o600), so
+        # nobody else can connect before it could be chmodded
+        umask = os.umask(0o177)
+        try:
+            server = ThreadingUnixHTTPServer(socket_path, GenerationHandler)
+        finally:
+            os.umask(umask)
+    else:
+        server = ThreadingHTTPServer((host, port), GenerationHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
+
+def server_address(server: socketserver.BaseServer) -> str:
+    """Describe where a server listens, for log and console messages."""
+    if isinstance(server.server_address, str):
+        return f"unix:{server.server_address}"
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+def parse_serve_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """Parse the command line of ``create-pylib serve``."""
+    parser = argparse.ArgumentParser(
+        prog='create-pylib serve',
+        description='Serve project generation requests from a warm process'
+    )
+    parser.add_argument(
+        '--host',
+        help='Interface to listen on (default: %(default)s)',
+        default='127.0.0.1'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='TCP port to listen on (default: %(default)s)',
+        default=8765
+    )
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        help='Listen on a Unix domain socket instead of TCP',
+        default=None
+    )
+    parser.add_argument(
+        '--path',
+        help='Base path that request paths are relative to (default: current '
+             'directory)',
+        default=None
+    )
+    parser.add_argument(
+        '--config',
+        metavar='FILE',
+        action='append',
+        help='TOML configuration file under every request\'s config; repeat '
+             'it to add overlays, later files win. Changes apply to the next '
+             'request',
+        default=None
+    )
+    return parser.parse_args(argv)
+
+def serve(argv: Optional[list] = None) -> None:
+    """Run ``create-pylib serve`` until interrupted."""
+    args = parse_serve_args(argv)
+    try:
+        service = GenerationService(args.path or os.getcwd(), config_files=args.config or ())
+    except ConfigFileError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        server = make_server(service, args.host, args.port, args.socket)
+    except (FileOperationError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Serving project generation on {server_address(server)} "
+          f"(base path {service.base_path})")
+    # Shut down cleanly on SIGTERM too, removing the socket file
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
@@ -0,0 +1,453 @@
+"""Output sinks that materialize a rendered project."""
+
+import gzip
+import io
+import logging
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Optional, Dict, Iterable, List, Set, Tuple, Union, BinaryIO
+
+from . import lockfile, profiling
+from ..templates.dates import get_source_date_epoch
+from .bulk_write import BulkFileWriter
+from .file_ops import FileOperationError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Archive formats understood by open_archive_sink
+ARCHIVE_FORMATS = ('tar.gz', 'zip')
+
+# Zip timestamps cannot predate 1980-01-01
+ZIP_MIN_EPOCH = 315532800
+
+Content = Union[str, bytes]
+
+def _to_bytes(content: Content) -> bytes:
+    """Encode text content as UTF-8, leaving bytes untouched."""
+    if isinstance(content, str):
+        return content.encode('utf-8')
+    return content
+
+class OutputSink:
+    """
+    Destination for the files of a rendered project.
+
+    Paths passed to a sink are relative to the project root and always use
+    forward slashes. Sinks are context managers; leaving the block closes
+    the sink and flushes any buffered output, or aborts it if the block
+    raised.
+    """
+
+    def add_directory(self, relpath: str, mode: int = 0o755) -> None:
+        """
+        Add an (possibly empty) directory.
+
+        Args:
+            relpath: Directory path relative to the project root
+            mode: Directory permissions
+        """
+        pass
+
+    def add_file(self, relpath: str, content: Content, mode: int = 0o644) -> None:
+        """
+        Add a file.
+
+        Args:
+            relpath: File path relative to the project root
+            content: File content, text is encoded as UTF-8
+            mode: File permissions
+        """
+        raise NotImplementedError
+
+    def add_files(self, entries: Iterable[Tuple[str, int, Content]]) -> None:
+        """
+        Add a stream of files, one at a time.
+
+        Args:
+            entries: Iterable of (relative path, file mode, content), such
+                as file_ops.iter_project_files; each entry is released
+                before the next one is pulled
+        """
+        for relpath, mode, content in entries:
+            self.add_file(relpath, content, mode)
+
+    def close(self) -> None:
+        """Flush and release any resources held by the sink."""
+        pass
+
+    def abort(self) -> None:
+        """Release the sink after a failure, discarding incomplete output where possible."""
+        self.close()
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class DiskSink(OutputSink):
+    """
+    Sink writing the project into a directory on the local filesystem.
+
+    Writes go through a BulkFileWriter; pass max_workers to overlap file
+    writes on high-latency (e.g. network) filesystems, or a ready-made
+    writer such as a DedupFileWriter.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_workers: Optional[int] = None,
+        writer: Optional[BulkFileWriter] = None
+    ):
+        self.root = Path(root)
+        self.writer = writer or BulkFileWriter(self.root, max_workers=max_workers)
+
+    def add_directory(self, relpath: str, mode: int = 0o755) -> None:
+        self.writer.make_dirs(relpath, mode)
+
+    def add_file(self, relpath: str, content: Content, mode: int = 0o644) -> None:
+        self.writer.write(relpath, content, mode)
+
+    def close(self) -> None:
+        with profiling.span('flush'):
+            self.writer.close()
+
+class IncrementalDiskSink(DiskSink):
+    """
+    Disk sink that only touches files whose bytes actually changed.
+
+    Each generation records the SHA-256 of every written file in a lock
+    file at the project root. On regeneration a file is skipped when its
+    bytes are unchanged, rewritten when it is still exactly as last
+    generated, and reported as a conflict (and left alone) when it was
+    edited since. Counts are available as written, skipped and conflicts.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_workers: Optional[int] = None,
+        writer: Optional[BulkFileWriter] = None
+    ):
+        root = Path(root)
+        # Nothing to compare against in a directory we are about to create
+        self.fresh = not root.exists()
+        super().__init__(root, max_workers, writer)
+        self.previous_lock = lockfile.new_lock() if self.fresh else lockfile.load_lock(root)
+        self.lock = lockfile.new_lock()
+        self.written = 0
+        self.skipped = 0
+        self.conflicts: List[str] = []
+
+    def _read_existing(self, relpath: str) -> Optional[bytes]:
+        if self.fresh:
+            return None
+        try:
+            with open(self.root / relpath, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise FileOperationError(f"Failed to read file {self.root / relpath}: {e}")
+
+    def add_file(self, relpath: str, content: Content, mode: int = 0o644) -> None:
+        data = _to_bytes(content)
+        existing = self._read_existing(relpath)
+        action = lockfile.classify(relpath, data, existing, self.previous_lock)
+
+        if action == lockfile.CONFLICT:
+            logger.warning(f"Not overwriting locally modified file: {relpath}")
+            self.conflicts.append(relpath)
+            previous = self.previous_lock['files'].get(relpath)
+            if previous is not None:
+                self.lock['files'][relpath] = previous
+            return
+
+        if action == lockfile.WRITE:
+            # Replace rather than truncate: the file may be a shared hardlink
+            self.writer.write(relpath, data, mode, replace=existing is not None)
+            self.written += 1
+        else:
+            self.skipped += 1
+        self.lock['files'][relpath] = lockfile.file_record(data)
+
+    def keep(self, relpath: str) -> None:
+        """
+        Keep a file from the previous generation without rendering it again.
+
+        Args:
+            relpath: File path relative to the project root
+        """
+        previous = self.previous_lock['files'].get(relpath)
+        if previous is not None:
+            self.lock['files'][relpath] = previous
+        self.skipped += 1
+
+    def lock_content(self) -> str:
+        """Return the serialized lock file for the current generation."""
+        return lockfile.dump_lock(self.lock)
+
+    def stats(self) -> Dict[str, Union[int, List[str]]]:
+        """Return the written/skipped/conflicts counts of this generation."""
+        return {
+            'written': self.written,
+            'skipped': self.skipped,
+            'conflicts': list(self.conflicts),
+        }
+
+    def close(self) -> None:
+        try:
+            with profiling.span('lock'):
+                lock_data = self.lock_content()
+                existing = self._read_existing(lockfile.LOCK_FILENAME)
+                if existing != lock_data.encode('utf-8'):
+                    self.writer.write(
+                        lockfile.LOCK_FILENAME, lock_data, replace=existing is not None
+                    )
+        finally:
+            super().close()
+
+    def abort(self) -> None:
+        # Leave the previous lock in place: a partial one would record the
+        # files not rendered this time as never generated
+        super().close()
+
+class MemorySink(OutputSink):
+    """Sink keeping the project in memory, for tests and embedding."""
+
+    def __init__(self):
+        self.files: Dict[str, bytes] = {}
+        self.modes: Dict[str, int] = {}
+        self.directories: Set[str] = set()
+
+    def add_directory(self, relpath: str, mode: int = 0o755) -> None:
+        self.directories.add(relpath)
+        self.modes[relpath] = mode
+
+    def add_file(self, relpath: str, content: Content, mode: int = 0o644) -> None:
+        self.files[relpath] = _to_bytes(content)
+        self.modes[relpath] = mode
+
+    def text(self, relpath: str) -> str:
+        """Return the content of a file as text."""
+        return self.files[relpath].decode('utf-8')
+
+class _ArchiveSink(OutputSink):
+    """
+    Base of the sinks writing an archive to a file object.
+
+    With final_path set, fileobj is a temporary file that is renamed to
+    final_path once the archive is complete, and deleted if it is aborted,
+    so a failed generation never leaves a truncated archive behind.
+    Streams cannot be taken back; whoever reads them learns of the
+    failure from the caller.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        prefix: str = '',
+        close_fileobj: bool = False,
+        final_path: Optional[str] = None
+    ):
+        self.prefix = prefix.strip('/')
+        self.fileobj = fileobj
+        self.close_fileobj = close_fileobj
+        self.final_path = final_path
+
+    def _name(self, relpath: str) -> str:
+        return f"{self.prefix}/{relpath}" if self.prefix else relpath
+
+    def _finish(self) -> None:
+        """Write the archive's trailer."""
+        raise NotImplementedError
+
+    def _release(self) -> None:
+        if self.close_fileobj:
+            self.fileobj.close()
+        else:
+            self.fileobj.flush()
+
+    def close(self) -> None:
+        try:
+            self._finish()
+            self._release()
+        except BaseException:
+            self.abort()
+            raise
+        if self.final_path is not None:
+            os.replace(self.fileobj.name, self.final_path)
+
+    def abort(self) -> None:
+        try:
+            # Close the archive objects all the same: zipfile and gzip would
+            # otherwise write their trailers when garbage collected
+            self._finish()
+            self._release()
+        except Exception as e:
+            logger.debug(f"Ignoring error while aborting archive: {e}")
+        if self.final_path is not None:
+            try:
+                os.unlink(self.fileobj.name)
+            except OSError:
+                pass
+
+class TarSink(_ArchiveSink):
+    """
+    Sink streaming a gzip-compressed tarball to a file object.
+
+    The stream is written sequentially, so pipes and sockets work as well
+    as regular files.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        prefix: str = '',
+        close_fileobj: bool = False,
+        final_path: Optional[str] = None
+    ):
+        super().__init__(fileobj, prefix, close_fileobj, final_path)
+        self.mtime = get_source_date_epoch() or int(time.time())
+        # Compress separately so the gzip header carries the same timestamp,
+        # and the final file name rather than the temporary one
+        self.gzip = gzip.GzipFile(
+            filename=final_path, fileobj=fileobj, mode='wb', mtime=self.mtime
+        )
+        self.archive = tarfile.open(fileobj=self.gzip, mode='w|')
+
+    def add_directory(self, relpath: str, mode: int = 0o755) -> None:
+        info = tarfile.TarInfo(self._name(relpath))
+        info.type = tarfile.DIRTYPE
+        info.mode = mode
+        info.mtime = self.mtime
+        self.archive.addfile(info)
+
+    def add_file(self, relpath: str, content: Content, mode: int = 0o644) -> None:
+        data = _to_bytes(content)
+        info = tarfile.TarInfo(self._name(relpath))
+        info.size = len(data)
+        info.mode = mode
+        info.mtime = self.mtime
+        self.archive.addfile(info, io.BytesIO(data))
+        profiling.add_bytes(len(data))
+
+    def _finish(self) -> None:
+        self.archive.close()
+        self.gzip.close()
+
+class ZipSink(_ArchiveSink):
+    """
+    Sink writing a zip archive to a file object.
+
+    Unseekable outputs such as stdout are supported; zipfile then writes
+    data descriptors after each member instead of seeking back.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        prefix: str = '',
+        close_fileobj: bool = False,
+        final_path: Optional[str] = None
+    ):
+        super().__init__(fileobj, prefix, close_fileobj, final_path)
+        epoch = get_source_date_epoch()
+        if epoch is None:
+            self.date_time = time.localtime()[:6]
+        else:
+            self.date_time = time.gmtime(max(epoch, ZIP_MIN_EPOCH))[:6]
+        self.archive = zipfile.ZipFile(fileobj, mode='w', compression=zipfile.ZIP_DEFLATED)
+
+    def add_directory(self, relpath: str, mode: int = 0o755) -> None:
+        info = zipfile.ZipInfo(self._name(relpath).rstrip('/') + '/', self.date_time)
+        info.external_attr = ((0o40000 | mode) << 16) | 0x10
+        self.archive.writestr(info, b'')
+
+    def add_file(self, relpath: str, content: Content, mode: int = 0o644) -> None:
+        info = zipfile.ZipInfo(self._name(relpath), self.date_time)
+        info.external_attr = (0o100000 | mode) << 16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        data = _to_bytes(content)
+        self.archive.writestr(info, data)
+        profiling.add_bytes(len(data))
+
+    def _finish(self) -> None:
+        self.archive.close()
+
+def detect_archive_format(target: str) -> str:
+    """
+    Guess the archive format from a file name.
+
+    Args:
+        target: Output file name
+
+    Returns:
+        One of ARCHIVE_FORMATS
+
+    Raises:
+        FileOperationError: If the format cannot be inferred
+    """
+    if target.endswith(('.tar.gz', '.tgz')):
+        return 'tar.gz'
+    if target.endswith('.zip'):
+        return 'zip'
+    raise FileOperationError(
+        f"Cannot infer archive format from '{target}', use --archive-format"
+    )
+
+def open_archive_sink(
+    target: str,
+    archive_format: Optional[str] = None,
+    prefix: str = '',
+    stdout: Optional[BinaryIO] = None
+) -> OutputSink:
+    """
+    Open a tar.gz or zip sink on a file or on stdout.
+
+    A file is written under a temporary name next to it and only appears
+    under its own name once the sink is closed without error.
+
+    Args:
+        target: Output file path, or '-' for stdout
+        archive_format: One of ARCHIVE_FORMATS (default: inferred from target)
+        prefix: Directory name every archive member is placed under
+        stdout: Binary stream used for '-' (default: sys.stdout.buffer)
+
+    Returns:
+        Sink writing the archive
+
+    Raises:
+        FileOperationError: If the format is unknown or the file cannot be opened
+    """
+    if archive_format is None:
+        archive_format = 'tar.gz' if target == '-' else detect_archive_format(target)
+    if archive_format not in ARCHIVE_FORMATS:
+        raise FileOperationError(f"Unsupported archive format: {archive_format}")
+
+    if target == '-':
+        fileobj = stdout if stdout is not None else sys.stdout.buffer
+        close_fileobj = False
+        final_path = None
+    else:
+        directory, filename = os.path.split(os.path.abspath(target))
+        try:
+            fileobj = open(os.path.join(directory, f".{filename}.{os.getpid()}.tmp"), 'wb')
+        except OSError as e:
+            raise FileOperationError(f"Failed to open archive {target}: {e}")
+        close_fileobj = True
+        final_path = target
+
+    logger.debug(f"Writing {archive_format} archive to {target}")
+
+    sink_class = TarSink if archive_format == 'tar.gz' else ZipSink
+    return sink_class(fileobj, prefix=prefix, close_fileobj=close_fileobj, final_path=final_path)
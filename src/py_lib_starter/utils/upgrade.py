@@ -0,0 +1,523 @@
+"""Upgrade of generated projects to the current templates.
+
+A project is rendered again from the inputs its lock file recorded, with
+the templates of this version, and the result is merged into the files on
+disk. The merge base of each file is the content it was generated with:
+the lock records its git blob id, and the blob is read back from the
+project's repository (the initial commit, or the snapshot a previous
+upgrade stored). For every rendered file:
+
+- added: the file did not exist and is written
+- unchanged: the file already has the new content
+- updated: the file was never edited and is overwritten
+- kept: the file was edited and the templates did not change it
+- merged: local edits and template changes touch different lines and
+  are merged automatically
+- conflict: both sides changed the same lines, or the base is unknown;
+  the file is left alone, or written with conflict markers on request
+
+Files the templates no longer produce are reported as obsolete and left
+alone. Projects are upgraded in parallel across a process pool.
+"""
+
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Sequence
+
+from ..config.default import update_config
+from . import profiling
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Outcomes of upgrading one file
+ADDED = 'added'
+UNCHANGED = 'unchanged'
+UPDATED = 'updated'
+KEPT = 'kept'
+MERGED = 'merged'
+CONFLICT = 'conflict'
+OBSOLETE = 'obsolete'
+
+# Ref holding a commit of the pristine files of the last upgrade, so that
+# git gc never prunes the blobs the lock file refers to; projects nested
+# in a larger repository (monorepo packages) get one below BASE_REFS
+BASE_REF = 'refs/py-lib-starter/base'
+BASE_REFS = 'refs/py-lib-starter/bases'
+
+# Names written after the conflict markers
+CONFLICT_LABELS = ('local', 'template')
+
+class UpgradeError(Exception):
+    """Exception for projects that cannot be upgraded."""
+    pass
+
+def find_work_tree(project_path: Path) -> Optional[Path]:
+    """
+    Find the git work tree a project belongs to.
+
+    Args:
+        project_path: Project directory
+
+    Returns:
+        The project directory or the closest parent holding a .git
+        directory, None if there is none
+    """
+    for directory in (project_path, *project_path.parents):
+        if (directory / '.git').is_dir():
+            return directory
+    return None
+
+def _read_file(path: Path) -> Optional[bytes]:
+    """Read a file, or return None if it does not exist."""
+    from .file_ops import FileOperationError
+
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        raise FileOperationError(f"Failed to read file {path}: {e}")
+
+def _merge_file(base: Optional[bytes], disk: bytes, rendered: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Merge the template changes of one file into its local edits.
+
+    Args:
+        base: Content the file was generated with, None if unknown
+        disk: Content on disk
+        rendered: Content rendered by the current templates
+
+    Returns:
+        Dictionary with the merged 'data' and the number of 'conflicts',
+        or None when no merge is possible (unknown base or binary content)
+    """
+    from .merge import merge3
+
+    if base is None:
+        return None
+    try:
+        texts = [data.decode('utf-8') for data in (base, disk, rendered)]
+    except UnicodeDecodeError:
+        return None
+    merged, conflicts = merge3(*texts, labels=CONFLICT_LABELS)
+    return {'data': merged.encode('utf-8'), 'conflicts': conflicts}
+
+def _upgrade(
+    project_path: Path,
+    overrides: Optional[Dict[str, Any]],
+    dry_run: bool,
+    write_conflicts: bool
+) -> Dict[str, Any]:
+    """Upgrade one project; see upgrade_project."""
+    from .bulk_write import BulkFileWriter
+    from .dependencies import fingerprint_all, inputs_to_config
+    from .file_ops import (
+        _pin_render_date, _render_inputs, _resolve_git_identity, _skipped_units, render_units
+    )
+    from .git_native import read_blobs, store_snapshot
+    from .lockfile import LOCK_FILENAME, content_hash, dump_lock, file_record, load_lock, new_lock
+    from ..templates import get_template_version
+
+    if not project_path.is_dir():
+        raise UpgradeError(f"{project_path} is not a directory")
+    previous = load_lock(project_path)
+    if 'inputs' not in previous or 'units' not in previous:
+        raise UpgradeError(
+            f"{LOCK_FILENAME} does not record how the project was generated; "
+            f"regenerate it once with this version first"
+        )
+    project_name = previous.get('project_name') or project_path.name
+
+    config = update_config(inputs_to_config(previous['inputs']))
+    if overrides:
+        config = update_config(overrides, config)
+    config = _pin_render_date(config)
+    skipped = _skipped_units(config)
+
+    rendered: Dict[str, bytes] = {}
+    units: Dict[str, Any] = {}
+    for unit_name, files, accessed in render_units(project_name, config, skipped):
+        units[unit_name] = {
+            'deps': fingerprint_all(config, accessed),
+            'files': sorted(files),
+        }
+        for relpath, content in files.items():
+            rendered[relpath] = content.encode('utf-8')
+
+    lock = new_lock()
+    outcomes: Dict[str, str] = {}
+    writes: Dict[str, bytes] = {}
+    edited: Dict[str, bytes] = {}
+    with profiling.span('plan', project_name):
+        for relpath, data in rendered.items():
+            disk = _read_file(project_path / relpath)
+            record = previous['files'].get(relpath)
+            lock['files'][relpath] = file_record(data)
+            if disk is None:
+                outcomes[relpath] = ADDED
+                writes[relpath] = data
+            elif disk == data:
+                outcomes[relpath] = UNCHANGED
+            elif record is not None and record.get('sha256') == content_hash(disk):
+                outcomes[relpath] = UPDATED
+                writes[relpath] = data
+            else:
+                edited[relpath] = disk
+
+    work_tree = find_work_tree(project_path)
+    if edited:
+        with profiling.span('merge', project_name):
+            wanted = [previous['files'].get(relpath, {}).get('blob') for relpath in edited]
+            bases = read_blobs(work_tree, filter(None, wanted)) if work_tree else {}
+            for (relpath, disk), blob in zip(edited.items(), wanted):
+                merge = _merge_file(bases.get(blob), disk, rendered[relpath])
+                if merge is not None and not merge['conflicts']:
+                    if merge['data'] == disk:
+                        outcomes[relpath] = KEPT
+                    else:
+                        outcomes[relpath] = MERGED
+                        writes[relpath] = merge['data']
+                    continue
+
+                outcomes[relpath] = CONFLICT
+                if merge is not None and write_conflicts:
+                    # Once resolved, the file derives from the new render
+                    writes[relpath] = merge['data']
+                elif relpath in previous['files']:
+                    # Still derived from the old render, keep it as the base
+                    lock['files'][relpath] = previous['files'][relpath]
+                else:
+                    del lock['files'][relpath]
+                logger.warning(
+                    f"Conflict in {project_path / relpath}: " + (
+                        'both sides changed the same lines' if merge is not None
+                        else 'its original content is unknown'
+                    )
+                )
+
+    for relpath in previous['files']:
+        if relpath not in rendered:
+            outcomes[relpath] = OBSOLETE
+
+    lock.update({
+        'project_name': project_name,
+        'template_version': get_template_version(),
+        'units': units,
+        'inputs': _render_inputs(config, units, skipped),
+    })
+    lock_data = dump_lock(lock)
+    changed = bool(writes) or lock_data != dump_lock(previous)
+
+    if changed and not dry_run:
+        with profiling.span('write', project_name):
+            with BulkFileWriter(project_path) as writer:
+                for relpath, data in writes.items():
+                    writer.write(relpath, data, replace=outcomes[relpath] != ADDED)
+                writer.write(LOCK_FILENAME, lock_data, replace=True)
+
+        if work_tree is not None:
+            prefix = project_path.relative_to(work_tree).as_posix()
+            author_name, author_email = _resolve_git_identity(config)
+            with profiling.span('git', project_name):
+                store_snapshot(
+                    work_tree,
+                    ((relpath, 0o644, data) for relpath, data in rendered.items()),
+                    BASE_REF if prefix == '.' else f'{BASE_REFS}/{prefix}',
+                    f"py_lib_starter templates {get_template_version()}",
+                    author_name,
+                    author_email,
+                )
+
+    return {
+        'name': project_name,
+        'from_version': previous.get('template_version'),
+        'to_version': get_template_version(),
+        'changed': changed,
+        'files': dict(sorted(outcomes.items())),
+        'conflicts': sorted(relpath for relpath, outcome in outcomes.items() if outcome == CONFLICT),
+    }
+
+def upgrade_project(
+    project_path: str,
+    overrides: Optional[Dict[str, Any]] = None,
+    dry_run: bool = False,
+    write_conflicts: bool = False
+) -> Dict[str, Any]:
+    """
+    Upgrade one generated project to the current templates.
+
+    Runs in a worker process, so failures are returned rather than raised.
+
+    Args:
+        project_path: Project directory
+        overrides: Config overrides applied on top of the recorded inputs
+        dry_run: Only report what would change
+        write_conflicts: Write conflicting files with conflict markers
+            instead of leaving them alone
+
+    Returns:
+        Result dictionary with 'name', 'path', 'success', 'error',
+        'duration', the per-file outcomes as 'files' and the paths in
+        'conflicts'
+    """
+    start = time.perf_counter()
+    path = Path(project_path).absolute()
+    result = {
+        'name': path.name,
+        'path': str(path),
+        'success': True,
+        'error': None,
+        'files': {},
+        'conflicts': [],
+    }
+
+    try:
+        result.update(_upgrade(path, overrides, dry_run, write_conflicts))
+    except Exception as e:
+        logger.error(f"Failed to upgrade {path}: {e}")
+        result['success'] = False
+        result['error'] = str(e)
+
+    result['duration'] = time.perf_counter() - start
+    return result
+
+def expand_projects(project_paths: Sequence[str]) -> List[str]:
+    """
+    Replace monorepo roots by the packages they hold.
+
+    Args:
+        project_paths: Project or monorepo directories
+
+    Returns:
+        Project directories
+    """
+    from .lockfile import load_lock
+    from .monorepo import list_packages
+    from ..templates.workspace import PACKAGES_DIR
+
+    expanded = []
+    for project_path in project_paths:
+        path = Path(project_path)
+        packages = list_packages(path)
+        if packages and 'units' not in load_lock(path):
+            expanded.extend(str(path / PACKAGES_DIR / name) for name in packages)
+        else:
+            expanded.append(project_path)
+    return expanded
+
+def upgrade_projects(
+    project_paths: Sequence[str],
+    jobs: Optional[int] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+    dry_run: bool = False,
+    write_conflicts: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Upgrade many projects across a process pool.
+
+    Args:
+        project_paths: Project directories
+        jobs: Number of worker processes (default: CPU count)
+        overrides: Config overrides applied to every project
+        dry_run: Only report what would change
+        write_conflicts: Write conflicting files with conflict markers
+
+    Returns:
+        One result dictionary per project, in input order
+    """
+    if not project_paths:
+        return []
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(project_paths)))
+
+    logger.info(f"Upgrading {len(project_paths)} projects with {jobs} worker(s)")
+
+    # Avoid the pool start-up cost when there is nothing to parallelize
+    if jobs == 1:
+        return [
+            upgrade_project(path, overrides, dry_run, write_conflicts)
+            for path in project_paths
+        ]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(project_paths)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(upgrade_project, path, overrides, dry_run, write_conflicts): index
+            for index, path in enumerate(project_paths)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed or unpicklable result)
+                results[index] = {
+                    'name': Path(project_paths[index]).name,
+                    'path': project_paths[index],
+                    'success': False,
+                    'error': f"Worker failed: {e}",
+                    'files': {},
+                    'conflicts': [],
+                    'duration': 0.0,
+                }
+
+    return results
+
+def format_upgrade_summary(results: List[Dict[str, Any]], dry_run: bool = False) -> str:
+    """
+    Format a per-project summary of upgrade results.
+
+    Args:
+        results: Results from upgrade_projects
+        dry_run: Whether nothing was written
+
+    Returns:
+        Human readable summary
+    """
+    lines = []
+    for result in results:
+        if not result['success']:
+            status = 'FAILED'
+        elif result['conflicts']:
+            status = 'CONFLICT'
+        else:
+            status = 'ok'
+        line = f"  [{status:>8}] {result['name']} ({result['duration']:.2f}s)"
+        if result['error']:
+            line += f": {result['error']}"
+        else:
+            counts: Dict[str, int] = {}
+            for outcome in result['files'].values():
+                counts[outcome] = counts.get(outcome, 0) + 1
+            changes = [
+                f"{counts[outcome]} {outcome}"
+                for outcome in (ADDED, UPDATED, KEPT, MERGED, CONFLICT, OBSOLETE)
+                if counts.get(outcome)
+            ]
+            line += f": {', '.join(changes) if changes else 'up to date'}"
+        lines.append(line)
+        for relpath in result['conflicts']:
+            lines.append(f"      conflict: {relpath}")
+
+    failed = sum(1 for result in results if not result['success'])
+    conflicted = sum(1 for result in results if result['success'] and result['conflicts'])
+    lines.append(
+        f"\n{len(results) - failed - conflicted} upgraded cleanly, {conflicted} with "
+        f"conflicts, {failed} failed, {len(results)} total"
+        + (" (dry run, nothing written)" if dry_run else "")
+    )
+    return "\n".join(lines)
+
+def write_json_report(results: List[Dict[str, Any]], path: str) -> None:
+    """
+    Write upgrade results as JSON.
+
+    Args:
+        results: Results from upgrade_projects
+        path: Output file
+    """
+    import json
+
+    failed = sum(1 for result in results if not result['success'])
+    conflicted = sum(1 for result in results if result['success'] and result['conflicts'])
+    document = {
+        'projects': results,
+        'summary': {
+            'total': len(results),
+            'clean': len(results) - failed - conflicted,
+            'conflicts': conflicted,
+            'failed': failed,
+        },
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+
+def parse_upgrade_args(argv: Optional[list] = None):
+    """Parse the command line of ``create-pylib upgrade``."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='create-pylib upgrade',
+        description='Merge the changes of the current templates into '
+                    'generated projects'
+    )
+    parser.add_argument(
+        'projects',
+        nargs='*',
+        help='Project directories to upgrade; a monorepo stands for all of '
+             'its packages'
+    )
+    parser.add_argument(
+        '--manifest',
+        help='Upgrade the projects listed in a batch manifest'
+    )
+    parser.add_argument(
+        '--path',
+        help='Base path of manifest entries that do not set one (default: '
+             'current directory)',
+        default=None
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Number of worker processes (default: CPU count)',
+        default=None
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Report what would change without writing anything'
+    )
+    parser.add_argument(
+        '--write-conflicts',
+        action='store_true',
+        help='Write conflicting files with conflict markers instead of '
+             'leaving them untouched'
+    )
+    parser.add_argument(
+        '--json',
+        metavar='FILE',
+        help='Write the results to FILE as JSON'
+    )
+    args = parser.parse_args(argv)
+
+    if not args.projects and not args.manifest:
+        parser.error('give project directories or --manifest')
+    return args
+
+def main(argv: Optional[list] = None) -> None:
+    """Run ``create-pylib upgrade``."""
+    from .batch import ManifestError, load_manifest
+
+    args = parse_upgrade_args(argv)
+    project_paths = list(args.projects)
+
+    try:
+        if args.manifest:
+            base_path = args.path or os.getcwd()
+            project_paths += [
+                str(Path(entry.get('path') or base_path) / entry['name'])
+                for entry in load_manifest(args.manifest)
+            ]
+    except ManifestError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    results = upgrade_projects(
+        expand_projects(project_paths), args.jobs,
+        dry_run=args.dry_run, write_conflicts=args.write_conflicts,
+    )
+
+    print(format_upgrade_summary(results, args.dry_run))
+    if args.json:
+        write_json_report(results, args.json)
+    if not all(result['success'] and not result['conflicts'] for result in results):
+        sys.exit(1)
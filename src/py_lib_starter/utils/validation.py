@@ -1,21 +1,42 @@
 """Validation utilities for project creation."""
 
+import keyword
+import os
 import re
-from typing import Pattern
+from typing import Any, Container, Dict, List, Mapping, Optional, Pattern, Sequence
 
 # Regex for valid Python package names
 PACKAGE_NAME_PATTERN: Pattern = re.compile(r'^[a-zA-Z][a-zA-Z0-9_]*$')
 
+# Runs of characters PEP 503 treats as one separator
+_SEPARATORS: Pattern = re.compile(r'[-_.]+')
+
 class ValidationError(Exception):
     """Base exception for validation errors."""
     pass
 
-def validate_project_name(name: str) -> None:
+class PreflightError(ValidationError):
+    """
+    Raised when a batch preflight finds problems.
+    
+    Attributes:
+        errors: Every problem found, one message each
+    """
+    
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} problem(s) found:\n" + "\n".join(f"  {error}" for error in errors)
+        )
+
+def validate_project_name(name: str, name_index: Optional[Container[str]] = None) -> None:
     """
     Validate the project name.
     
     Args:
         name: The project name to validate
+        name_index: Names already taken on a package index, e.g. a
+            name_index.NameIndex; membership is tested by normalized name
         
     Raises:
         ValidationError: If the project name is invalid
@@ -27,7 +48,6 @@ def validate_project_name(name: str) -> None:
         )
     
     # Check reserved words
-    import keyword
     if keyword.iskeyword(name):
         raise ValidationError(f"Project name '{name}' is a Python keyword")
     
@@ -35,4 +55,114 @@ def validate_project_name(name: str) -> None:
     if len(name) < 2:
         raise ValidationError("Project name must be at least 2 characters long")
     if len(name) > 50:
-        raise ValidationError("Project name must not exceed 50 characters")
\ No newline at end of file
+        raise ValidationError("Project name must not exceed 50 characters")
+    
+    # Check the package index
+    if name_index is not None and name in name_index:
+        raise ValidationError(
+            f"Project name '{name}' is already taken on the package index "
+            f"(as '{normalize_name(name)}')"
+        )
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a project name as PEP 503 does for distribution names.
+    
+    Names equal after normalization collide on package indexes and, since
+    case is folded too, on case-insensitive filesystems.
+    
+    Args:
+        name: Project name
+        
+    Returns:
+        Lowercase name with runs of '-', '_' and '.' replaced by '-'
+    """
+    return _SEPARATORS.sub('-', name).lower()
+
+def _check_writable(base: str) -> Optional[str]:
+    """Check that projects can be created under a base path; error message or None."""
+    # A missing base path is created, so its nearest existing ancestor counts
+    directory = base
+    while not os.path.exists(directory):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    if not os.path.isdir(directory):
+        return f"Base path {base}: {directory} is not a directory"
+    if not os.access(directory, os.W_OK | os.X_OK):
+        return f"Base path {base}: {directory} is not writable"
+    return None
+
+def preflight_batch(
+    entries: Sequence[Mapping[str, Any]],
+    base_path: Optional[str] = None,
+    name_index: Optional[Container[str]] = None
+) -> None:
+    """
+    Validate a whole batch before building any of it.
+    
+    Checks every name like validate_project_name (against the package
+    index too if a name index is given), finds entries that would
+    collide with each other or with existing directories after PEP 503
+    normalization, and checks that every base path is writable. Each base
+    path is listed once with os.scandir and checked for writability once,
+    without probe files. An existing directory of exactly the entry's name
+    is not a problem: the project is regenerated.
+    
+    Args:
+        entries: Project specifications with a 'name' and optional 'path'
+        base_path: Base path of entries that do not set one (default:
+            current directory)
+        name_index: Names already taken on a package index (see
+            validate_project_name)
+        
+    Raises:
+        PreflightError: Listing every problem found
+    """
+    errors: List[str] = []
+    default_base = base_path or os.getcwd()
+    
+    # Base path -> normalized name -> names of the entries
+    planned: Dict[str, Dict[str, List[str]]] = {}
+    for entry in entries:
+        name = entry['name']
+        try:
+            validate_project_name(name, name_index)
+        except ValidationError as e:
+            errors.append(f"{name}: {e}")
+            continue
+        base = os.path.abspath(entry.get('path') or default_base)
+        planned.setdefault(base, {}).setdefault(normalize_name(name), []).append(name)
+    
+    for base, names in planned.items():
+        for normalized, clashing in names.items():
+            if len(clashing) > 1:
+                errors.append(
+                    f"{', '.join(clashing)}: collide in {base} "
+                    f"(all normalize to '{normalized}')"
+                )
+        
+        problem = _check_writable(base)
+        if problem:
+            errors.append(problem)
+            continue
+        if not os.path.isdir(base):
+            continue
+        
+        with os.scandir(base) as scan:
+            for existing in scan:
+                clashing = names.get(normalize_name(existing.name))
+                if not clashing:
+                    continue
+                for name in clashing:
+                    if existing.name != name:
+                        errors.append(
+                            f"{name}: collides with existing {existing.path} "
+                            f"(both normalize to '{normalize_name(name)}')"
+                        )
+                    elif not existing.is_dir():
+                        errors.append(f"{name}: {existing.path} exists and is not a directory")
+    
+    if errors:
+        raise PreflightError(errors)
@@ -0,0 +1,321 @@
+"""Virtual environments cloned from cached seed environments.
+
+Installing the development dependencies of a generated project takes tens
+of seconds. They are the same for every project, so they are installed
+once per interpreter and dependency set into a seed environment under
+the cache directory. Each project's environment is a clone of its seed:
+files are hardlinked (or copied across filesystems), and the few files
+that embed the environment's own path - script shebangs, activate
+scripts and pyvenv.cfg - are rewritten. Only the editable install of the
+new package runs per project, offline.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, List, Tuple, Mapping
+
+from . import profiling, wheelhouse
+from .dedup import link_blob
+from .file_ops import FileOperationError, _run_subprocess
+from .render_cache import get_cache_dir
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Records where a seed was built and from what
+SEED_MARKER = 'py_lib_starter_seed.json'
+
+# Extra packages build backends need for editable installs; without build
+# isolation pip does not install them on its own
+EDITABLE_REQUIREMENTS = {
+    'hatchling': ('editables',),
+}
+
+# Files outside the scripts directory that embed the environment's path
+_PATH_FILES = ('pyvenv.cfg',)
+
+def _scripts_dir(venv_path: Path) -> Path:
+    return venv_path / ('Scripts' if os.name == 'nt' else 'bin')
+
+def venv_python(venv_path: Path) -> Path:
+    """Get the interpreter of a virtual environment."""
+    return _scripts_dir(venv_path) / ('python.exe' if os.name == 'nt' else 'python')
+
+def seed_requirements(config: Mapping[str, Any]) -> Tuple[str, ...]:
+    """
+    Get the packages every environment of a project needs.
+
+    These are the build requirements, including what the backend needs for
+    editable installs (which run without build isolation), and the
+    generated pyproject.toml's dev dependencies.
+
+    Args:
+        config: Project configuration
+
+    Returns:
+        Sorted, de-duplicated requirement strings
+    """
+    from ..templates.pyproject import DEV_DEPENDENCIES
+    from .file_ops import REQUIRED_DEV_DEPENDENCIES
+
+    requirements = set()
+    for requirement in config.get('build_config', {}).get('requires', ()):
+        requirements.add(requirement)
+        requirements.update(EDITABLE_REQUIREMENTS.get(requirement, ()))
+    requirements.update(DEV_DEPENDENCIES)
+    requirements.update(REQUIRED_DEV_DEPENDENCIES)
+    return tuple(sorted(requirements))
+
+def seed_key(python: str, requirements: Tuple[str, ...]) -> str:
+    """
+    Identify the seed environment of an interpreter and requirement set.
+
+    The interpreter is identified by its resolved path, size and
+    modification time, so upgrading it in place selects a new seed.
+
+    Args:
+        python: Interpreter executable
+        requirements: Requirement strings
+
+    Returns:
+        Short hex key
+    """
+    resolved = os.path.realpath(shutil.which(python) or python)
+    stat = os.stat(resolved)
+    document = {
+        'python': resolved,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'requirements': list(requirements),
+    }
+    data = json.dumps(document, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+def get_seed_dir() -> Path:
+    """Get the directory holding the seed environments."""
+    return get_cache_dir() / 'venvs'
+
+def ensure_seed(
+    python: str,
+    requirements: Tuple[str, ...],
+    use_wheelhouse: bool = True
+) -> Path:
+    """
+    Get the seed environment for an interpreter and requirement set,
+    building it on first use.
+
+    Building needs pip to reach an index unless the wheelhouse already
+    holds the requirements; afterwards everything works offline. Seeds are
+    built in a temporary directory and renamed into place, so concurrent
+    builders never see a half-built seed.
+
+    Args:
+        python: Interpreter executable
+        requirements: Requirement strings to install
+        use_wheelhouse: Install the requirements through the local
+            wheelhouse (see the wheelhouse module)
+
+    Returns:
+        Seed environment directory
+
+    Raises:
+        FileOperationError: If the seed cannot be built
+    """
+    import subprocess
+
+    seed_path = get_seed_dir() / seed_key(python, requirements)
+    if (seed_path / SEED_MARKER).exists():
+        return seed_path
+
+    with profiling.span('venv_seed', seed_path.name):
+        seed_path.parent.mkdir(parents=True, exist_ok=True)
+        build_path = Path(tempfile.mkdtemp(prefix=f'{seed_path.name}.', dir=seed_path.parent))
+        try:
+            logger.info(f"Building seed environment {seed_path.name} with {python}")
+            _run_subprocess([python, '-m', 'venv', str(build_path)], check=True)
+            if requirements:
+                pip_python = str(venv_python(build_path))
+                index_args = wheelhouse.prepare(pip_python, requirements) if use_wheelhouse else []
+                _run_subprocess(
+                    [pip_python, '-m', 'pip', 'install', '--quiet',
+                     '--disable-pip-version-check', *index_args, *requirements],
+                    check=True,
+                )
+            # Make the seed usable in place, e.g. by verify
+            old, new = str(build_path).encode('utf-8'), str(seed_path).encode('utf-8')
+            for path in _path_files(build_path):
+                _rewrite_path(path, path, old, new)
+            marker = {'path': str(seed_path), 'requirements': list(requirements)}
+            (build_path / SEED_MARKER).write_text(json.dumps(marker, indent=2), encoding='utf-8')
+            try:
+                build_path.rename(seed_path)
+            except OSError:
+                # Another process finished the same seed first
+                if not (seed_path / SEED_MARKER).exists():
+                    raise
+                shutil.rmtree(build_path, ignore_errors=True)
+        except (subprocess.CalledProcessError, OSError) as e:
+            shutil.rmtree(build_path, ignore_errors=True)
+            raise FileOperationError(
+                f"Failed to build the seed environment (the first build needs an "
+                f"index to install from): {e}"
+            )
+    return seed_path
+
+def _rewrite_path(src: Path, dst: Path, old: bytes, new: bytes) -> bool:
+    """Copy a text file replacing the environment path; False if not applicable."""
+    with open(src, 'rb') as f:
+        content = f.read()
+    # Binary launchers cannot be patched by substitution
+    if old not in content or b'\0' in content:
+        return False
+    dst.write_bytes(content.replace(old, new))
+    shutil.copymode(src, dst)
+    return True
+
+def _path_files(venv_path: Path) -> List[Path]:
+    """List the files of an environment that may embed its path."""
+    scripts = [path for path in _scripts_dir(venv_path).iterdir() if not path.is_symlink()]
+    return scripts + [venv_path / name for name in _PATH_FILES]
+
+def clone_venv(seed_path: Path, target: Path) -> int:
+    """
+    Clone a seed environment.
+
+    Args:
+        seed_path: Seed environment from ensure_seed
+        target: New environment directory (must not exist)
+
+    Returns:
+        Number of files shared with the seed through hardlinks
+    """
+    marker = json.loads((seed_path / SEED_MARKER).read_text(encoding='utf-8'))
+    old_root = marker['path']
+    old, new = old_root.encode('utf-8'), str(target).encode('utf-8')
+    scripts_dir = _scripts_dir(seed_path)
+    linked = 0
+
+    with profiling.span('venv_clone', str(target)):
+        for dirpath, dirnames, filenames in os.walk(seed_path):
+            source_dir = Path(dirpath)
+            target_dir = target / source_dir.relative_to(seed_path)
+            target_dir.mkdir(parents=True, exist_ok=True)
+
+            for name in dirnames + filenames:
+                source = source_dir / name
+                if not source.is_symlink():
+                    continue
+                # Interpreter links and lib64 -> lib stay links
+                link = os.readlink(source)
+                if link.startswith(old_root):
+                    link = str(target) + link[len(old_root):]
+                os.symlink(link, target_dir / name)
+
+            for name in filenames:
+                source = source_dir / name
+                if source.is_symlink() or (source_dir == seed_path and name == SEED_MARKER):
+                    continue
+                destination = target_dir / name
+                if (source_dir == scripts_dir or (source_dir == seed_path and name in _PATH_FILES)) \
+                        and _rewrite_path(source, destination, old, new):
+                    continue
+                if link_blob(str(source), str(destination), 'hardlink') == 'hardlink':
+                    linked += 1
+                else:
+                    shutil.copymode(source, destination)
+    return linked
+
+def venv_works(venv_path: Path) -> bool:
+    """
+    Check that the interpreter of an existing environment still runs.
+
+    Args:
+        venv_path: Environment directory
+
+    Returns:
+        True if the environment's python starts and exits successfully
+    """
+    import subprocess
+
+    try:
+        _run_subprocess(
+            [str(venv_python(venv_path)), '-c', 'pass'],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    except (subprocess.CalledProcessError, OSError):
+        return False
+    return True
+
+def provision_venv(project_path: Path, config: Mapping[str, Any]) -> Path:
+    """
+    Create a project's virtual environment with its dev dependencies and
+    the project itself installed in editable mode.
+
+    With venv_config['seed_cache'] (the default) the environment is cloned
+    from the cached seed and the editable install runs offline; otherwise
+    it is created with venv and ``pip install -e .[dev]``. Either way,
+    venv_config['wheelhouse'] makes pip install from the local wheelhouse.
+
+    Regenerating a project keeps an existing environment whose interpreter
+    still works; a broken one is removed and created again.
+
+    Args:
+        project_path: Project directory
+        config: Project configuration
+
+    Returns:
+        The environment directory
+
+    Raises:
+        FileOperationError: If the environment cannot be created
+    """
+    import subprocess
+
+    venv_config = config.get('venv_config', {})
+    python = venv_config.get('python') or sys.executable
+    # Scripts embed the absolute environment path
+    project_path = project_path.absolute()
+    venv_path = project_path / venv_config.get('directory', 'venv')
+
+    with profiling.span('venv', str(venv_path)):
+        if venv_path.exists():
+            if venv_works(venv_path):
+                logger.info(f"Keeping existing virtual environment at {venv_path}")
+                return venv_path
+            logger.warning(f"Replacing broken virtual environment at {venv_path}")
+            shutil.rmtree(venv_path, ignore_errors=True)
+        try:
+            use_wheelhouse = venv_config.get('wheelhouse', True)
+            if venv_config.get('seed_cache', True):
+                seed_path = ensure_seed(python, seed_requirements(config), use_wheelhouse)
+                linked = clone_venv(seed_path, venv_path)
+                logger.info(f"Cloned seed environment {seed_path.name} ({linked} files linked)")
+                install = ['--no-deps', '--no-build-isolation', '--no-index', '-e', str(project_path)]
+            else:
+                _run_subprocess([python, '-m', 'venv', str(venv_path)], check=True)
+                install = ['-e', f'{project_path}[dev]']
+                if use_wheelhouse:
+                    # The isolated build environment installs from it too
+                    install[:0] = wheelhouse.prepare(
+                        str(venv_python(venv_path)), seed_requirements(config)
+                    )
+
+            if venv_config.get('install_project', True):
+                with profiling.span('venv_install', project_path.name):
+                    _run_subprocess(
+                        [str(venv_python(venv_path)), '-m', 'pip', 'install', '--quiet',
+                         '--disable-pip-version-check', *install],
+                        check=True, cwd=project_path,
+                    )
+        except (subprocess.CalledProcessError, OSError) as e:
+            shutil.rmtree(venv_path, ignore_errors=True)
+            raise FileOperationError(f"Failed to create virtual environment: {e}")
+
+    logger.info(f"Created virtual environment at {venv_path}")
+    return venv_path
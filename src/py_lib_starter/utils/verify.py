@@ -0,0 +1,342 @@
+"""Post-generation verification of generated projects.
+
+Each project is checked by importing its package, running its generated
+tests with pytest and type-checking ``src`` with mypy. Projects are
+checked in parallel, every project within its own time budget, and the
+results are aggregated into one JSON or JUnit XML report.
+
+All checks run in one shared environment instead of a virtual environment
+per project: the project's ``src`` directory is put on the path, which is
+what the generated pytest configuration does anyway. By default that
+environment is the cached seed environment (see venv_seed), which holds
+every dev dependency of a generated project; mypy shares one cache across
+all projects so the standard library is only analyzed once.
+"""
+
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .file_ops import _run_subprocess
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Checks in the order they run
+CHECKS = ('import', 'pytest', 'mypy')
+
+# Seconds each project may take for all of its checks
+DEFAULT_TIMEOUT = 300.0
+
+# Characters of output kept per failed check
+OUTPUT_TAIL = 4000
+
+def default_python() -> str:
+    """
+    Get the interpreter of the shared verification environment.
+
+    Returns:
+        Interpreter of the seed environment of the running interpreter and
+        the default dev dependencies, built on first use
+    """
+    from ..config.default import get_default_config
+    from .venv_seed import ensure_seed, seed_requirements, venv_python
+
+    seed_path = ensure_seed(sys.executable, seed_requirements(get_default_config()))
+    return str(venv_python(seed_path))
+
+def _check_command(check: str, python: str, package: str, mypy_cache: str) -> List[str]:
+    if check == 'import':
+        return [python, '-c', f'import {package}']
+    if check == 'pytest':
+        return [python, '-m', 'pytest', '-q', '-p', 'no:cacheprovider']
+    return [python, '-m', 'mypy', '--cache-dir', mypy_cache, 'src']
+
+def verify_project(
+    project_path: str,
+    python: str,
+    checks: Sequence[str] = CHECKS,
+    timeout: float = DEFAULT_TIMEOUT,
+    mypy_cache: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run the checks of one project.
+
+    Checks run one after another and share the project's time budget;
+    once it is used up, the check running is killed and the remaining
+    ones are reported as timed out.
+
+    Args:
+        project_path: Project directory; its name is the package name
+        python: Interpreter with pytest and mypy installed
+        checks: Names from CHECKS to run
+        timeout: Seconds all checks of the project may take together
+        mypy_cache: mypy cache directory (default: the project's own)
+
+    Returns:
+        Result dictionary with 'name', 'path', 'success', 'duration' and
+        one 'checks' entry per check
+    """
+    import subprocess
+
+    path = Path(project_path).absolute()
+    result: Dict[str, Any] = {
+        'name': path.name,
+        'path': str(path),
+        'success': True,
+        'checks': [],
+    }
+    env = dict(os.environ, PYTHONPATH=str(path / 'src'), PYTHONDONTWRITEBYTECODE='1')
+    mypy_cache = mypy_cache or str(path / '.mypy_cache')
+    start = time.perf_counter()
+
+    for check in checks:
+        outcome = {'name': check, 'success': False, 'timed_out': False,
+                   'returncode': None, 'duration': 0.0, 'output': ''}
+        remaining = timeout - (time.perf_counter() - start)
+        check_start = time.perf_counter()
+        if remaining <= 0:
+            outcome['timed_out'] = True
+            outcome['output'] = 'Not run: project time budget used up'
+        else:
+            try:
+                completed = _run_subprocess(
+                    _check_command(check, python, path.name, mypy_cache),
+                    cwd=path, env=env, timeout=remaining,
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                )
+                outcome['returncode'] = completed.returncode
+                outcome['success'] = completed.returncode == 0
+                output = completed.stdout
+            except subprocess.TimeoutExpired as e:
+                outcome['timed_out'] = True
+                output = e.output or b''
+            except OSError as e:
+                output = str(e).encode('utf-8')
+            if not outcome['success']:
+                outcome['output'] = output.decode('utf-8', 'replace')[-OUTPUT_TAIL:]
+        outcome['duration'] = time.perf_counter() - check_start
+        result['checks'].append(outcome)
+        result['success'] = result['success'] and outcome['success']
+
+    result['duration'] = time.perf_counter() - start
+    return result
+
+def verify_projects(
+    project_paths: Sequence[str],
+    python: Optional[str] = None,
+    checks: Sequence[str] = CHECKS,
+    timeout: float = DEFAULT_TIMEOUT,
+    jobs: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Verify many projects across a thread pool.
+
+    The work happens in subprocesses, so threads are enough to keep every
+    core busy.
+
+    Args:
+        project_paths: Project directories
+        python: Interpreter of the shared environment (default:
+            default_python())
+        checks: Names from CHECKS to run
+        timeout: Seconds each project may take
+        jobs: Number of projects checked at once (default: CPU count)
+
+    Returns:
+        One result dictionary per project, in input order
+    """
+    import tempfile
+
+    if not project_paths:
+        return []
+    python = python or default_python()
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(project_paths)))
+    logger.info(f"Verifying {len(project_paths)} projects with {jobs} worker(s)")
+
+    with tempfile.TemporaryDirectory(prefix='py_lib_starter_mypy_') as mypy_cache:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(
+                lambda path: verify_project(path, python, checks, timeout, mypy_cache),
+                project_paths,
+            ))
+
+def write_json_report(results: List[Dict[str, Any]], path: str) -> None:
+    """
+    Write verification results as JSON.
+
+    Args:
+        results: Results from verify_projects
+        path: Output file
+    """
+    import json
+
+    failed = sum(1 for result in results if not result['success'])
+    document = {
+        'projects': results,
+        'summary': {'total': len(results), 'passed': len(results) - failed, 'failed': failed},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+
+def write_junit_report(results: List[Dict[str, Any]], path: str) -> None:
+    """
+    Write verification results as JUnit XML, one test case per check.
+
+    Args:
+        results: Results from verify_projects
+        path: Output file
+    """
+    import xml.etree.ElementTree as ET
+
+    cases = [(result, check) for result in results for check in result['checks']]
+    root = ET.Element('testsuites')
+    suite = ET.SubElement(root, 'testsuite', {
+        'name': 'py_lib_starter.verify',
+        'tests': str(len(cases)),
+        'failures': str(sum(1 for _, check in cases if not check['success'] and not check['timed_out'])),
+        'errors': str(sum(1 for _, check in cases if check['timed_out'])),
+        'time': f"{sum(result['duration'] for result in results):.3f}",
+    })
+    for result, check in cases:
+        case = ET.SubElement(suite, 'testcase', {
+            'classname': result['name'],
+            'name': check['name'],
+            'time': f"{check['duration']:.3f}",
+        })
+        if check['timed_out']:
+            ET.SubElement(case, 'error', {'message': 'timed out'}).text = check['output']
+        elif not check['success']:
+            message = f"exit status {check['returncode']}"
+            ET.SubElement(case, 'failure', {'message': message}).text = check['output']
+    ET.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+def format_verify_summary(results: List[Dict[str, Any]]) -> str:
+    """
+    Format a per-project summary of verification results.
+
+    Args:
+        results: Results from verify_projects
+
+    Returns:
+        Human readable summary
+    """
+    lines = []
+    for result in results:
+        status = 'ok' if result['success'] else 'FAILED'
+        line = f"  [{status:>6}] {result['name']} ({result['duration']:.2f}s)"
+        failed = [
+            check['name'] + (' (timed out)' if check['timed_out'] else '')
+            for check in result['checks'] if not check['success']
+        ]
+        if failed:
+            line += f": {', '.join(failed)}"
+        lines.append(line)
+
+    failed_count = sum(1 for result in results if not result['success'])
+    lines.append(
+        f"\n{len(results) - failed_count} passed, {failed_count} failed, "
+        f"{len(results)} total"
+    )
+    return "\n".join(lines)
+
+def parse_verify_args(argv: Optional[list] = None):
+    """Parse the command line of ``create-pylib verify``."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='create-pylib verify',
+        description='Check that generated projects import, pass their tests '
+                    'and type-check'
+    )
+    parser.add_argument(
+        'projects',
+        nargs='*',
+        help='Project directories to verify'
+    )
+    parser.add_argument(
+        '--manifest',
+        help='Verify the projects listed in a batch manifest'
+    )
+    parser.add_argument(
+        '--path',
+        help='Base path of manifest entries that do not set one (default: '
+             'current directory)',
+        default=None
+    )
+    parser.add_argument(
+        '--checks',
+        help=f"Comma-separated checks to run (default: {','.join(CHECKS)})",
+        default=','.join(CHECKS)
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Number of projects verified at once (default: CPU count)',
+        default=None
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        metavar='SECONDS',
+        help='Time budget for all checks of one project (default: %(default)s)',
+        default=DEFAULT_TIMEOUT
+    )
+    parser.add_argument(
+        '--python',
+        help='Interpreter to run the checks with (default: the cached seed '
+             'environment with the dev dependencies)',
+        default=None
+    )
+    parser.add_argument(
+        '--json',
+        metavar='FILE',
+        help='Write the results to FILE as JSON'
+    )
+    parser.add_argument(
+        '--junit',
+        metavar='FILE',
+        help='Write the results to FILE as JUnit XML'
+    )
+    args = parser.parse_args(argv)
+
+    args.checks = [check.strip() for check in args.checks.split(',') if check.strip()]
+    unknown = sorted(set(args.checks) - set(CHECKS))
+    if unknown:
+        parser.error(f"unknown check(s): {', '.join(unknown)}")
+    if not args.projects and not args.manifest:
+        parser.error('give project directories or --manifest')
+    return args
+
+def main(argv: Optional[list] = None) -> None:
+    """Run ``create-pylib verify``."""
+    from .batch import ManifestError, load_manifest
+    from .file_ops import FileOperationError
+
+    args = parse_verify_args(argv)
+    project_paths = list(args.projects)
+
+    try:
+        if args.manifest:
+            base_path = args.path or os.getcwd()
+            project_paths += [
+                str(Path(entry.get('path') or base_path) / entry['name'])
+                for entry in load_manifest(args.manifest)
+            ]
+        results = verify_projects(project_paths, args.python, args.checks, args.timeout, args.jobs)
+    except (ManifestError, FileOperationError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(format_verify_summary(results))
+    if args.json:
+        write_json_report(results, args.json)
+    if args.junit:
+        write_junit_report(results, args.junit)
+    if not all(result['success'] for result in results):
+        sys.exit(1)
@@ -0,0 +1,333 @@
+"""Local wheelhouse for offline installation of development dependencies.
+
+Every requirement set (the packages of a seed environment, or a project's
+dev extra) is resolved and downloaded once with ``pip wheel`` into a
+shared wheel directory. Later installs of the same set run with
+``--no-index --find-links`` against it, so they need no network and skip
+resolution against the index.
+
+A manifest next to the wheels records, per requirement set, the wheel
+files it resolved to, how long populating it took and when it was last
+used; prune() drops stale sets and the wheels no remaining set needs.
+
+Batch workers share the wheelhouse: populating it and every update of the
+manifest happen under an exclusive lock on a file next to it, so
+concurrent workers neither run pip into the directory at the same time
+nor lose each other's manifest records.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import profiling
+from .file_ops import FileOperationError, _run_subprocess
+from .render_cache import get_cache_dir
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'wheelhouse.json'
+LOCK_FILENAME = '.wheelhouse.lock'
+
+# Requirement sets not used for this long are dropped by prune()
+DEFAULT_MAX_AGE_DAYS = 30
+
+def get_wheelhouse_dir() -> Path:
+    """Get the wheelhouse directory."""
+    return get_cache_dir() / 'wheelhouse'
+
+def requirement_set_key(python: str, requirements: Iterable[str]) -> str:
+    """
+    Identify a requirement set resolved for an interpreter.
+
+    Args:
+        python: Interpreter the set is installed with
+        requirements: Requirement strings
+
+    Returns:
+        Short hex key
+    """
+    document = {
+        'python': os.path.realpath(shutil.which(python) or python),
+        'requirements': sorted(requirements),
+    }
+    data = json.dumps(document, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+def load_manifest(wheelhouse: Path) -> Dict[str, Any]:
+    """Read the wheelhouse manifest, empty if there is none."""
+    try:
+        with open(wheelhouse / MANIFEST_FILENAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'sets': {}}
+
+def _store_manifest(wheelhouse: Path, manifest: Dict[str, Any]) -> None:
+    # Atomic, so concurrent readers never see a partial manifest
+    fd, tmp_name = tempfile.mkstemp(prefix='.manifest.', dir=wheelhouse)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_name, wheelhouse / MANIFEST_FILENAME)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+@contextlib.contextmanager
+def _locked(wheelhouse: Path) -> Iterator[None]:
+    """
+    Hold the wheelhouse's exclusive lock, waiting for other processes.
+
+    Without fcntl (Windows) nothing is locked.
+    """
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+    with open(wheelhouse / LOCK_FILENAME, 'a') as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def install_args(wheelhouse: Path) -> List[str]:
+    """Get the pip options installing from the wheelhouse only."""
+    return ['--no-index', '--find-links', str(wheelhouse)]
+
+def _resolved_wheels(python: str, requirements: Tuple[str, ...], wheelhouse: Path) -> List[str]:
+    """
+    Find the wheel files a requirement set resolves to in the wheelhouse.
+
+    Uses pip's installation report (pip 22.2 or later). With older pip
+    every wheel present is attributed to the set, so prune() keeps them.
+    """
+    import subprocess
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = os.path.join(tmp_dir, 'report.json')
+        result = _run_subprocess(
+            [python, '-m', 'pip', 'install', '--quiet', '--disable-pip-version-check',
+             '--dry-run', '--ignore-installed', '--report', report_path,
+             *install_args(wheelhouse), *requirements],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        if result.returncode != 0 or not os.path.exists(report_path):
+            return sorted(path.name for path in wheelhouse.glob('*.whl'))
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+    return sorted(
+        item['download_info']['url'].rsplit('/', 1)[-1]
+        for item in report.get('install', ())
+    )
+
+def populate(
+    python: str,
+    requirements: Iterable[str],
+    wheelhouse: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    Resolve and download a requirement set into the wheelhouse.
+
+    Wheels already present are reused; sdists are built into wheels once.
+
+    Args:
+        python: Interpreter whose pip resolves the set (wheels must match it)
+        requirements: Requirement strings
+        wheelhouse: Wheelhouse directory (default: get_wheelhouse_dir())
+
+    Returns:
+        The set's manifest record
+
+    Raises:
+        FileOperationError: If pip cannot resolve or download the set
+    """
+    wheelhouse = wheelhouse or get_wheelhouse_dir()
+    with _locked(wheelhouse):
+        return _populate(python, tuple(sorted(requirements)), wheelhouse)
+
+def _populate(python: str, requirements: Tuple[str, ...], wheelhouse: Path) -> Dict[str, Any]:
+    """Populate a sorted requirement set; the caller holds the lock."""
+    import subprocess
+
+    with profiling.span('wheelhouse_populate'):
+        start = time.perf_counter()
+        try:
+            _run_subprocess(
+                [python, '-m', 'pip', 'wheel', '--quiet', '--disable-pip-version-check',
+                 '--wheel-dir', str(wheelhouse), '--find-links', str(wheelhouse),
+                 *requirements],
+                check=True,
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            raise FileOperationError(f"Failed to populate the wheelhouse: {e}")
+        record = {
+            'python': os.path.realpath(shutil.which(python) or python),
+            'requirements': list(requirements),
+            'wheels': _resolved_wheels(python, requirements, wheelhouse),
+            'populate_seconds': round(time.perf_counter() - start, 3),
+            'last_used': time.time(),
+        }
+
+    manifest = load_manifest(wheelhouse)
+    manifest['sets'][requirement_set_key(python, requirements)] = record
+    _store_manifest(wheelhouse, manifest)
+    logger.info(f"Wheelhouse holds {len(record['wheels'])} wheels for {len(requirements)} requirements")
+    return record
+
+def prepare(
+    python: str,
+    requirements: Iterable[str],
+    wheelhouse: Optional[Path] = None
+) -> List[str]:
+    """
+    Make a requirement set installable offline and get the pip options
+    installing it from the wheelhouse.
+
+    Populates the set on first use. Afterwards the time populating took,
+    i.e. resolving against the index and downloading, is what every
+    install saves; it is reported to the active profiling span as the
+    'install_seconds_saved' metric.
+
+    Args:
+        python: Interpreter installing the set
+        requirements: Requirement strings
+        wheelhouse: Wheelhouse directory (default: get_wheelhouse_dir())
+
+    Returns:
+        pip options for the install
+
+    Raises:
+        FileOperationError: If the set is new and cannot be populated
+    """
+    requirements = tuple(sorted(requirements))
+    wheelhouse = wheelhouse or get_wheelhouse_dir()
+    key = requirement_set_key(python, requirements)
+
+    # A worker waiting here while another populates the same set finds it
+    # complete once it gets the lock
+    with _locked(wheelhouse):
+        manifest = load_manifest(wheelhouse)
+        record = manifest['sets'].get(key)
+        if record is None or not all((wheelhouse / name).exists() for name in record['wheels']):
+            _populate(python, requirements, wheelhouse)
+        else:
+            profiling.add_metric('install_seconds_saved', record['populate_seconds'])
+            record['last_used'] = time.time()
+            _store_manifest(wheelhouse, manifest)
+    return install_args(wheelhouse)
+
+def prune(
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    wheelhouse: Optional[Path] = None
+) -> List[str]:
+    """
+    Drop requirement sets unused for max_age_days and delete the wheels
+    no remaining set resolves to.
+
+    Args:
+        max_age_days: Age of the last use after which a set is dropped
+        wheelhouse: Wheelhouse directory (default: get_wheelhouse_dir())
+
+    Returns:
+        Names of the deleted wheel files
+    """
+    wheelhouse = wheelhouse or get_wheelhouse_dir()
+    if not wheelhouse.is_dir():
+        return []
+    removed = []
+    with _locked(wheelhouse):
+        manifest = load_manifest(wheelhouse)
+        cutoff = time.time() - max_age_days * 86400
+        manifest['sets'] = {
+            key: record for key, record in manifest['sets'].items()
+            if record['last_used'] >= cutoff
+        }
+        needed = {name for record in manifest['sets'].values() for name in record['wheels']}
+
+        for path in sorted(wheelhouse.glob('*.whl')):
+            if path.name not in needed:
+                path.unlink()
+                removed.append(path.name)
+        _store_manifest(wheelhouse, manifest)
+    return removed
+
+def parse_wheelhouse_args(argv: Optional[list] = None):
+    """Parse the command line of ``create-pylib wheelhouse``."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='create-pylib wheelhouse',
+        description='Manage the local wheelhouse used for offline installs'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    populate_parser = commands.add_parser(
+        'populate',
+        help='Download the dev dependencies of generated projects'
+    )
+    populate_parser.add_argument(
+        'requirements',
+        nargs='*',
+        help='Requirements to add (default: those of generated projects)'
+    )
+    populate_parser.add_argument(
+        '--python',
+        help='Interpreter the wheels are for (default: the running one)',
+        default=None
+    )
+
+    prune_parser = commands.add_parser(
+        'prune',
+        help='Delete wheels of requirement sets that were not used recently'
+    )
+    prune_parser.add_argument(
+        '--max-age',
+        type=float,
+        metavar='DAYS',
+        help='Keep sets used within DAYS days (default: %(default)s)',
+        default=DEFAULT_MAX_AGE_DAYS
+    )
+
+    commands.add_parser('list', help='Show the requirement sets in the wheelhouse')
+    return parser.parse_args(argv)
+
+def main(argv: Optional[list] = None) -> None:
+    """Run ``create-pylib wheelhouse``."""
+    import sys
+
+    args = parse_wheelhouse_args(argv)
+    wheelhouse = get_wheelhouse_dir()
+
+    try:
+        if args.command == 'populate':
+            from ..config.default import get_default_config
+            from .venv_seed import seed_requirements
+
+            requirements = args.requirements or seed_requirements(get_default_config())
+            record = populate(args.python or sys.executable, requirements, wheelhouse)
+            print(f"{len(record['wheels'])} wheels in {wheelhouse} "
+                  f"(populated in {record['populate_seconds']:.1f}s)")
+        elif args.command == 'prune':
+            removed = prune(args.max_age, wheelhouse)
+            for name in removed:
+                print(f"removed {name}")
+            print(f"{len(removed)} wheels removed from {wheelhouse}")
+        else:
+            for key, record in sorted(load_manifest(wheelhouse)['sets'].items()):
+                last_used = time.strftime('%Y-%m-%d', time.localtime(record['last_used']))
+                print(f"{key}  {len(record['wheels']):>3} wheels  last used {last_used}  "
+                      f"{record['python']}")
+    except FileOperationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)